@@ -0,0 +1,220 @@
+"""메트릭 구간 이상 점수 (NumPy 벡터 연산)
+
+영향 서비스 + DEPENDENCY_GRAPH 이웃의 최근 범위 벡터(메모리 %, CPU %, 재시작 수, 5xx 비율, p99 지연)를
+(서비스, 메트릭, 시각) 배열 하나로 모아 z-score / 기울기 / 변화점을 한 번에 계산하고,
+이슈 타입별 점수 순위를 만든다. classify_issue가 로그 패턴으로 분류하지 못했을 때 사용한다.
+
+- z-score: 앞 구간(기준) 대비 최근 구간 평균의 편차
+- 기울기: 구간 전체 최소제곱 기울기 (분당 변화량)
+- 변화점: 누적합으로 구한 평균 이동이 가장 큰 지점과 그 크기
+
+환경변수:
+  ANOMALY_WINDOW_MINUTES : 조회 구간 (분, 기본: 30)
+  ANOMALY_STEP_SECONDS   : 샘플 간격 (초, 기본: 30)
+  ANOMALY_MIN_SCORE      : 분류에 사용할 최소 점수 (기본: 3.0)
+"""
+import logging
+import os
+import time
+import warnings
+from typing import NamedTuple
+
+import numpy as np
+
+from delivery_agent.policy import DEPENDENCY_GRAPH
+from dr_kube.prometheus import get_prometheus
+
+logger = logging.getLogger("delivery-anomaly")
+
+WINDOW_MINUTES = int(os.getenv("ANOMALY_WINDOW_MINUTES", "30"))
+STEP_SECONDS = int(os.getenv("ANOMALY_STEP_SECONDS", "30"))
+MIN_SCORE = float(os.getenv("ANOMALY_MIN_SCORE", "3.0"))
+
+METRICS = ("memory_pct", "cpu_pct", "restarts", "error_ratio", "latency_p99")
+# 메트릭별 최소 변동 폭 (기준 구간이 평탄할 때 z-score 분모): %, %, 회, 비율, 초
+_NOISE_FLOOR = np.array([1.0, 1.0, 1.0, 0.01, 0.05])
+_EPS = 1e-9
+
+
+class Anomaly(NamedTuple):
+    service: str
+    issue_type: str
+    score: float
+    evidence: str
+
+
+def neighbours(service: str) -> list[str]:
+    """서비스 + 의존 대상 + 이 서비스를 호출하는 서비스"""
+    callers = [svc for svc, deps in DEPENDENCY_GRAPH.items() if service in deps]
+    return list(dict.fromkeys([service, *DEPENDENCY_GRAPH.get(service, []), *callers]))
+
+
+def _queries(services: list[str], namespace: str) -> dict[str, tuple[str, str]]:
+    """메트릭 → (PromQL, 서비스 레이블). 메트릭마다 쿼리 1개로 모든 서비스를 받는다."""
+    svc_re = "|".join(services)
+    sel = f'namespace="{namespace}",container=~"{svc_re}"'
+    return {
+        "memory_pct": (
+            f'max by (container) (100 * container_memory_working_set_bytes{{{sel}}}'
+            f' / on(pod, container) kube_pod_container_resource_limits{{{sel},resource="memory"}})',
+            "container",
+        ),
+        "cpu_pct": (
+            f'max by (container) (100 * rate(container_cpu_usage_seconds_total{{{sel}}}[2m])'
+            f' / on(pod, container) kube_pod_container_resource_limits{{{sel},resource="cpu"}})',
+            "container",
+        ),
+        "restarts": (f'sum by (container) (kube_pod_container_status_restarts_total{{{sel}}})', "container"),
+        "error_ratio": (
+            f'sum by (job) (rate(http_requests_total{{job=~"{svc_re}",status=~"5.."}}[2m]))'
+            f' / sum by (job) (rate(http_requests_total{{job=~"{svc_re}"}}[2m]))',
+            "job",
+        ),
+        "latency_p99": (
+            f'histogram_quantile(0.99, sum by (job, le) '
+            f'(rate(http_request_duration_seconds_bucket{{job=~"{svc_re}"}}[2m])))',
+            "job",
+        ),
+    }
+
+
+def fetch_windows(services: list[str], namespace: str,
+                  end: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """범위 벡터 조회 → (시각 [T], 값 [S, M, T]). 빠진 샘플은 NaN."""
+    end = end or time.time()
+    end -= end % STEP_SECONDS
+    start = end - WINDOW_MINUTES * 60
+    times = np.arange(start, end + STEP_SECONDS / 2, STEP_SECONDS)
+    values = np.full((len(services), len(METRICS), len(times)), np.nan)
+
+    queries = _queries(services, namespace)
+    results = get_prometheus().query_range_many(
+        {name: promql for name, (promql, _) in queries.items()}, start, end, STEP_SECONDS,
+    )
+    index = {svc: i for i, svc in enumerate(services)}
+    for m, name in enumerate(METRICS):
+        label = queries[name][1]
+        for series in results.get(name, []):
+            s = index.get(series.labels.get(label, ""))
+            if s is None or not series.samples:
+                continue
+            ts, vs = np.array(series.samples).T
+            slots = np.rint((ts - start) / STEP_SECONDS).astype(int)
+            ok = (slots >= 0) & (slots < len(times))
+            values[s, m, slots[ok]] = vs[ok]
+    return times, values
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """마지막 축 기준 NaN을 직전 값으로 채움 (앞쪽 NaN은 첫 유효값)"""
+    mask = np.isnan(values)
+    idx = np.where(mask, 0, np.arange(values.shape[-1]))
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    filled = np.take_along_axis(values, idx, axis=-1)
+    first = np.argmax(~mask, axis=-1)[..., None]
+    lead = np.arange(values.shape[-1]) < first
+    return np.where(lead, np.take_along_axis(values, first, axis=-1), filled)
+
+
+def score_windows(times: np.ndarray, values: np.ndarray) -> dict[str, np.ndarray]:
+    """[S, M, T] 배열 → 통계량 ([S, M] 배열들)"""
+    T = values.shape[-1]
+    valid = ~np.isnan(values)
+    has_data = valid.sum(axis=-1) >= 3
+    split = max(2, (T * 2) // 3)
+    base, recent = values[..., :split], values[..., split:]
+
+    # 데이터 없는 계열의 빈 구간 경고는 has_data로 걸러내므로 무시
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        base_mean = np.nanmean(base, axis=-1)
+        base_std = np.nanstd(base, axis=-1)
+        recent_mean = np.nanmean(recent, axis=-1)
+        recent_max = np.nanmax(recent, axis=-1)
+        # 기준 구간 변동이 거의 없으면 평균의 5%(최소 메트릭별 하한)를 분모로 사용
+        scale = np.maximum(base_std, np.maximum(np.abs(base_mean) * 0.05, _NOISE_FLOOR[: values.shape[1]]))
+        z = (recent_mean - base_mean) / scale
+
+        # 최소제곱 기울기 (NaN 가중치 0), 분당 변화량
+        minutes = (times - times[0]) / 60.0
+        w = valid.astype(float)
+        n = np.maximum(w.sum(axis=-1), _EPS)
+        y = np.where(valid, values, 0.0)
+        x_mean = (w * minutes).sum(axis=-1) / n
+        y_mean = y.sum(axis=-1) / n
+        dx = np.where(valid, minutes - x_mean[..., None], 0.0)
+        slope = (dx * (y - y_mean[..., None])).sum(axis=-1) / np.maximum((dx * dx).sum(axis=-1), _EPS)
+
+        # 변화점: 분할 k마다 좌우 평균 차 × sqrt(k(T-k)/T), 누적합으로 한 번에 계산
+        filled = _ffill(values)
+        csum = np.cumsum(filled, axis=-1)
+        k = np.arange(1, T)
+        left = csum[..., :-1] / k
+        right = (csum[..., -1:] - csum[..., :-1]) / (T - k)
+        shift = (right - left) * np.sqrt(k * (T - k) / T)
+        best = np.nanargmax(np.abs(np.where(np.isnan(shift), 0.0, shift)), axis=-1)
+        change = np.take_along_axis(shift, best[..., None], axis=-1)[..., 0] / scale
+        change_at = times[best + 1]
+
+        increase = np.nanmax(recent, axis=-1) - np.nanmin(values, axis=-1)
+
+    stats = {
+        "z": z, "slope": slope, "change": change, "change_at": change_at,
+        "recent_mean": recent_mean, "recent_max": recent_max, "increase": increase,
+    }
+    for key, arr in stats.items():
+        stats[key] = np.where(has_data, np.nan_to_num(arr, nan=0.0), 0.0)
+    return stats
+
+
+def rank(services: list[str], stats: dict[str, np.ndarray], target: str) -> list[Anomaly]:
+    """통계량 → 이슈 타입별 점수 순위 (영향 서비스 가중치 1.0, 이웃 0.5)"""
+    m = {name: i for i, name in enumerate(METRICS)}
+    z = np.clip(stats["z"], 0, None)
+    change = np.clip(stats["change"], 0, None)
+    level = stats["recent_max"]
+    restarts = np.clip(stats["increase"][:, m["restarts"]], 0, 5)
+    mem, cpu, err, lat = (m["memory_pct"], m["cpu_pct"], m["error_ratio"], m["latency_p99"])
+
+    scores = {
+        "oom": z[:, mem] + 0.5 * change[:, mem] + 3.0 * (level[:, mem] >= 90)
+               + restarts * (level[:, mem] >= 80),
+        "crash_loop": restarts * (level[:, mem] < 80),
+        "resource_exhaustion": z[:, cpu] + 0.5 * change[:, cpu] + 3.0 * (level[:, cpu] >= 90),
+        "service_error": z[:, err] + 0.5 * change[:, err] + 3.0 * (level[:, err] >= 0.05),
+        "high_latency": z[:, lat] + 0.5 * change[:, lat],
+    }
+    weight = np.array([1.0 if svc == target else 0.5 for svc in services])
+
+    ranked = []
+    for issue_type, arr in scores.items():
+        for s, score in enumerate(arr * weight):
+            if score <= 0:
+                continue
+            metric = {"oom": mem, "crash_loop": m["restarts"], "resource_exhaustion": cpu,
+                      "service_error": err, "high_latency": lat}[issue_type]
+            evidence = (
+                f"{METRICS[metric]} z={stats['z'][s, metric]:.1f} slope={stats['slope'][s, metric]:.2f}/min "
+                f"change={stats['change'][s, metric]:.1f} recent_max={level[s, metric]:.2f}"
+            )
+            ranked.append(Anomaly(services[s], issue_type, round(float(score), 2), evidence))
+    ranked.sort(key=lambda a: a.score, reverse=True)
+    return ranked
+
+
+def score_service(service: str, namespace: str) -> list[dict]:
+    """영향 서비스 + 이웃의 이상 점수 순위 (context['anomalies']용 dict 목록)"""
+    services = neighbours(service)
+    times, values = fetch_windows(services, namespace)
+    if np.isnan(values).all():
+        return []
+    ranked = rank(services, score_windows(times, values), service)
+    return [a._asdict() for a in ranked[:10]]
+
+
+def best_issue(anomalies: list[dict], service: str, min_score: float = MIN_SCORE) -> dict | None:
+    """영향 서비스에 대한 최상위 이상 (점수 미달이면 None)"""
+    for a in anomalies:
+        if a["service"] == service and a["score"] >= min_score:
+            return a
+    return None
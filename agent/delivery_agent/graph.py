@@ -8,10 +8,14 @@
   classify_issue          ← 규칙 기반 분류 (LLM 없음)
     ↓
   [unknown] → notify_skip → END
+  [known + COMBINED_LLM + 규칙 없음] → analyze_and_plan → validate_fix
+                          ← LLM 1회로 분석 + 수정안 (실패 시 analyze 폴백)
   [known]   → analyze     ← LLM 근본 원인 분석
     ↓
-  plan_fix                ← LLM manifest 수정안 생성
-    ↓
+  plan_fix_rules          ← 정책 수치 기반 결정적 수정안 (oom / replica_shortage)
+    ↓ 규칙 적용          ↓ 규칙 없음
+    ↓                  plan_fix ← LLM manifest 수정안 생성
+    ↓                    ↓
   validate_fix
     ↓ 통과
   human_gate              ← 고위험만 Slack interrupt
@@ -35,7 +39,9 @@ from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 
 from delivery_agent.nodes import (
+    COMBINED_LLM,
     analyze,
+    analyze_and_plan,
     classify_issue,
     create_pr,
     escalate,
@@ -46,9 +52,11 @@ from delivery_agent.nodes import (
     notify_complete,
     notify_skip,
     plan_fix,
+    plan_fix_rules,
     validate_fix,
     verify_recovery,
 )
+from delivery_agent.planner import has_rule
 from delivery_agent.state import DeliveryState
 
 logger = logging.getLogger("delivery-graph")
@@ -62,6 +70,15 @@ def route_after_classify(state: DeliveryState) -> str:
     if state.get("issue_type") == "unknown":
         logger.info("라우팅: classify → notify_skip (unknown)")
         return "notify_skip"
+    if COMBINED_LLM and not has_rule(state.get("issue_type", "unknown")):
+        return "analyze_and_plan"
+    return "analyze"
+
+
+def route_after_analyze_and_plan(state: DeliveryState) -> str:
+    if state.get("status") == "fix_planned":
+        return "validate_fix"
+    logger.info("라우팅: analyze_and_plan → analyze (폴백)")
     return "analyze"
 
 
@@ -69,6 +86,12 @@ def route_after_analyze(state: DeliveryState) -> str:
     if state.get("status") == "error":
         logger.warning("라우팅: analyze → escalate (error)")
         return "escalate"
+    return "plan_fix_rules"
+
+
+def route_after_plan_fix_rules(state: DeliveryState) -> str:
+    if state.get("status") == "fix_planned":
+        return "validate_fix"
     return "plan_fix"
 
 
@@ -123,6 +146,8 @@ def build_graph() -> StateGraph:
     workflow.add_node("gather_context", gather_context)
     workflow.add_node("classify_issue", classify_issue)
     workflow.add_node("analyze", analyze)
+    workflow.add_node("analyze_and_plan", analyze_and_plan)
+    workflow.add_node("plan_fix_rules", plan_fix_rules)
     workflow.add_node("plan_fix", plan_fix)
     workflow.add_node("validate_fix", validate_fix)
     workflow.add_node("human_gate", human_gate)
@@ -141,13 +166,25 @@ def build_graph() -> StateGraph:
     workflow.add_conditional_edges(
         "classify_issue",
         route_after_classify,
-        {"analyze": "analyze", "notify_skip": "notify_skip"},
+        {"analyze": "analyze", "analyze_and_plan": "analyze_and_plan", "notify_skip": "notify_skip"},
+    )
+
+    workflow.add_conditional_edges(
+        "analyze_and_plan",
+        route_after_analyze_and_plan,
+        {"validate_fix": "validate_fix", "analyze": "analyze"},
     )
 
     workflow.add_conditional_edges(
         "analyze",
         route_after_analyze,
-        {"plan_fix": "plan_fix", "escalate": "escalate"},
+        {"plan_fix_rules": "plan_fix_rules", "escalate": "escalate"},
+    )
+
+    workflow.add_conditional_edges(
+        "plan_fix_rules",
+        route_after_plan_fix_rules,
+        {"validate_fix": "validate_fix", "plan_fix": "plan_fix"},
     )
 
     workflow.add_edge("plan_fix", "validate_fix")
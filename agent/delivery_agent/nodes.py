@@ -8,19 +8,27 @@ from pathlib import Path
 import yaml
 from langchain_core.messages import HumanMessage
 
+from delivery_agent.anomaly import best_issue
+from delivery_agent.planner import plan_deterministic
 from delivery_agent.policy import (
-    DELIVERY_SERVICES, ISSUE_POLICY, should_require_human, get_retry_strategy
+    DELIVERY_SERVICES, ISSUE_POLICY, evaluate_fix_policy, should_require_human, get_retry_strategy
 )
-from delivery_agent.prompts import ANALYZE_PROMPT, PLAN_FIX_PROMPT, STRATEGY_GUIDANCE
-from delivery_agent.schemas import AnalysisResult, FixPlanOutput
+from delivery_agent.prompts import (
+    ANALYZE_AND_PLAN_PROMPT, ANALYZE_PROMPT, PLAN_FIX_PROMPT, STRATEGY_GUIDANCE
+)
+from delivery_agent.schemas import AnalysisResult, AnalyzeAndPlanOutput, FixPlanOutput
 from delivery_agent.state import DeliveryState, IssueType
 from delivery_agent.tools import collect_context_parallel, read_manifest
+from dr_kube import yaml_diff
 
 logger = logging.getLogger("delivery-nodes")
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 MAX_RETRIES = 3
 
+# true면 결정적 규칙이 없는 첫 시도에서 analyze + plan_fix 를 LLM 1회 호출로 처리
+COMBINED_LLM = os.getenv("DELIVERY_COMBINED_LLM", "false").lower() in ("1", "true", "yes")
+
 # ── 이슈 분류 규칙 ─────────────────────────────────────
 
 OOM_PATTERNS = [r"OOMKilled", r"Out of memory", r"memory limit exceeded", r"Killed.*memory"]
@@ -75,9 +83,10 @@ def gather_context(state: DeliveryState) -> DeliveryState:
     namespace = state.get("affected_namespace", "delivery-app")
 
     logger.info("컨텍스트 수집 시작: %s/%s", namespace, service)
-    context = collect_context_parallel(service, namespace)
-    logger.info("컨텍스트 수집 완료: logs=%d services, metrics=%d services",
-                len(context["pod_logs"]), len(context["metrics"]))
+    alert_start = state.get("alert_payload", {}).get("startsAt", "")
+    context = collect_context_parallel(service, namespace, alert_start)
+    logger.info("컨텍스트 수집 완료: logs=%d services, metrics=%d services, timed_out=%s",
+                len(context["pod_logs"]), len(context["metrics"]), context.get("timed_out", []))
 
     return {**state, "context": context, "status": "context_gathered"}
 
@@ -98,8 +107,8 @@ def classify_issue(state: DeliveryState) -> DeliveryState:
     if alertname == "DeliveryAppHighErrorRate":
         logger.info("이슈 분류 결과: service_error (Prometheus alert)")
         return {**state, "issue_type": "service_error", "status": "classified"}
-    if alertname == "DeliveryAppOOMKilled":
-        logger.info("이슈 분류 결과: oom (Prometheus alert)")
+    if alertname in ("DeliveryAppOOMKilled", "PredictedOOM"):
+        logger.info("이슈 분류 결과: oom (%s)", "OOM 예측" if alertname == "PredictedOOM" else "Prometheus alert")
         return {**state, "issue_type": "oom", "status": "classified"}
 
     error_message = state.get("error_message", "")
@@ -132,6 +141,15 @@ def classify_issue(state: DeliveryState) -> DeliveryState:
     elif _classify_by_pattern(all_text, RESOURCE_PATTERNS):
         issue_type = "resource_exhaustion"
 
+    if issue_type == "unknown":
+        # 로그 패턴이 없으면 메트릭 구간 이상 점수로 분류
+        anomaly = best_issue(context.get("anomalies", []), service)
+        if anomaly:
+            issue_type = anomaly["issue_type"]
+            logger.info("이슈 분류 결과: %s (메트릭 이상 score=%.1f, %s)",
+                        issue_type, anomaly["score"], anomaly["evidence"])
+            return {**state, "issue_type": issue_type, "status": "classified"}
+
     logger.info("이슈 분류 결과: %s (restart=%d)", issue_type, restart_count)
 
     return {**state, "issue_type": issue_type, "status": "classified"}
@@ -141,29 +159,11 @@ def analyze(state: DeliveryState) -> DeliveryState:
     """LLM으로 근본 원인 분석 (구조화 출력)"""
     from dr_kube.llm import get_llm
 
-    context = state.get("context", {})
-    service = state.get("affected_service", "")
-
-    # 컨텍스트 텍스트 변환
-    logs_text = "\n".join(
-        f"[{svc}]\n" + "\n".join(lines[-30:])
-        for svc, lines in context.get("pod_logs", {}).items()
-    )
-    status_text = str(context.get("pod_status", {}))
-    events_text = "\n".join(
-        f"[{svc}] " + "\n".join(events[-10:])
-        for svc, events in context.get("pod_events", {}).items()
-    )
-    metrics_text = str(context.get("metrics", {}))
-
     prompt = ANALYZE_PROMPT.format(
         issue_type=state.get("issue_type", "unknown"),
-        affected_service=service,
+        affected_service=state.get("affected_service", ""),
         error_message=state.get("error_message", ""),
-        pod_logs=logs_text[:3000],
-        pod_status=status_text[:500],
-        pod_events=events_text[:1000],
-        metrics=metrics_text[:500],
+        **_context_sections(state.get("context", {})),
     )
 
     try:
@@ -196,6 +196,107 @@ def analyze(state: DeliveryState) -> DeliveryState:
         return {**state, "status": "error", "error": f"분석 실패: {e}"}
 
 
+def analyze_and_plan(state: DeliveryState) -> DeliveryState:
+    """LLM 1회 호출로 근본 원인 분석 + manifest 수정안 생성 (COMBINED_LLM 모드 첫 시도)
+
+    실패 시 status=error 로 반환하며, 그래프가 기존 analyze → plan_fix 경로로 폴백한다.
+    """
+    from dr_kube.llm import get_llm
+
+    issue_type = state.get("issue_type", "unknown")
+    service = state.get("affected_service", "")
+    strategy = get_retry_strategy(issue_type, 0)
+
+    target_file = DELIVERY_SERVICES.get(service)
+    if not target_file:
+        return {**state, "status": "error", "error": f"알 수 없는 서비스: {service}"}
+
+    try:
+        current_manifest = read_manifest(target_file, str(PROJECT_ROOT))
+    except FileNotFoundError as e:
+        return {**state, "status": "error", "error": str(e)}
+
+    policy = ISSUE_POLICY.get(issue_type, ISSUE_POLICY["unknown"])
+    prompt = ANALYZE_AND_PLAN_PROMPT.format(
+        issue_type=issue_type,
+        affected_service=service,
+        error_message=state.get("error_message", ""),
+        current_manifest=current_manifest,
+        strategy=strategy,
+        strategy_guidance=STRATEGY_GUIDANCE.get(strategy, ""),
+        allowed_fields="\n".join(f"- {f}" for f in policy["allowed_field_patterns"]),
+        **_context_sections(state.get("context", {})),
+    )
+
+    try:
+        llm = get_llm()
+        structured = llm.with_structured_output(AnalyzeAndPlanOutput)
+        result: AnalyzeAndPlanOutput = structured.invoke([HumanMessage(content=prompt)])
+    except Exception as e:
+        logger.warning("분석+수정안 단일 호출 실패 (%s) → analyze/plan_fix 폴백", e)
+        return {**state, "status": "error", "error": f"분석+수정안 생성 실패: {e}"}
+
+    logger.info("분석+수정안 완료: severity=%s, file=%s, changed=%s",
+                result.severity, result.target_file, result.changed_fields)
+
+    requires_human = should_require_human(
+        issue_type=issue_type,
+        severity=result.severity,
+        affected_services=result.affected_services,
+        retry_count=state.get("retry_count", 0),
+        llm_requires_human=result.requires_human_approval,
+    )
+
+    return {
+        **state,
+        "root_cause": result.root_cause,
+        "severity": result.severity,
+        "affected_services": result.affected_services,
+        "analysis_summary": result.analysis_summary,
+        "requires_human_approval": requires_human,
+        "fix_plan": {
+            "target_service": result.target_service,
+            "target_file": result.target_file,
+            "original_manifest": current_manifest,
+            "modified_manifest": result.modified_manifest,
+            "changed_fields": result.changed_fields,
+            "fix_description": result.fix_description,
+            "rationale": result.rationale,
+            "strategy": strategy,
+            "fix_method": "llm",
+        },
+        "validation_errors": [],
+        "status": "fix_planned",
+    }
+
+
+def plan_fix_rules(state: DeliveryState) -> DeliveryState:
+    """정책 수치로 결정적 수정안 생성 (LLM 없음). 적용 규칙이 없으면 plan_fix로 넘김"""
+    issue_type = state.get("issue_type", "unknown")
+    service = state.get("affected_service", "")
+    target_file = DELIVERY_SERVICES.get(service)
+    if not target_file:
+        return {**state, "status": "no_rule"}
+
+    try:
+        current_manifest = read_manifest(target_file, str(PROJECT_ROOT))
+    except FileNotFoundError:
+        return {**state, "status": "no_rule"}
+
+    fix_plan = plan_deterministic(issue_type, service, target_file, current_manifest)
+    if fix_plan is None:
+        logger.info("결정적 규칙 없음 (%s) → LLM plan_fix", issue_type)
+        return {**state, "status": "no_rule"}
+
+    logger.info("규칙 기반 수정안: file=%s, changed=%s", target_file, fix_plan["changed_fields"])
+    return {
+        **state,
+        "fix_plan": fix_plan,
+        "validation_errors": [],
+        "status": "fix_planned",
+    }
+
+
 def plan_fix(state: DeliveryState) -> DeliveryState:
     """LLM으로 manifest 수정안 생성 (구조화 출력)"""
     from dr_kube.llm import get_llm
@@ -218,7 +319,11 @@ def plan_fix(state: DeliveryState) -> DeliveryState:
     # 허용 필드
     policy = ISSUE_POLICY.get(issue_type, ISSUE_POLICY["unknown"])
     allowed_fields = "\n".join(f"- {f}" for f in policy["allowed_field_patterns"])
-    previous_errors = "\n".join(state.get("validation_errors", [])) or "없음"
+    # 정책 위반은 구조화된 사유(code/경로)로, 나머지 검증 오류는 그대로 전달
+    previous_errors = "\n".join(
+        [e for e in state.get("validation_errors", []) if not e.startswith("정책 위반")]
+        + [f"- [{v['code']}] {v['message']}" for v in state.get("policy_violations") or []]
+    ) or "없음"
     human_comment = state.get("human_comment", "") or "없음"
 
     prompt = PLAN_FIX_PROMPT.format(
@@ -251,6 +356,7 @@ def plan_fix(state: DeliveryState) -> DeliveryState:
             "fix_description": result.fix_description,
             "rationale": result.rationale,
             "strategy": strategy,
+            "fix_method": "llm",
         }
 
         return {
@@ -270,7 +376,7 @@ def plan_fix(state: DeliveryState) -> DeliveryState:
 
 
 def validate_fix(state: DeliveryState) -> DeliveryState:
-    """YAML 문법 + 정책 검증"""
+    """YAML 문법 + 정책 검증 (변경 경로는 LLM 응답이 아닌 구조적 diff로 계산)"""
     fix_plan = state.get("fix_plan", {})
     issue_type = state.get("issue_type", "unknown")
     errors: list[str] = []
@@ -279,44 +385,53 @@ def validate_fix(state: DeliveryState) -> DeliveryState:
 
     # 1. YAML 문법 검증
     try:
-        parsed = yaml.safe_load(modified)
+        parsed = _load_deployment(modified)
+        original_parsed = _load_deployment(fix_plan.get("original_manifest", ""))
     except yaml.YAMLError as e:
         errors.append(f"YAML 문법 오류: {e}")
         return {**state, "validation_errors": errors, "status": "invalid"}
 
     # 2. Kind 확인 (Deployment여야 함)
-    if not isinstance(parsed, dict) or parsed.get("kind") != "Deployment":
+    if parsed is None:
         errors.append("수정된 manifest는 Deployment Kind여야 합니다")
-
-    # 3. 정책 검증: 허용된 필드만 변경되었는지
-    policy = ISSUE_POLICY.get(issue_type, ISSUE_POLICY["unknown"])
-    allowed = policy["allowed_field_patterns"]
-    forbidden = policy["forbidden_field_patterns"]
-    changed = fix_plan.get("changed_fields", [])
-
-    for field in changed:
-        # 금지 필드 체크
-        for fpattern in forbidden:
-            fbase = fpattern.replace("[*]", "").replace("[0]", "")
-            if fbase in field:
-                errors.append(f"정책 위반: '{field}'는 {issue_type}에서 변경 불가")
+        changed: list[str] = []
+        added: dict = {}
+    else:
+        changes = yaml_diff.diff(original_parsed or {}, parsed)
+        changed = yaml_diff.changed_paths(changes)
+        added = yaml_diff.added_values(changes)
+        claimed = set(fix_plan.get("changed_fields", []))
+        if claimed and claimed != set(changed):
+            logger.info("changed_fields 보정: LLM=%s → diff=%s", sorted(claimed), changed)
+        fix_plan = {**fix_plan, "changed_fields": changed}
+
+    # 3. 정책 검증: 허용된 필드만 변경되었는지 (컴파일된 정책 1회 평가)
+    policy_result = evaluate_fix_policy(issue_type, changed, added)
+    errors.extend(f"정책 위반({issue_type}): {v.message}" for v in policy_result.violations)
 
     # 4. 실제로 변경이 있는지 확인
-    original = fix_plan.get("original_manifest", "")
-    if modified.strip() == original.strip():
+    if parsed is not None and not changed:
         errors.append("수정된 내용이 원본과 동일합니다")
 
     if errors:
         logger.warning("검증 실패 (%d개): %s", len(errors), errors)
         return {
             **state,
+            "fix_plan": fix_plan,
             "validation_errors": errors,
+            "policy_violations": [v.to_dict() for v in policy_result.violations],
             "retry_count": state.get("retry_count", 0) + 1,
             "status": "invalid",
         }
 
-    logger.info("검증 통과")
-    return {**state, "validation_errors": [], "status": "validated"}
+    logger.info("검증 통과: changed=%s", changed)
+    return {
+        **state,
+        "fix_plan": fix_plan,
+        "validation_errors": [],
+        "policy_violations": [],
+        "status": "validated",
+    }
 
 
 def human_gate(state: DeliveryState) -> DeliveryState:
@@ -365,8 +480,8 @@ def human_gate_wait(state: DeliveryState) -> DeliveryState:
 
 
 def create_pr(state: DeliveryState) -> DeliveryState:
-    """GitHub PR 생성 (branch → commit → push → PR)"""
-    from dr_kube.github import GitHubClient, generate_branch_name
+    """GitHub PR 생성 (plumbing commit → push → PR, working tree 무변경)"""
+    from dr_kube.github import generate_branch_name, get_github_client
 
     fix_plan = state.get("fix_plan", {})
     service = state.get("affected_service", "")
@@ -378,35 +493,26 @@ def create_pr(state: DeliveryState) -> DeliveryState:
     )
 
     try:
-        gh = GitHubClient()
+        gh = get_github_client(str(PROJECT_ROOT))
 
-        # 1. 브랜치 생성
-        ok, msg = gh.create_branch(branch_name)
-        if not ok:
-            return {**state, "status": "error", "error": f"브랜치 생성 실패: {msg}"}
-
-        # 2. 파일 쓰기
+        # 1. 커밋 + 푸시 (working tree 변경 없이 원격 브랜치 생성)
         target_file = fix_plan.get("target_file", "")
-        modified_manifest = fix_plan.get("modified_manifest", "")
-        file_abs = PROJECT_ROOT / target_file
-        file_abs.write_text(modified_manifest, encoding="utf-8")
-        logger.info("파일 수정: %s", target_file)
-
-        # 3. 커밋 + 푸시
         commit_msg = f"fix({service}): {fix_plan.get('fix_description', 'auto fix')}"
-        ok, msg = gh.commit_and_push(target_file, commit_msg, branch_name)
+        ok, msg = gh.commit_files(
+            branch_name, {target_file: fix_plan.get("modified_manifest", "")}, commit_msg,
+            originals={target_file: fix_plan.get("original_manifest", "")},
+        )
         if not ok:
-            gh.cleanup()
             return {**state, "status": "error", "error": f"커밋/푸시 실패: {msg}"}
+        logger.info("커밋 생성: %s (%s)", target_file, msg[:12])
 
-        # 4. PR 생성
+        # 2. PR 생성
         ok, pr_url, pr_number = gh.create_pr(
             branch_name=branch_name,
             title=commit_msg,
             body=_build_pr_body(state),
         )
         if not ok:
-            gh.cleanup()
             return {**state, "status": "error", "error": f"PR 생성 실패: {pr_url}"}
 
         logger.info("PR 생성: %s (#%d)", pr_url, pr_number)
@@ -425,23 +531,26 @@ def create_pr(state: DeliveryState) -> DeliveryState:
 
 def verify_recovery(state: DeliveryState) -> DeliveryState:
     """복구 검증: Pod 상태 + Alert 해소 확인"""
-    from dr_kube.verifier import verify_fix
+    from dr_kube.verifier import verify_fix_async
 
     affected_services = state.get("affected_services", [state.get("affected_service", "")])
     namespace = state.get("affected_namespace", "delivery-app")
 
     logger.info("복구 검증 시작: services=%s", affected_services)
 
+    # 서비스별 검증을 동시에 등록 (가장 느린 서비스 기준으로 끝남)
+    futures = {
+        svc: verify_fix_async(namespace=namespace, resource=svc, fingerprint=state.get("fingerprint", ""))
+        for svc in affected_services
+    }
     all_recovered = True
-    for svc in affected_services:
-        success, detail = verify_fix(
-            namespace=namespace,
-            resource=svc,
-            fingerprint=state.get("fingerprint", ""),
-        )
+    for svc, future in futures.items():
+        success, detail = future.result()
         if not success:
             all_recovered = False
-            logger.warning("복구 미완료: %s", svc)
+            logger.warning("복구 미완료: %s (%s)", svc, detail)
+            for other in futures.values():
+                other.cancel()
             break
 
     status = "recovered" if all_recovered else "recovery_failed"
@@ -496,13 +605,51 @@ def escalate(state: DeliveryState) -> DeliveryState:
 
 # ── 헬퍼 ──────────────────────────────────────────────
 
+def _context_sections(context: dict) -> dict[str, str]:
+    """수집된 컨텍스트 → 프롬프트 섹션 텍스트 (길이 제한 적용)"""
+    logs_text = "\n".join(
+        f"[{svc}]\n" + "\n".join(lines[-30:])
+        for svc, lines in context.get("pod_logs", {}).items()
+    )
+    events_text = "\n".join(
+        f"[{svc}] " + "\n".join(events[-10:])
+        for svc, events in context.get("pod_events", {}).items()
+    )
+    anomalies_text = "\n".join(
+        f"- {a['service']} {a['issue_type']} score={a['score']} ({a['evidence']})"
+        for a in context.get("anomalies", [])[:3]
+    )
+    sections = {
+        "pod_logs": logs_text[:3000],
+        "pod_status": str(context.get("pod_status", {}))[:500],
+        "pod_events": events_text[:1000],
+        "metrics": str(context.get("metrics", {}))[:500]
+                   + (f"\n이상 점수 상위:\n{anomalies_text}" if anomalies_text else ""),
+    }
+    # 마감을 넘겨 빠진 소스는 "데이터 없음"과 구분되도록 표시
+    section_of = {"logs": "pod_logs", "status": "pod_status", "events": "pod_events", "metrics": "metrics"}
+    for source in context.get("timed_out", []):
+        kind, _, svc = source.partition("/")
+        if kind in section_of:
+            sections[section_of[kind]] += f"\n[수집 시간 초과] {svc}"
+    return sections
+
+
+def _load_deployment(manifest: str) -> dict | None:
+    """manifest 텍스트(다중 문서 가능)에서 Deployment 문서 추출"""
+    for doc in yaml.safe_load_all(manifest or ""):
+        if isinstance(doc, dict) and doc.get("kind") == "Deployment":
+            return doc
+    return None
+
+
 def _make_diff_summary(original: str, modified: str) -> str:
-    """변경 요약 (간단한 diff)"""
-    orig_lines = set(original.splitlines())
-    mod_lines = set(modified.splitlines())
-    added = [f"+ {l}" for l in mod_lines - orig_lines if l.strip()][:10]
-    removed = [f"- {l}" for l in orig_lines - mod_lines if l.strip()][:10]
-    return "\n".join(removed + added)
+    """변경 요약 (Deployment 구조적 diff)"""
+    try:
+        changes = yaml_diff.diff(_load_deployment(original) or {}, _load_deployment(modified) or {})
+    except yaml.YAMLError as e:
+        return f"(YAML 파싱 실패로 diff 생략: {e})"
+    return yaml_diff.render_diff(changes, limit=20)
 
 
 def _build_pr_body(state: DeliveryState) -> str:
@@ -0,0 +1,117 @@
+"""결정적 수정 계획 (LLM 없음)
+
+ISSUE_POLICY에 이미 수치가 정의된 이슈 타입은 파싱된 Deployment에 정책을 직접 적용해
+FixPlan을 만든다. 편집은 yaml_edit로 원본 파일 텍스트에 최소 적용되므로
+같은 파일의 Service 문서와 주석이 그대로 유지된다.
+
+지원:
+  - oom              : 컨테이너 memory limit × min_factor (원본 × max_factor 상한)
+  - replica_shortage : spec.replicas 를 [min_replicas, max_replicas] 범위로 복구/증설
+"""
+import logging
+from typing import Any
+
+import yaml
+
+from delivery_agent.policy import ISSUE_POLICY
+from dr_kube import yaml_edit
+from dr_kube.rules import parse_quantity, scale_quantity
+from dr_kube.yaml_diff import to_dotted
+
+logger = logging.getLogger("delivery-planner")
+
+
+def _deployment_index(docs: list) -> int:
+    for idx, doc in enumerate(docs):
+        if isinstance(doc, dict) and doc.get("kind") == "Deployment":
+            return idx
+    return -1
+
+
+def _target_containers(deployment: dict, service: str) -> list[tuple[int, dict]]:
+    containers = deployment.get("spec", {}).get("template", {}).get("spec", {}).get("containers", []) or []
+    named = [(i, c) for i, c in enumerate(containers) if c.get("name") == service]
+    return named or list(enumerate(containers))
+
+
+def _plan_oom(deployment: dict, service: str, policy: dict) -> tuple[dict[tuple, Any], str, str]:
+    factor = float(policy.get("min_factor", 1.5))
+    max_factor = float(policy.get("max_factor", factor))
+    updates: dict[tuple, Any] = {}
+    notes: list[str] = []
+    for idx, container in _target_containers(deployment, service):
+        current = (container.get("resources") or {}).get("limits", {}).get("memory")
+        if current is None:
+            continue
+        base, _ = parse_quantity(current)
+        new = scale_quantity(current, factor, max_value=base * max_factor, kind="memory")
+        if new == current:
+            continue
+        path = ("spec", "template", "spec", "containers", idx, "resources", "limits", "memory")
+        updates[path] = new
+        notes.append(f"{container.get('name', idx)} {current}→{new}")
+    description = f"increase memory limit for {service}"
+    rationale = f"OOMKilled 대응: memory limit을 정책 최소 배율({factor}배)로 상향 ({', '.join(notes)})"
+    return updates, description, rationale
+
+
+def _plan_replicas(deployment: dict, service: str, policy: dict) -> tuple[dict[tuple, Any], str, str]:
+    current = deployment.get("spec", {}).get("replicas", 1)
+    if not isinstance(current, int):
+        return {}, "", ""
+    min_replicas = int(policy.get("min_replicas", 2))
+    max_replicas = int(policy.get("max_replicas", 4))
+    new = min(max(current + 1, min_replicas), max_replicas)
+    if new == current:
+        return {}, "", ""
+    description = f"restore replicas for {service} to {new}"
+    rationale = f"replicas 강제 축소 대응: spec.replicas {current}→{new} (정책 범위 {min_replicas}~{max_replicas})"
+    return {("spec", "replicas"): new}, description, rationale
+
+
+_PLANNERS = {
+    "oom": _plan_oom,
+    "replica_shortage": _plan_replicas,
+}
+
+
+def has_rule(issue_type: str) -> bool:
+    """결정적 규칙이 정의된 이슈 타입인지"""
+    return issue_type in _PLANNERS
+
+
+def plan_deterministic(issue_type: str, service: str, target_file: str, manifest: str) -> dict | None:
+    """정책 수치로 FixPlan 생성. 적용할 규칙이 없거나 변경이 없으면 None."""
+    planner = _PLANNERS.get(issue_type)
+    if planner is None:
+        return None
+    try:
+        docs = list(yaml.safe_load_all(manifest))
+    except yaml.YAMLError:
+        return None
+    doc_idx = _deployment_index(docs)
+    if doc_idx < 0:
+        return None
+
+    policy = ISSUE_POLICY.get(issue_type, ISSUE_POLICY["unknown"])
+    try:
+        updates, description, rationale = planner(docs[doc_idx], service, policy)
+        if not updates:
+            return None
+        modified = yaml_edit.set_values(manifest, updates, document=doc_idx)
+    except (ValueError, TypeError) as e:
+        logger.warning("결정적 수정 계획 실패 (%s/%s): %s", issue_type, service, e)
+        return None
+
+    return {
+        "target_service": service,
+        "target_file": target_file,
+        "original_manifest": manifest,
+        "modified_manifest": modified,
+        "changed_fields": [to_dotted(p) for p in updates],
+        "fix_description": description[:60],
+        "rationale": rationale,
+        "strategy": "conservative",
+        "fix_method": "rule_based",
+    }
+
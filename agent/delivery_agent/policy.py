@@ -1,4 +1,8 @@
 """이슈 타입별 수정 정책 및 서비스 토폴로지"""
+from dr_kube.policy_engine import PolicyResult, compile_policies
+
+# 컨테이너 필드 경로 prefix (정책 glob: [*] = 모든 컨테이너)
+_CONTAINER = "spec.template.spec.containers[*]"
 
 # delivery-app 서비스 → manifest 파일 매핑
 DELIVERY_SERVICES: dict[str, str] = {
@@ -20,8 +24,8 @@ DEPENDENCY_GRAPH: dict[str, list[str]] = {
 ISSUE_POLICY: dict[str, dict] = {
     "oom": {
         # memory limit 증가만 허용, 최소 1.5배 ~ 최대 4배
-        "allowed_field_patterns": ["resources.limits.memory", "resources.requests.memory"],
-        "forbidden_field_patterns": ["spec.replicas", "spec.template.spec.containers[*].env"],
+        "allowed_field_patterns": [f"{_CONTAINER}.resources.limits.memory", f"{_CONTAINER}.resources.requests.memory"],
+        "forbidden_field_patterns": ["spec.replicas", f"{_CONTAINER}.env"],
         "min_factor": 1.5,
         "max_factor": 4.0,
         "requires_human": False,
@@ -30,9 +34,9 @@ ISSUE_POLICY: dict[str, dict] = {
     "crash_loop": {
         # 환경변수나 probe 조정만 허용, 핵심 서비스면 human 필수
         "allowed_field_patterns": [
-            "spec.template.spec.containers[*].livenessProbe",
-            "spec.template.spec.containers[*].readinessProbe",
-            "spec.template.spec.containers[*].env",
+            f"{_CONTAINER}.livenessProbe",
+            f"{_CONTAINER}.readinessProbe",
+            f"{_CONTAINER}.env",
         ],
         "forbidden_field_patterns": ["spec.replicas"],
         "requires_human": True,  # 항상 human 승인
@@ -42,8 +46,8 @@ ISSUE_POLICY: dict[str, dict] = {
         # 연결 실패는 replicas 증설 또는 probe 완화
         "allowed_field_patterns": [
             "spec.replicas",
-            "spec.template.spec.containers[*].readinessProbe",
-            "spec.template.spec.containers[*].livenessProbe",
+            f"{_CONTAINER}.readinessProbe",
+            f"{_CONTAINER}.livenessProbe",
         ],
         "forbidden_field_patterns": [],
         "requires_human": False,
@@ -53,8 +57,8 @@ ISSUE_POLICY: dict[str, dict] = {
         # replicas 증설 또는 resource limit 증가
         "allowed_field_patterns": [
             "spec.replicas",
-            "resources.limits.cpu",
-            "resources.requests.cpu",
+            f"{_CONTAINER}.resources.limits.cpu",
+            f"{_CONTAINER}.resources.requests.cpu",
         ],
         "forbidden_field_patterns": [],
         "requires_human": False,
@@ -64,8 +68,8 @@ ISSUE_POLICY: dict[str, dict] = {
         # CPU 관련 조정 + replicas
         "allowed_field_patterns": [
             "spec.replicas",
-            "resources.limits.cpu",
-            "resources.requests.cpu",
+            f"{_CONTAINER}.resources.limits.cpu",
+            f"{_CONTAINER}.resources.requests.cpu",
         ],
         "forbidden_field_patterns": [],
         "requires_human": False,
@@ -75,6 +79,8 @@ ISSUE_POLICY: dict[str, dict] = {
         # replicas 0 → 적정 수로 복구
         "allowed_field_patterns": ["spec.replicas"],
         "forbidden_field_patterns": [],
+        "min_replicas": 2,
+        "max_replicas": 4,
         "requires_human": False,
         "retry_strategies": ["conservative", "moderate"],
     },
@@ -82,9 +88,9 @@ ISSUE_POLICY: dict[str, dict] = {
         # 삭제된 Deployment 복구 (manifest 원본 그대로 재적용)
         "allowed_field_patterns": [
             "spec.replicas",
-            "spec.template.spec.containers[*].image",
-            "resources.limits.memory",
-            "resources.limits.cpu",
+            f"{_CONTAINER}.image",
+            f"{_CONTAINER}.resources.limits.memory",
+            f"{_CONTAINER}.resources.limits.cpu",
         ],
         "forbidden_field_patterns": [],
         "requires_human": True,  # 삭제는 의도적일 수 있으므로 human 확인
@@ -98,6 +104,23 @@ ISSUE_POLICY: dict[str, dict] = {
     },
 }
 
+# 시작 시 1회 컴파일: 변경 경로는 모두 allowed에 속해야 하고 forbidden은 항상 거부
+COMPILED_POLICIES = compile_policies({
+    issue_type: {
+        "allow": policy["allowed_field_patterns"],
+        "deny": policy["forbidden_field_patterns"],
+        "allow_mode": "all",
+    }
+    for issue_type, policy in ISSUE_POLICY.items()
+})
+
+
+def evaluate_fix_policy(issue_type: str, changed_paths: list[str], added: dict | None = None) -> PolicyResult:
+    """변경 경로 목록을 이슈 타입 정책으로 평가 (added: 통째 추가된 값, 말단 경로로 평가)"""
+    policy = COMPILED_POLICIES.get(issue_type, COMPILED_POLICIES["unknown"])
+    return policy.evaluate(changed_paths, added)
+
+
 # human approval 강제 조건 (정책과 별개로 추가 조건)
 FORCE_HUMAN_APPROVAL_CONDITIONS = {
     "critical_services": ["order-service"],   # 핵심 트랜잭션 서비스
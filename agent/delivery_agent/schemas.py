@@ -54,3 +54,7 @@ class FixPlanOutput(BaseModel):
         if not v.startswith("manifests/delivery-app/"):
             raise ValueError(f"target_file은 manifests/delivery-app/ 로 시작해야 합니다: {v}")
         return v
+
+
+class AnalyzeAndPlanOutput(AnalysisResult, FixPlanOutput):
+    """analyze_and_plan 노드 LLM 출력 (분석 + 수정안 단일 호출)"""
@@ -24,6 +24,8 @@ class ContextData(TypedDict, total=False):
     pod_status: dict[str, dict]         # service → {phase, restart_count, conditions}
     metrics: dict[str, dict]            # service → {memory_pct, cpu_pct, rps, error_rate}
     dependency_health: dict[str, bool]  # service → upstream 응답 여부
+    anomalies: list[dict]               # 메트릭 이상 점수 순위 [{service, issue_type, score, evidence}]
+    timed_out: list[str]                # 마감 안에 못 받은 소스 ("metrics/order-service")
 
 
 class FixPlan(TypedDict, total=False):
@@ -36,6 +38,7 @@ class FixPlan(TypedDict, total=False):
     fix_description: str        # 60자 이내 영문 설명
     rationale: str              # 변경 근거 (한국어)
     strategy: RetryStrategy     # 이번 시도의 전략
+    fix_method: Literal["rule_based", "llm"]  # 수정안 생성 방식
 
 
 class DeliveryState(TypedDict, total=False):
@@ -60,6 +63,7 @@ class DeliveryState(TypedDict, total=False):
     # ── 수정 계획 ──────────────────────────────────
     fix_plan: FixPlan
     validation_errors: list[str]
+    policy_violations: list[dict]  # 구조화된 정책 위반 사유 (code/path/rule/message)
 
     # ── Human-in-the-Loop ─────────────────────────
     requires_human_approval: bool
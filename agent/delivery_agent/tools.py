@@ -1,55 +1,213 @@
 """K8s / Prometheus 읽기 전용 도구 (GitOps 원칙: kubectl 쓰기 금지)"""
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
-from typing import Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable
 
-from kubernetes import client, config as k8s_config
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 
+from delivery_agent.anomaly import score_service
 from delivery_agent.policy import DEPENDENCY_GRAPH
+from dr_kube.informer import list_objects
+from dr_kube.k8s_client import core_v1
+from dr_kube.prometheus import get_prometheus
 
 logger = logging.getLogger("delivery-tools")
 
-PROMETHEUS_URL = os.getenv(
-    "PROMETHEUS_URL",
-    "http://prometheus-operated.monitoring.svc.cluster.local:9090",
-)
-
-LOG_LINES = 100       # 수집할 로그 라인 수
+LOG_LINES = 100       # 수집할 로그 라인 수 (전체 Pod 병합 후)
+LOG_BYTE_BUDGET = int(os.getenv("LOG_BYTE_BUDGET", "65536"))  # 서비스당 로그 바이트 예산
+LOG_LOOKBACK_SECONDS = int(os.getenv("LOG_LOOKBACK_SECONDS", "300"))  # alert 시작 몇 초 전부터 읽을지
+LOG_MAX_STREAMS = 12  # 서비스당 최대 로그 스트림 (Pod × 현재/이전 컨테이너)
+LOG_STREAM_WORKERS = 16
+LOG_CHUNK_BYTES = 8192
+LOG_MERGE_MARGIN = 0.25  # 소스 마감 전에 스트림 대기를 끝내고 병합할 여유 (초)
 EVENTS_MINUTES = 30   # 이벤트 조회 시간 범위 (분)
-COLLECT_TIMEOUT = 10  # 병렬 수집 타임아웃 (초)
+COLLECT_TIMEOUT = float(os.getenv("COLLECT_TIMEOUT", "10"))  # 병렬 수집 전체 예산 (초)
+# 인시던트 1건의 최대 수집 작업 수: 서비스(영향 + upstream)마다 logs/status, 영향 서비스 events/metrics, anomalies
+COLLECT_FANOUT = 2 * (1 + max(map(len, DEPENDENCY_GRAPH.values()), default=0)) + 3
+COLLECT_CONCURRENT_INCIDENTS = int(os.getenv("COLLECT_CONCURRENT_INCIDENTS", "4"))  # 동시에 수집할 인시던트 수
+# 공유 수집 풀 크기 (기본: 팬아웃 × 동시 인시던트 — 작업이 대기열에서 마감을 쓰지 않도록). 스레드는 필요할 때만 생성
+COLLECT_WORKERS = int(os.getenv("COLLECT_WORKERS", "0")) or COLLECT_FANOUT * COLLECT_CONCURRENT_INCIDENTS
+
+# 소스별 마감 (초, 전체 예산 안에서 먼저 끝나는 쪽 적용). 늦은 소스는 버리고 나머지로 진행
+SOURCE_DEADLINES = {
+    "status": 5.0,   # 인포머 캐시 (보통 즉시, 최초 동기화 전이면 직접 list)
+    "events": 5.0,
+    "logs": 6.0,
+    "metrics": 6.0,
+    "anomalies": 8.0,  # 범위 쿼리 + 이상 점수 (영향 서비스 + 이웃)
+}
 
 
-def _load_k8s_config():
-    try:
-        k8s_config.load_incluster_config()
-    except k8s_config.ConfigException:
-        k8s_config.load_kube_config()
+# ── Pod 로그 ──────────────────────────────────────────
 
+_log_executor: ThreadPoolExecutor | None = None
+_log_executor_lock = threading.Lock()
 
-# ── Pod 로그 ──────────────────────────────────────────
 
-def fetch_pod_logs(service: str, namespace: str, lines: int = LOG_LINES) -> list[str]:
-    """서비스의 최근 로그 반환 (Pod 내 컨테이너 첫 번째)"""
+def _get_log_executor() -> ThreadPoolExecutor:
+    """로그 스트림용 워커 풀 (수집 풀 안에서 다시 기다리므로 별도 풀)"""
+    global _log_executor
+    with _log_executor_lock:
+        if _log_executor is None:
+            _log_executor = ThreadPoolExecutor(max_workers=LOG_STREAM_WORKERS, thread_name_prefix="log-stream")
+        return _log_executor
+
+
+def _since_seconds(alert_start: str) -> int | None:
+    """alert 시작 LOG_LOOKBACK_SECONDS 전부터의 초 (서버 측 sinceSeconds). 시작 시각을 모르면 None."""
+    if not alert_start:
+        return None
     try:
-        _load_k8s_config()
-        v1 = client.CoreV1Api()
-        pods = v1.list_namespaced_pod(
-            namespace=namespace,
-            label_selector=f"app={service}",
+        started = datetime.fromisoformat(alert_start.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if started.tzinfo is None:
+        started = started.replace(tzinfo=timezone.utc)
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    return max(1, int(elapsed + LOG_LOOKBACK_SECONDS))
+
+
+def _log_streams(service: str, pods: list[dict]) -> list[tuple[str, str, bool]]:
+    """(Pod, 컨테이너, previous) 목록. 재시작한 Pod는 이전 컨테이너도 포함, 재시작/미준비 Pod 우선."""
+    streams = []
+    for pod in pods:
+        name = pod["metadata"]["name"]
+        containers = [c.get("name") for c in (pod.get("spec") or {}).get("containers") or []]
+        container = service if service in containers else (containers[0] if containers else "")
+        status = next(
+            (cs for cs in (pod.get("status") or {}).get("containerStatuses") or [] if cs.get("name") == container),
+            {},
         )
-        if not pods.items:
+        restarts = status.get("restartCount") or 0
+        priority = (restarts == 0, bool(status.get("ready")))
+        streams.append((priority, name, container, False))
+        if restarts:
+            streams.append((priority, name, container, True))
+    streams.sort(key=lambda s: s[0])
+    return [(name, container, previous) for _, name, container, previous in streams[:LOG_MAX_STREAMS]]
+
+
+def _read_log_stream(pod: str, container: str, previous: bool, namespace: str,
+                     since: int | None, lines: int, byte_cap: int, deadline: float) -> list[str]:
+    """로그를 청크 단위로 읽으며 최근 lines줄 / byte_cap 바이트만 유지 (전체 로그를 메모리에 올리지 않음).
+    deadline(monotonic)이 지나거나 읽기가 시간 초과되면 그때까지 읽은 줄만 반환."""
+    kwargs = {"since_seconds": since} if since else {}
+    resp = core_v1().read_namespaced_pod_log(
+        name=pod,
+        namespace=namespace,
+        container=container or None,
+        previous=previous,
+        tail_lines=lines,
+        timestamps=True,
+        _preload_content=False,
+        _request_timeout=max(0.1, deadline - time.monotonic()),
+        **kwargs,
+    )
+    tag = f"[{pod}{' (이전 컨테이너)' if previous else ''}]"
+    kept: deque[str] = deque()
+    size = 0
+    partial = b""
+
+    def keep(raw: bytes) -> None:
+        nonlocal size
+        if not raw:
+            return
+        ts, _, message = raw.decode("utf-8", errors="replace").partition(" ")
+        line = f"{ts} {tag} {message}"
+        kept.append(line)
+        size += len(line)
+        while kept and (size > byte_cap or len(kept) > lines):
+            size -= len(kept.popleft())
+
+    try:
+        for chunk in resp.stream(LOG_CHUNK_BYTES):
+            *complete, partial = (partial + chunk).split(b"\n")
+            for raw in complete:
+                keep(raw)
+            if time.monotonic() >= deadline:
+                logger.debug("로그 스트림 마감 도달 (%s): %d줄까지 사용", pod, len(kept))
+                partial = b""  # 마감으로 끊긴 줄은 버림
+                break
+        keep(partial)
+    except Urllib3HTTPError as e:
+        # 읽기 시간 초과/연결 끊김: 이미 읽은 줄은 사용
+        logger.debug("로그 스트림 중단 (%s): %s — %d줄까지 사용", pod, e, len(kept))
+    finally:
+        resp.release_conn()
+    return list(kept)
+
+
+def _timestamp_key(line: str) -> str:
+    """RFC3339Nano 시각은 소수부 뒤 0을 생략하므로 9자리로 맞춰 정렬 키로 사용"""
+    ts = line.split(" ", 1)[0].rstrip("Z")
+    whole, _, frac = ts.partition(".")
+    return f"{whole}.{frac:0<9}"
+
+
+def fetch_pod_logs(service: str, namespace: str, lines: int = LOG_LINES, alert_start: str = "",
+                   deadline: float | None = None) -> list[str]:
+    """서비스 전체 Pod의 로그를 동시에 스트리밍해 시각순으로 병합 (최근 lines줄, LOG_BYTE_BUDGET 이내)
+
+    재시작한 컨테이너는 이전 인스턴스 로그(previous)도 읽는다.
+    alert_start가 있으면 그 LOG_LOOKBACK_SECONDS 전부터만 서버에서 잘라 받는다.
+    지금 + logs 소스 마감(deadline(monotonic)이 더 이르면 그 시각)까지 남은 시간 안에서만 스트림을 기다리고,
+    늦은 스트림은 읽은 만큼만 포함해 부분 병합 결과를 반환한다.
+    """
+    own_deadline = time.monotonic() + SOURCE_DEADLINES["logs"]
+    deadline = own_deadline if deadline is None else min(own_deadline, deadline)
+    try:
+        pods = list_objects("Pod", namespace, f"app={service}")
+        if not pods:
             return [f"[경고] {service} Pod 없음"]
 
-        pod_name = pods.items[0].metadata.name
-        log_text = v1.read_namespaced_pod_log(
-            name=pod_name,
-            namespace=namespace,
-            tail_lines=lines,
-            timestamps=True,
-        )
-        return log_text.splitlines()[-lines:]
+        streams = _log_streams(service, pods)
+        since = _since_seconds(alert_start)
+        byte_cap = max(1024, LOG_BYTE_BUDGET // len(streams))
+        executor = _get_log_executor()
+        # 스트림은 병합 여유를 두 번 남기고 읽기를 끝내고, 대기는 한 번 남기고 끝냄
+        stream_deadline = deadline - 2 * LOG_MERGE_MARGIN
+        futures = {
+            executor.submit(_read_log_stream, pod, container, previous, namespace, since, lines, byte_cap,
+                            stream_deadline): (pod, previous)
+            for pod, container, previous in streams
+        }
+        done, not_done = wait(futures, timeout=max(0.0, deadline - LOG_MERGE_MARGIN - time.monotonic()))
+        for future in not_done:
+            future.cancel()
+
+        merged: list[str] = []
+        errors: list[str] = []
+        for future in done:
+            pod, previous = futures[future]
+            try:
+                merged.extend(future.result())
+            except ApiException as e:
+                # 이전 컨테이너 로그가 이미 정리된 경우 등은 조용히 건너뜀
+                if not previous:
+                    errors.append(f"[오류] {pod} 로그 수집 실패: {e.reason}")
+            except Exception as e:
+                errors.append(f"[오류] {pod} 로그 수집 실패: {e}")
+        if not_done:
+            logger.warning("로그 스트림 마감 초과 (%s): %d/%d", service, len(not_done), len(futures))
+        if errors:
+            logger.warning("로그 수집 일부 실패 (%s): %s", service, errors)
+
+        merged.sort(key=_timestamp_key)
+        result: list[str] = []
+        size = 0
+        for line in reversed(merged[-lines:]):
+            size += len(line)
+            if size > LOG_BYTE_BUDGET:
+                break
+            result.append(line)
+        result.reverse()
+        return result or errors
     except ApiException as e:
         logger.warning("로그 수집 실패 (%s): %s", service, e)
         return [f"[오류] 로그 수집 실패: {e.reason}"]
@@ -63,11 +221,10 @@ def fetch_pod_logs(service: str, namespace: str, lines: int = LOG_LINES) -> list
 def fetch_k8s_events(service: str, namespace: str) -> list[str]:
     """서비스 관련 K8s 이벤트 반환"""
     try:
-        _load_k8s_config()
-        v1 = client.CoreV1Api()
-        events = v1.list_namespaced_event(
+        events = core_v1().list_namespaced_event(
             namespace=namespace,
             field_selector=f"involvedObject.name={service}",
+            _request_timeout=SOURCE_DEADLINES["events"],
         )
         result = []
         for e in sorted(events.items, key=lambda x: x.last_timestamp or x.event_time or ""):
@@ -84,36 +241,31 @@ def fetch_k8s_events(service: str, namespace: str) -> list[str]:
 def fetch_pod_status(service: str, namespace: str) -> dict[str, Any]:
     """Pod 상태, 재시작 횟수, 컨테이너 상태 반환"""
     try:
-        _load_k8s_config()
-        v1 = client.CoreV1Api()
-        pods = v1.list_namespaced_pod(
-            namespace=namespace,
-            label_selector=f"app={service}",
-        )
-        if not pods.items:
+        pods = list_objects("Pod", namespace, f"app={service}")
+        if not pods:
             return {"phase": "Unknown", "restart_count": 0, "reason": "Pod 없음"}
 
-        pod = pods.items[0]
+        status = pods[0].get("status") or {}
         restart_count = 0
         reason = ""
         container_states = []
 
-        if pod.status.container_statuses:
-            for cs in pod.status.container_statuses:
-                restart_count += cs.restart_count
-                if cs.state.waiting:
-                    reason = cs.state.waiting.reason or ""
-                elif cs.state.terminated:
-                    reason = cs.state.terminated.reason or ""
-                container_states.append({
-                    "name": cs.name,
-                    "ready": cs.ready,
-                    "restart_count": cs.restart_count,
-                    "reason": reason,
-                })
+        for cs in status.get("containerStatuses") or []:
+            restart_count += cs.get("restartCount") or 0
+            state = cs.get("state") or {}
+            if state.get("waiting"):
+                reason = state["waiting"].get("reason") or ""
+            elif state.get("terminated"):
+                reason = state["terminated"].get("reason") or ""
+            container_states.append({
+                "name": cs.get("name"),
+                "ready": cs.get("ready"),
+                "restart_count": cs.get("restartCount") or 0,
+                "reason": reason,
+            })
 
         return {
-            "phase": pod.status.phase or "Unknown",
+            "phase": status.get("phase") or "Unknown",
             "restart_count": restart_count,
             "reason": reason,
             "container_states": container_states,
@@ -126,47 +278,29 @@ def fetch_pod_status(service: str, namespace: str) -> dict[str, Any]:
 # ── Prometheus 메트릭 ─────────────────────────────────
 
 def fetch_prometheus_metrics(service: str, namespace: str) -> dict[str, Any]:
-    """Prometheus에서 메모리/CPU 사용률, RPS, 에러율 조회"""
+    """Prometheus에서 메모리/CPU 사용률, 에러율 조회 (공유 클라이언트로 동시 실행, 짧은 TTL 캐시)"""
     try:
-        import httpx
+        values = get_prometheus().query_many({
+            # 메모리 사용률 (%)
+            "memory_pct": (
+                f'100 * container_memory_working_set_bytes{{namespace="{namespace}",pod=~"{service}.*",container="{service}"}}'
+                f' / on(pod) kube_pod_container_resource_limits{{namespace="{namespace}",resource="memory",container="{service}"}}'
+            ),
+            # CPU 사용률 (%)
+            "cpu_pct": (
+                f'100 * rate(container_cpu_usage_seconds_total{{namespace="{namespace}",pod=~"{service}.*",container="{service}"}}[2m])'
+                f' / on(pod) kube_pod_container_resource_limits{{namespace="{namespace}",resource="cpu",container="{service}"}}'
+            ),
+            # HTTP 에러율 (5xx / 전체)
+            "error_rate_pct": (
+                f'100 * rate(http_requests_total{{job="{service}",status=~"5.."}}[2m])'
+                f' / rate(http_requests_total{{job="{service}"}}[2m])'
+            ),
+        })
         metrics: dict[str, Any] = {}
-
-        def query(promql: str) -> float | None:
-            resp = httpx.get(
-                f"{PROMETHEUS_URL}/api/v1/query",
-                params={"query": promql},
-                timeout=5.0,
-            )
-            data = resp.json()
-            result = data.get("data", {}).get("result", [])
-            if result:
-                return float(result[0]["value"][1])
-            return None
-
-        # 메모리 사용률 (%)
-        mem = query(
-            f'100 * container_memory_working_set_bytes{{namespace="{namespace}",pod=~"{service}.*",container="{service}"}}'
-            f' / on(pod) kube_pod_container_resource_limits{{namespace="{namespace}",resource="memory",container="{service}"}}'
-        )
-        if mem is not None:
-            metrics["memory_pct"] = round(mem, 1)
-
-        # CPU 사용률 (%)
-        cpu = query(
-            f'100 * rate(container_cpu_usage_seconds_total{{namespace="{namespace}",pod=~"{service}.*",container="{service}"}}[2m])'
-            f' / on(pod) kube_pod_container_resource_limits{{namespace="{namespace}",resource="cpu",container="{service}"}}'
-        )
-        if cpu is not None:
-            metrics["cpu_pct"] = round(cpu, 1)
-
-        # HTTP 에러율 (5xx / 전체)
-        error_rate = query(
-            f'rate(http_requests_total{{job="{service}",status=~"5.."}}[2m])'
-            f' / rate(http_requests_total{{job="{service}"}}[2m])'
-        )
-        if error_rate is not None:
-            metrics["error_rate_pct"] = round(error_rate * 100, 2)
-
+        for name, value in values.items():
+            if value is not None:
+                metrics[name] = round(value, 2 if name == "error_rate_pct" else 1)
         return metrics
     except Exception as e:
         logger.warning("Prometheus 수집 실패 (%s): %s", service, e)
@@ -175,50 +309,119 @@ def fetch_prometheus_metrics(service: str, namespace: str) -> dict[str, Any]:
 
 # ── 병렬 컨텍스트 수집 ─────────────────────────────────
 
-def collect_context_parallel(service: str, namespace: str) -> dict:
-    """4가지 데이터 소스를 ThreadPoolExecutor로 병렬 수집"""
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """수집용 공유 워커 풀 (호출마다 풀 생성/종료 없음)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=COLLECT_WORKERS, thread_name_prefix="context-gather")
+        return _executor
+
+
+def gather_with_deadlines(
+    tasks: dict[Any, tuple[Callable, tuple, float]],
+    budget: float = COLLECT_TIMEOUT,
+) -> tuple[dict[Any, Any], list[Any]]:
+    """작업을 병렬 실행하고 마감까지 도착한 결과만 반환.
+
+    소스 마감은 작업이 워커에서 실행을 시작한 시점부터 센다 (풀 대기열에서 기다린 시간은
+    소스 시간에 포함하지 않고 따로 기록). 전체 예산은 호출 시점부터 센다.
+
+    Args:
+        tasks: 키 → (함수, 인자, 소스 마감 초)
+        budget: 전체 예산 (초)
+
+    Returns:
+        (키 → 결과, 마감을 넘긴 키 목록). 실패한 작업은 둘 다에 없다.
+        마감을 넘긴 작업은 대기 중이면 취소하고, 실행 중이면 결과를 버린다.
+    """
+    start = time.monotonic()
+    end = start + budget
+    executor = _get_executor()
+    futures: dict[Future, Any] = {}
+    source_deadlines: dict[Future, float] = {}
+    started: dict[Any, float] = {}
+
+    def run(key: Any, fn: Callable, args: tuple) -> Any:
+        started[key] = time.monotonic()
+        return fn(*args)
+
+    for key, (fn, args, deadline) in tasks.items():
+        future = executor.submit(run, key, fn, args)
+        futures[future] = key
+        source_deadlines[future] = deadline
+
+    def deadline_of(future: Future, now: float) -> float:
+        # 아직 대기열에 있으면 지금 시작해도 now + 소스 마감 이후에야 끝나므로 그 시각이 하한
+        return min(started.get(futures[future], now) + source_deadlines[future], end)
+
+    results: dict[Any, Any] = {}
+    timed_out: list[Any] = []
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for future in [f for f in pending if deadline_of(f, now) <= now and not f.done()]:
+            future.cancel()
+            pending.discard(future)
+            timed_out.append(futures[future])
+        if not pending:
+            break
+        done, pending = wait(pending, timeout=max(0.0, min(deadline_of(f, now) for f in pending) - now),
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.warning("컨텍스트 수집 실패 (%s): %s", key, e)
+
+    queue_wait = max((t - start for t in started.values()), default=0.0)
+    if queue_wait >= 1.0:
+        logger.warning("컨텍스트 수집 풀 대기 %.1fs (COLLECT_WORKERS=%d)", queue_wait, COLLECT_WORKERS)
+    if timed_out:
+        never_started = [k for k in timed_out if k not in started]
+        logger.warning("컨텍스트 수집 마감 초과 (%.1fs): %s (실행 전 대기열에서 마감: %s)",
+                       time.monotonic() - start, timed_out, never_started)
+    return results, timed_out
+
+
+def collect_context_parallel(service: str, namespace: str, alert_start: str = "") -> dict:
+    """4가지 데이터 소스 + 메트릭 이상 점수를 병렬 수집 (소스별 마감 + 전체 예산, 늦은 소스는 timed_out에 표시)
+
+    alert_start(ISO 시각)가 있으면 로그는 그 직전 구간부터만 읽는다.
+    """
     # 영향 서비스 + upstream 1단계
     upstream_services = DEPENDENCY_GRAPH.get(service, [])
     all_services = list({service, *upstream_services})
 
-    pod_logs: dict[str, list[str]] = {}
-    pod_events: dict[str, list[str]] = {}
-    pod_status: dict[str, dict] = {}
-    metrics: dict[str, dict] = {}
-
-    tasks = {}
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        for svc in all_services:
-            tasks[executor.submit(fetch_pod_logs, svc, namespace)] = ("logs", svc)
-            tasks[executor.submit(fetch_pod_status, svc, namespace)] = ("status", svc)
-            if svc == service:
-                # 직접 영향 서비스만 이벤트 + 메트릭 전체 수집
-                tasks[executor.submit(fetch_k8s_events, svc, namespace)] = ("events", svc)
-                tasks[executor.submit(fetch_prometheus_metrics, svc, namespace)] = ("metrics", svc)
-
-        for future in as_completed(tasks, timeout=COLLECT_TIMEOUT):
-            kind, svc = tasks[future]
-            try:
-                result = future.result()
-                if kind == "logs":
-                    pod_logs[svc] = result
-                elif kind == "status":
-                    pod_status[svc] = result
-                elif kind == "events":
-                    pod_events[svc] = result
-                elif kind == "metrics":
-                    metrics[svc] = result
-            except TimeoutError:
-                logger.warning("컨텍스트 수집 타임아웃: %s/%s", kind, svc)
-            except Exception as e:
-                logger.warning("컨텍스트 수집 실패 (%s/%s): %s", kind, svc, e)
-
-    return {
-        "pod_logs": pod_logs,
-        "pod_events": pod_events,
-        "pod_status": pod_status,
-        "metrics": metrics,
-    }
+    # 로그 수집은 자기 소스 마감(시작 시점 기준)과 전체 예산 중 이른 쪽보다 먼저 부분 결과를 돌려주도록 예산 끝을 넘김
+    logs_deadline = time.monotonic() + COLLECT_TIMEOUT
+    tasks: dict[tuple[str, str], tuple[Callable, tuple, float]] = {}
+    for svc in all_services:
+        tasks[("logs", svc)] = (fetch_pod_logs, (svc, namespace, LOG_LINES, alert_start, logs_deadline),
+                                 SOURCE_DEADLINES["logs"])
+        tasks[("status", svc)] = (fetch_pod_status, (svc, namespace), SOURCE_DEADLINES["status"])
+        if svc == service:
+            # 직접 영향 서비스만 이벤트 + 메트릭 전체 수집
+            tasks[("events", svc)] = (fetch_k8s_events, (svc, namespace), SOURCE_DEADLINES["events"])
+            tasks[("metrics", svc)] = (fetch_prometheus_metrics, (svc, namespace), SOURCE_DEADLINES["metrics"])
+    tasks[("anomalies", service)] = (score_service, (service, namespace), SOURCE_DEADLINES["anomalies"])
+
+    results, timed_out = gather_with_deadlines(tasks)
+
+    context: dict = {"pod_logs": {}, "pod_events": {}, "pod_status": {}, "metrics": {}, "anomalies": []}
+    field = {"logs": "pod_logs", "events": "pod_events", "status": "pod_status", "metrics": "metrics"}
+    for (kind, svc), result in results.items():
+        if kind == "anomalies":
+            context["anomalies"] = result
+        else:
+            context[field[kind]][svc] = result
+    context["timed_out"] = [f"{kind}/{svc}" for kind, svc in timed_out]
+    return context
 
 
 # ── 매니페스트 파일 읽기 ───────────────────────────────
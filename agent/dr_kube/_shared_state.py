@@ -1,4 +1,6 @@
 """프로세스 내 공유 상태 (항상 dr_kube._shared_state로 임포트되므로 단일 인스턴스 보장)."""
+import threading
+from collections import deque
 
 # 코파일럿 모드: action_id → {result, issue_data, channel, ts}
 pending_approvals: dict[str, dict] = {}
@@ -6,5 +8,12 @@ pending_approvals: dict[str, dict] = {}
 # PR 번호 → 이슈 ID 매핑
 pr_to_thread: dict[int, str] = {}
 
-# 머지 대기: pr_number → {channel, ts, issue_data, fix_description, pr_url, merged}
+# 머지 대기: pr_number → {channel, ts, issue_data, severity, fix_description, pr_url, merged, batched_issues,
+#                        target_file, original_yaml, fix_content, branch_name (머지 큐 재적용용)}
+# batched_issues: 같은 일괄 PR에 묶인 나머지 인시던트 [{issue_data, channel, ts, pr_ts}]
 pending_merges: dict[int, dict] = {}
+pending_merges_lock = threading.Lock()
+
+# 수정 방식 통계: fix_method(rule_based/llm/none) → 처리 건수, 최근 처리 이력
+remediation_counts: dict[str, int] = {}
+remediation_recent: deque = deque(maxlen=100)
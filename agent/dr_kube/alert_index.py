@@ -0,0 +1,168 @@
+"""Alertmanager active alert 공유 인덱스
+
+검증기/중복 판정이 매번 /api/v2/alerts 전체를 받아 선형 탐색하지 않도록,
+백그라운드 폴러 하나가 주기적으로 받아 fingerprint → 상태 인덱스를 유지한다.
+
+- httpx.Client 커넥션 풀 재사용 (keep-alive)
+- 조건부 요청: ETag/Last-Modified가 오면 If-None-Match/If-Modified-Since로 재요청 (304면 갱신 생략),
+  헤더가 없어도 본문 해시가 같으면 인덱스 재구성 생략
+- 필터 matcher를 서버로 전달 (Alertmanager `filter` 파라미터) — 관심 범위만 받음
+- 인덱스가 바뀌면 리스너 호출 (verify_scheduler가 대기 중인 검증을 즉시 재평가)
+
+환경변수:
+  ALERTMANAGER_URL        : Alertmanager 주소 (기본: http://prometheus-alertmanager.monitoring.svc.cluster.local:9093)
+  ALERT_POLL_SECONDS      : 조회 주기 (기본: 15)
+  ALERTMANAGER_FILTER     : 서버 측 필터 matcher (콤마 구분, 예: namespace=~"delivery-app|online-boutique")
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Callable, NamedTuple
+
+import httpx
+
+logger = logging.getLogger("dr-kube-alert-index")
+
+DEFAULT_ALERTMANAGER_URL = "http://prometheus-alertmanager.monitoring.svc.cluster.local:9093"
+REQUEST_TIMEOUT = 10  # 초
+
+
+class AlertState(NamedTuple):
+    alertname: str
+    state: str  # active, suppressed, unprocessed
+    starts_at: str
+    labels: dict
+
+
+class AlertIndex:
+    """fingerprint → AlertState 인덱스 + 백그라운드 폴러
+
+    Args:
+        url: Alertmanager 주소
+        interval: 조회 주기 (초)
+        matchers: 서버 측 필터 matcher 목록 (예: ['severity="critical"'])
+    """
+
+    def __init__(self, url: str, interval: float = 15.0, matchers: list[str] | None = None):
+        self.url = url.rstrip("/")
+        self.interval = interval
+        self.matchers = matchers or []
+        self._index: dict[str, AlertState] | None = None  # None: 아직 조회 성공 전 / 최근 조회 실패
+        self._validators: dict[str, str] = {}
+        self._digest = ""
+        self._listeners: list[Callable[[], None]] = []
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._client = httpx.Client(
+            base_url=self.url,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
+        )
+        threading.Thread(target=self._run, daemon=True, name="alert-index").start()
+
+    # ── 조회 (O(1), 메모리) ───────────────────────────
+
+    def wait_ready(self, timeout: float = REQUEST_TIMEOUT) -> bool:
+        """최초 조회(성공/실패 무관) 완료 대기"""
+        return self._ready.wait(timeout)
+
+    @property
+    def available(self) -> bool:
+        return self._index is not None
+
+    def get(self, fingerprint: str) -> AlertState | None:
+        index = self._index
+        return index.get(fingerprint) if index else None
+
+    def is_firing(self, fingerprint: str) -> bool:
+        alert = self.get(fingerprint)
+        return alert is not None and alert.state == "active"
+
+    def __len__(self) -> int:
+        return len(self._index or {})
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """인덱스 변경 시 호출 (폴러 스레드에서 호출되므로 가볍게)"""
+        self._listeners.append(listener)
+
+    def refresh(self) -> None:
+        """다음 주기를 기다리지 않고 바로 조회"""
+        self._wake.set()
+
+    # ── 폴러 ──────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            try:
+                changed = self._poll()
+            except Exception as e:
+                logger.warning("Alertmanager 조회 실패: %s", e)
+                changed = self._index is not None
+                self._index = None
+                self._validators.clear()
+                self._digest = ""
+            self._ready.set()
+            if changed:
+                for listener in self._listeners:
+                    try:
+                        listener()
+                    except Exception:
+                        logger.exception("alert 인덱스 리스너 실패")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _poll(self) -> bool:
+        """1회 조회. 인덱스가 바뀌었으면 True."""
+        headers = {}
+        if "etag" in self._validators:
+            headers["If-None-Match"] = self._validators["etag"]
+        if "last-modified" in self._validators:
+            headers["If-Modified-Since"] = self._validators["last-modified"]
+        params = [("active", "true")] + [("filter", m) for m in self.matchers]
+
+        resp = self._client.get("/api/v2/alerts", params=params, headers=headers)
+        if resp.status_code == 304 and self._index is not None:
+            return False
+        resp.raise_for_status()
+        self._validators = {k: resp.headers[k] for k in ("etag", "last-modified") if k in resp.headers}
+
+        digest = hashlib.sha1(resp.content).hexdigest()
+        if digest == self._digest and self._index is not None:
+            return False
+        self._digest = digest
+
+        index = {}
+        for alert in resp.json():
+            fingerprint = alert.get("fingerprint")
+            if not fingerprint:
+                continue
+            labels = alert.get("labels") or {}
+            index[fingerprint] = AlertState(
+                alertname=labels.get("alertname", "?"),
+                state=(alert.get("status") or {}).get("state", ""),
+                starts_at=alert.get("startsAt", ""),
+                labels=labels,
+            )
+        self._index = index  # 통째로 교체 (읽기 쪽 락 불필요)
+        logger.debug("alert 인덱스 갱신: %d개", len(index))
+        return True
+
+
+_index: AlertIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_alert_index() -> AlertIndex:
+    """프로세스 단일 인덱스 (최초 호출 시 폴러 시작)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            matchers = [m.strip() for m in os.getenv("ALERTMANAGER_FILTER", "").split(",") if m.strip()]
+            _index = AlertIndex(
+                os.getenv("ALERTMANAGER_URL", DEFAULT_ALERTMANAGER_URL),
+                interval=float(os.getenv("ALERT_POLL_SECONDS", "15")),
+                matchers=matchers,
+            )
+            logger.info("alert 인덱스 폴러 시작: %s (filter=%s)", _index.url, matchers)
+        return _index
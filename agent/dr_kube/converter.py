@@ -8,6 +8,7 @@ ALERT_TYPE_MAP = {
     # 컨테이너 리소스
     "ContainerOOMKilled": "oom",
     "HighMemoryUsage": "oom",
+    "PredictedOOM": "oom",  # dr_kube.oom_forecast 합성 alert
     "CPUThrottling": "cpu_throttle",
     # 파드 상태
     "PodCrashLooping": "pod_crash",
@@ -0,0 +1,139 @@
+"""워처 이벤트 디바운서 + 제한된 알림 워커 풀
+
+롤아웃 폭주나 `kubectl delete -n ns --all` 때 이벤트마다 스레드(=LangGraph 파이프라인)를
+띄우지 않도록, 이벤트를 키별로 윈도우 동안 모은 뒤 고정 크기 워커 풀로 넘긴다.
+
+- 수상한 변경(MODIFIED): 객체 키별 병합 — 첫 이벤트의 스냅샷(폭주 전 상태) 유지, 사유는 합침
+- 삭제(DELETED): 네임스페이스별 병합 — 윈도우 안에 임계치 이상이면 "대량 삭제" 인시던트 1건
+- 워커 풀이 가득 차면 스케줄러가 대기하고, 그동안 들어온 이벤트는 계속 병합된다
+
+환경변수:
+  WATCH_DEBOUNCE_SECONDS      : 병합 윈도우 (기본: 5)
+  WATCH_ALERT_WORKERS         : 알림 처리 워커 수 (기본: 4)
+  WATCH_MASS_DELETE_THRESHOLD : 대량 삭제로 묶는 네임스페이스당 삭제 수 (기본: 5)
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple
+
+logger = logging.getLogger("dr-kube-debouncer")
+
+
+class WatchEvent(NamedTuple):
+    kind: str
+    name: str
+    namespace: str
+    event_type: str  # DELETED, MODIFIED
+    detail: str
+    snapshot: Any  # 변경 전 스냅샷 (snapshot_store.Fingerprint)
+
+
+class EventDebouncer:
+    """키별 이벤트 병합 → 워커 풀 디스패치
+
+    Args:
+        handle: 단건 이벤트 처리 함수 (워커 스레드에서 호출)
+        handle_mass: 대량 삭제 처리 함수 (namespace, 삭제 이벤트 목록)
+        discard: 병합으로 버려진 이벤트 정리 함수 (스냅샷 참조 해제 등)
+        window: 병합 윈도우 (초)
+        workers: 워커 수
+        mass_threshold: 대량 삭제 임계치
+    """
+
+    def __init__(self, handle: Callable[[WatchEvent], None],
+                 handle_mass: Callable[[str, list[WatchEvent]], None],
+                 discard: Callable[[WatchEvent], None],
+                 window: float = 5.0, workers: int = 4, mass_threshold: int = 5):
+        self.handle = handle
+        self.handle_mass = handle_mass
+        self.discard = discard
+        self.window = window
+        self.mass_threshold = mass_threshold
+        self._pending: dict[str, dict[str, WatchEvent]] = {}  # 버킷 키 → 객체 키 → 이벤트
+        self._heap: list[tuple[float, str]] = []
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watch-alert")
+        # 실행 중 + 대기 중 작업 상한 (초과 시 스케줄러가 대기)
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        threading.Thread(target=self._run, daemon=True, name="watch-debouncer").start()
+
+    def submit(self, event: WatchEvent) -> None:
+        object_key = f"{event.namespace}/{event.kind}/{event.name}"
+        if event.event_type == "DELETED":
+            bucket_key = f"{event.namespace}/*DELETED"
+        else:
+            bucket_key = object_key
+
+        dropped = None
+        with self._cond:
+            bucket = self._pending.get(bucket_key)
+            if bucket is None:
+                self._pending[bucket_key] = {object_key: event}
+                heapq.heappush(self._heap, (time.monotonic() + self.window, bucket_key))
+                self._cond.notify()
+            else:
+                first = bucket.get(object_key)
+                if first is None:
+                    bucket[object_key] = event
+                else:
+                    # 폭주 전 스냅샷 유지, 사유만 누적
+                    detail = first.detail if event.detail in first.detail else f"{first.detail}; {event.detail}"
+                    bucket[object_key] = first._replace(detail=detail)
+                    dropped = event
+        if dropped is not None:
+            self.discard(dropped)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, bucket_key = heapq.heappop(self._heap)
+                bucket = self._pending.pop(bucket_key, {})
+            events = list(bucket.values())
+            if not events:
+                continue
+            if bucket_key.endswith("/*DELETED") and len(events) >= self.mass_threshold:
+                logger.warning("[워처] 대량 삭제 감지: ns=%s %d개 → 인시던트 1건", events[0].namespace, len(events))
+                self._dispatch(self.handle_mass, events[0].namespace, events)
+            else:
+                for event in events:
+                    self._dispatch(self.handle, event)
+
+    def _dispatch(self, fn: Callable, *args) -> None:
+        self._slots.acquire()
+
+        def _task():
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("워처 알림 처리 실패")
+            finally:
+                self._slots.release()
+
+        self._executor.submit(_task)
+
+
+_debouncer: EventDebouncer | None = None
+_debouncer_lock = threading.Lock()
+
+
+def get_debouncer(handle: Callable[[WatchEvent], None],
+                  handle_mass: Callable[[str, list[WatchEvent]], None],
+                  discard: Callable[[WatchEvent], None]) -> EventDebouncer:
+    """프로세스 단일 디바운서 (최초 호출 시 생성)"""
+    global _debouncer
+    with _debouncer_lock:
+        if _debouncer is None:
+            _debouncer = EventDebouncer(
+                handle, handle_mass, discard,
+                window=float(os.getenv("WATCH_DEBOUNCE_SECONDS", "5")),
+                workers=int(os.getenv("WATCH_ALERT_WORKERS", "4")),
+                mass_threshold=int(os.getenv("WATCH_MASS_DELETE_THRESHOLD", "5")),
+            )
+        return _debouncer
@@ -0,0 +1,127 @@
+"""원격 main 미러 갱신기
+
+PR 생성 경로에서 `git pull`을 제거하기 위해 백그라운드 스레드가 주기적으로
+fetch로 `refs/remotes/origin/main`을 최신으로 유지한다.
+작업 clone을 얕은(shallow) 저장소로 만들면 merge-base/3-way merge가 깨지므로 깊이 제한 없이 fetch한다.
+GitHubClient.commit_files는 마지막으로 fetch된 커밋을 기준으로 브랜치를 만들고,
+파일이 그 사이 main에서 바뀌었으면 3-way merge로 재적용(rebase)한다.
+충돌 시에만 refresh()로 즉시 fetch 후 한 번 더 시도한다.
+갱신 스레드가 꺼져 있거나 죽었으면 head()가 interval보다 오래된 기준을 직접 다시 fetch한다.
+
+환경변수:
+  GIT_MIRROR_ENABLED          : 미러 갱신 활성화 여부 (기본: true)
+  GIT_MIRROR_INTERVAL_SECONDS : fetch 주기 (기본: 60)
+"""
+import logging
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("dr-kube-git-mirror")
+
+DEFAULT_REPO_PATH = Path(__file__).parent.parent.parent
+
+
+class GitMirror:
+    """origin/<branch> remote-tracking ref를 주기적으로 갱신하는 미러"""
+
+    def __init__(self, repo_path: str | Path, branch: str = "main", interval: float = 60.0):
+        self.repo_path = Path(repo_path)
+        self.branch = branch
+        self.interval = interval
+        self.ref = f"refs/remotes/origin/{branch}"
+        self.last_sha = ""
+        self.last_fetch_at = 0.0
+        self.last_error = ""
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _git(self, *args: str, timeout: float = 60) -> tuple[bool, str]:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=timeout,
+            )
+            return True, result.stdout.strip()
+        except subprocess.CalledProcessError as e:
+            return False, (e.stderr or e.stdout or "").strip()
+        except subprocess.TimeoutExpired:
+            return False, f"git {args[0]} timeout ({timeout}s)"
+
+    def refresh(self) -> tuple[bool, str]:
+        """즉시 fetch 후 ref 갱신. 동시에 호출되면 진행 중인 fetch 결과를 공유한다."""
+        started = time.monotonic()
+        with self._fetch_lock:
+            # 대기하는 동안 다른 스레드가 fetch를 끝냈으면 그 결과 사용
+            if self.last_fetch_at > started and not self.last_error:
+                return True, self.last_sha
+
+            ok, msg = self._git(
+                "fetch", "--quiet", "--no-tags", "origin", f"+refs/heads/{self.branch}:{self.ref}",
+            )
+            if ok:
+                ok, msg = self._git("rev-parse", "--verify", f"{self.ref}^{{commit}}")
+            if not ok:
+                self.last_error = msg
+                logger.warning("[미러] fetch 실패: %s", msg)
+                return False, msg
+
+            if msg != self.last_sha:
+                logger.info("[미러] origin/%s → %s", self.branch, msg[:12])
+            self.last_sha = msg
+            self.last_error = ""
+            self.last_fetch_at = time.monotonic()
+            return True, msg
+
+    def head(self) -> tuple[bool, str]:
+        """마지막으로 fetch된 기준 커밋. 없거나 interval보다 오래됐으면 즉시 fetch."""
+        if self.last_sha and time.monotonic() - self.last_fetch_at <= self.interval:
+            return True, self.last_sha
+        return self.refresh()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="git-mirror")
+        self._thread.start()
+        logger.info("[미러] 시작: origin/%s 매 %.0fs", self.branch, self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_mirrors: dict[Path, GitMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_mirror(repo_path: str | Path | None = None) -> GitMirror:
+    """저장소별 미러 싱글톤 (최초 호출 시 환경변수로 설정)"""
+    path = Path(repo_path or DEFAULT_REPO_PATH).resolve()
+    with _mirrors_lock:
+        if path not in _mirrors:
+            _mirrors[path] = GitMirror(
+                path,
+                interval=float(os.getenv("GIT_MIRROR_INTERVAL_SECONDS", "60")),
+            )
+        return _mirrors[path]
+
+
+def start(repo_path: str | Path | None = None) -> None:
+    """미러 갱신 백그라운드 스레드 시작."""
+    if os.getenv("GIT_MIRROR_ENABLED", "true").lower() != "true":
+        logger.info("미러 갱신 비활성화 (GIT_MIRROR_ENABLED=false)")
+        return
+    get_mirror(repo_path).start()
@@ -1,12 +1,45 @@
-"""GitHub 클라이언트 - PR 생성"""
+"""GitHub 클라이언트 - PR 생성
+
+GitHubClient       : gh CLI 기반 (기본)
+GitHubRestClient   : REST API 직접 호출 (httpx 커넥션 풀, ETag 조건부 요청, rate limit 처리)
+get_github_client(): 토큰과 저장소 slug가 있으면 REST, 없으면 gh CLI 클라이언트 반환
+
+환경변수:
+  GH_TOKEN / GITHUB_TOKEN : REST 클라이언트 인증 토큰
+  GITHUB_REPOSITORY       : owner/repo (기본: origin remote URL에서 추출)
+  GITHUB_API_URL          : API 주소 (기본: https://api.github.com)
+"""
+import logging
 import os
+import re
 import subprocess
+import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+import yaml
 
+from dr_kube import yaml_diff
+from dr_kube.git_mirror import get_mirror
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("dr-kube-github")
 
 class GitHubClient:
-    """GitHub PR 생성 클라이언트"""
+    """GitHub PR 생성 클라이언트
+
+    커밋은 git plumbing(hash-object / update-index / write-tree / commit-tree)으로
+    임시 index 파일 위에서 만들고 `<sha>:refs/heads/<branch>` 로 바로 푸시한다.
+    공유 working tree와 HEAD를 건드리지 않으므로 여러 이슈의 PR 생성을 동시에 실행해도 안전하다.
+    기준 커밋은 git_mirror가 백그라운드로 fetch해 둔 origin/main이며 PR 경로에서 pull하지 않는다.
+    """
+
+    BASE_BRANCH = "main"
 
     def __init__(self, repo_path: str = None):
         """
@@ -17,55 +50,135 @@ class GitHubClient:
             self.repo_path = Path(repo_path)
         else:
             # agent/dr_kube/github.py -> 프로젝트 루트
-            self.repo_path = Path(__file__).parent.parent.parent.parent
+            self.repo_path = Path(__file__).parent.parent.parent
 
-    def _run_git(self, *args) -> tuple[bool, str]:
-        """Git 명령어 실행"""
+    def _run_git(self, *args, input: str = None, env: dict = None, strip: bool = True) -> tuple[bool, str]:
+        """Git 명령어 실행 (input: stdin, env: 추가 환경변수, strip=False: 파일 내용 그대로 반환)"""
         try:
             result = subprocess.run(
                 ["git", *args],
                 cwd=self.repo_path,
+                input=input,
+                env={**os.environ, **env} if env else None,
                 capture_output=True,
                 text=True,
                 check=True,
             )
-            return True, result.stdout.strip()
+            return True, result.stdout.strip() if strip else result.stdout
         except subprocess.CalledProcessError as e:
             return False, (e.stderr or e.stdout or "").strip()
 
-    def create_branch(self, branch_name: str) -> tuple[bool, str]:
-        """새 브랜치 생성 및 체크아웃"""
-        # 먼저 main으로 이동
-        self._run_git("checkout", "main")
-        self._run_git("pull", "origin", "main")
+    def read_file(self, commit: str, file_path: str) -> str | None:
+        """커밋 시점의 파일 내용 (없으면 None)"""
+        success, content = self._run_git("cat-file", "blob", f"{commit}:{file_path}", strip=False)
+        return content if success else None
 
-        # 브랜치 생성
-        success, msg = self._run_git("checkout", "-b", branch_name)
-        if not success:
-            # 이미 존재하면 체크아웃만
-            success, msg = self._run_git("checkout", branch_name)
-        return success, msg
+    def merge_text(self, current: str, base: str, other: str) -> tuple[bool, str]:
+        """3-way 텍스트 병합 (git merge-file). base → other 변경을 current 위에 적용
+
+        Returns:
+            (충돌 없음 여부, 병합 결과 — 충돌 시 conflict marker 포함)
+        """
+        with tempfile.TemporaryDirectory(prefix="drkube-merge-") as tmp:
+            paths = []
+            for name, text in (("current", current), ("base", base), ("other", other)):
+                path = os.path.join(tmp, name)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                paths.append(path)
+            return self._run_git(
+                "merge-file", "-p", "-L", "current", "-L", "base", "-L", "other", *paths, strip=False,
+            )
 
-    def commit_and_push(
-        self, file_path: str, commit_message: str, branch_name: str
+    def _rebase_files(
+        self, base_sha: str, files: dict[str, str], originals: dict[str, str]
+    ) -> tuple[bool, dict[str, str] | str]:
+        """수정안(original → modified)을 기준 커밋의 파일 위에 3-way merge로 재적용
+
+        Returns:
+            (성공 여부, {경로: 최종 내용} 또는 충돌 파일 경로)
+        """
+        merged: dict[str, str] = {}
+        for file_path, content in files.items():
+            original = originals.get(file_path)
+            current = self.read_file(base_sha, file_path)
+            if original is None or current is None or current in (original, content):
+                merged[file_path] = content
+                continue
+
+            # 수정안을 만든 뒤 main에서 같은 파일이 바뀜 → merge-file로 재적용
+            success, result = self.merge_text(current, original, content)
+            if not success:
+                return False, file_path
+            logger.info("main 변경분 위에 수정안 재적용: %s", file_path)
+            merged[file_path] = result
+        return True, merged
+
+    def commit_files(
+        self,
+        branch_name: str,
+        files: dict[str, str],
+        commit_message: str,
+        originals: dict[str, str] | None = None,
+        force: bool = False,
     ) -> tuple[bool, str]:
-        """파일 커밋 및 푸시"""
-        # 파일 추가
-        success, msg = self._run_git("add", file_path)
-        if not success:
-            return False, f"git add 실패: {msg}"
+        """마지막으로 fetch된 main 기준으로 파일 내용을 커밋해 원격 브랜치로 푸시 (checkout 없음)
+
+        Args:
+            branch_name: 생성할 원격 브랜치명
+            files: {저장소 기준 상대 경로: 새 파일 내용}
+            commit_message: 커밋 메시지
+            originals: {경로: 수정안을 만들 때 읽은 원본}. main이 그 사이 바뀌었으면 3-way merge에 사용
+            force: 기존 원격 브랜치를 덮어쓰기 (머지 큐의 rebase 후 재푸시)
+
+        Returns:
+            (성공 여부, 커밋 SHA 또는 에러 메시지)
+        """
+        mirror = get_mirror(self.repo_path)
+        for attempt in range(2):
+            # 첫 시도는 미러의 마지막 fetch 결과, 충돌 시에만 즉시 fetch 후 재시도
+            success, base_sha = mirror.head() if attempt == 0 else mirror.refresh()
+            if not success:
+                return False, f"기준 커밋 조회 실패: {base_sha}"
+            success, merged = self._rebase_files(base_sha, files, originals or {})
+            if success:
+                break
+            if attempt == 0:
+                logger.warning("main과 충돌 (%s) — 미러 갱신 후 재시도", merged)
+        else:
+            return False, f"main과 충돌: {merged}"
+
+        with tempfile.TemporaryDirectory(prefix="drkube-index-") as tmp:
+            env = {"GIT_INDEX_FILE": os.path.join(tmp, "index")}
+
+            success, msg = self._run_git("read-tree", base_sha, env=env)
+            if not success:
+                return False, f"git read-tree 실패: {msg}"
 
-        # 커밋
-        success, msg = self._run_git("commit", "-m", commit_message)
+            for file_path, content in merged.items():
+                success, blob = self._run_git("hash-object", "-w", "--stdin", input=content)
+                if not success:
+                    return False, f"git hash-object 실패: {blob}"
+                success, msg = self._run_git(
+                    "update-index", "--add", "--cacheinfo", f"100644,{blob},{file_path}", env=env
+                )
+                if not success:
+                    return False, f"git update-index 실패: {msg}"
+
+            success, tree = self._run_git("write-tree", env=env)
+            if not success:
+                return False, f"git write-tree 실패: {tree}"
+
+        success, commit = self._run_git("commit-tree", tree, "-p", base_sha, "-m", commit_message)
         if not success:
-            return False, f"git commit 실패: {msg}"
+            return False, f"git commit-tree 실패: {commit}"
 
-        # 푸시
-        success, msg = self._run_git("push", "-u", "origin", branch_name)
+        refspec = f"{'+' if force else ''}{commit}:refs/heads/{branch_name}"
+        success, msg = self._run_git("push", "origin", refspec)
         if not success:
             return False, f"git push 실패: {msg}"
 
-        return True, "커밋 및 푸시 완료"
+        return True, commit
 
     def create_pr(
         self, branch_name: str, title: str, body: str
@@ -78,7 +191,7 @@ class GitHubClient:
                     "pr",
                     "create",
                     "--base",
-                    "main",
+                    self.BASE_BRANCH,
                     "--head",
                     branch_name,
                     "--title",
@@ -100,6 +213,21 @@ class GitHubClient:
         except FileNotFoundError:
             return False, "gh CLI가 설치되어 있지 않습니다. brew install gh", 0
 
+    def is_conflicted(self, pr_number: int) -> bool | None:
+        """PR이 base와 충돌 상태인지 (gh CLI 사용). 판단 불가면 None"""
+        try:
+            result = subprocess.run(
+                ["gh", "pr", "view", str(pr_number), "--json", "mergeable", "--jq", ".mergeable"],
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+        state = result.stdout.strip()
+        return None if state == "UNKNOWN" else state == "CONFLICTING"
+
     def close_pr(self, pr_number: int) -> tuple[bool, str]:
         """GitHub PR 닫기 (gh CLI 사용)"""
         try:
@@ -128,11 +256,232 @@ class GitHubClient:
         except subprocess.CalledProcessError as e:
             return False, e.stderr.strip()
 
-    def cleanup(self) -> None:
-        """main 브랜치로 복귀"""
-        self._run_git("checkout", "main")
 
 
+# =============================================================================
+# REST API 클라이언트
+# =============================================================================
+
+_REMOTE_SLUG_RE = re.compile(r"github\.com[:/]([^/]+/[^/]+?)(?:\.git)?/?$")
+_CLOSE_COMMENT = "수정 요청으로 인해 닫힘. 새 PR로 대체됩니다."
+_ETAG_CACHE_MAX = 256
+
+# (api_url, token) → httpx.Client. 프로세스 전체에서 keep-alive 커넥션을 공유한다.
+_http_clients: dict[tuple[str, str], "httpx.Client"] = {}
+_http_clients_lock = threading.Lock()
+
+
+def _http_client(api_url: str, token: str):
+    import httpx
+
+    key = (api_url, token)
+    with _http_clients_lock:
+        if key not in _http_clients:
+            _http_clients[key] = httpx.Client(
+                base_url=api_url,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                    "User-Agent": "dr-kube-agent",
+                },
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            )
+        return _http_clients[key]
+
+
+def _repo_slug_from_remote(repo_path: Path) -> str:
+    try:
+        url = subprocess.run(
+            ["git", "remote", "get-url", "origin"],
+            cwd=repo_path, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""
+    m = _REMOTE_SLUG_RE.search(url)
+    return m.group(1) if m else ""
+
+
+class GitHubRestClient(GitHubClient):
+    """REST API 기반 PR 클라이언트 (gh CLI 불필요)
+
+    커밋/푸시는 GitHubClient의 git plumbing을 그대로 쓰고, PR 생성/닫기/머지만 REST로 처리한다.
+    - GET 응답은 ETag로 캐시해 If-None-Match 조건부 요청 (304는 rate limit 차감 없음)
+    - X-RateLimit-Remaining=0 이면 reset까지 대기 (MAX_RATE_LIMIT_WAIT 초과 시 즉시 실패)
+    - 403/429 + Retry-After 는 지정 시간 대기 후 재시도
+    """
+
+    MAX_RETRIES = 2
+    MAX_RATE_LIMIT_WAIT = 60.0
+
+    def __init__(self, repo_path: str = None, token: str = None, repo: str = None, api_url: str = None):
+        super().__init__(repo_path)
+        self.token = token or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN", "")
+        self.repo = repo or os.getenv("GITHUB_REPOSITORY") or _repo_slug_from_remote(self.repo_path)
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL", "https://api.github.com")).rstrip("/")
+        self._http = _http_client(self.api_url, self.token)
+        self._etags: dict[str, tuple[str, dict]] = {}
+        self.rate_limit_remaining: int | None = None
+        self.rate_limit_reset: float = 0.0
+
+    def _update_rate_limit(self, resp) -> None:
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+        if reset is not None:
+            self.rate_limit_reset = float(reset)
+
+    def _wait_for_rate_limit(self) -> None:
+        if self.rate_limit_remaining != 0:
+            return
+        wait = self.rate_limit_reset - time.time()
+        if wait <= 0:
+            return
+        if wait > self.MAX_RATE_LIMIT_WAIT:
+            raise RuntimeError(f"GitHub API rate limit 소진 (reset까지 {wait:.0f}s)")
+        logger.warning("GitHub API rate limit 소진 — %.0fs 대기", wait)
+        time.sleep(wait)
+
+    def _request(self, method: str, path: str, **kwargs):
+        """API 요청 (rate limit 대기, Retry-After 재시도, GET ETag 캐시). (status, json) 반환"""
+        headers = kwargs.pop("headers", {})
+        cached = self._etags.get(path) if method == "GET" else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            resp = self._http.request(method, path, headers=headers, **kwargs)
+            self._update_rate_limit(resp)
+
+            retry_after = resp.headers.get("Retry-After")
+            if resp.status_code in (403, 429) and retry_after and attempt < self.MAX_RETRIES:
+                wait = min(float(retry_after), self.MAX_RATE_LIMIT_WAIT)
+                logger.warning("GitHub API %s — Retry-After %.0fs 후 재시도", resp.status_code, wait)
+                time.sleep(wait)
+                continue
+            break
+
+        if resp.status_code == 304 and cached:
+            return 200, cached[1]
+
+        data = resp.json() if resp.content else {}
+        if method == "GET" and resp.status_code == 200 and resp.headers.get("ETag"):
+            self._etags[path] = (resp.headers["ETag"], data)
+            while len(self._etags) > _ETAG_CACHE_MAX:
+                self._etags.pop(next(iter(self._etags)), None)
+        return resp.status_code, data
+
+    @staticmethod
+    def _error_message(status: int, data: dict) -> str:
+        message = data.get("message", "") if isinstance(data, dict) else str(data)
+        details = "; ".join(e.get("message", "") for e in data.get("errors", []) if isinstance(e, dict)) \
+            if isinstance(data, dict) else ""
+        return f"GitHub API {status}: {message}" + (f" ({details})" if details else "")
+
+    def get_pr(self, pr_number: int) -> tuple[bool, dict]:
+        """PR 조회 (ETag 조건부 요청)"""
+        status, data = self._request("GET", f"/repos/{self.repo}/pulls/{pr_number}")
+        return status == 200, data
+
+    def is_conflicted(self, pr_number: int) -> bool | None:
+        """PR이 base와 충돌 상태인지 (mergeable 계산 전이면 None)"""
+        try:
+            ok, pr = self.get_pr(pr_number)
+        except Exception:
+            return None
+        if not ok or pr.get("mergeable") is None:
+            return None
+        return pr.get("mergeable_state") == "dirty" or pr.get("mergeable") is False
+
+    def create_pr(
+        self, branch_name: str, title: str, body: str
+    ) -> tuple[bool, str, int]:
+        """GitHub PR 생성 (REST)"""
+        try:
+            status, data = self._request(
+                "POST", f"/repos/{self.repo}/pulls",
+                json={"title": title, "head": branch_name, "base": self.BASE_BRANCH, "body": body},
+            )
+        except Exception as e:
+            return False, f"GitHub API 요청 실패: {e}", 0
+        if status != 201:
+            return False, self._error_message(status, data), 0
+        return True, data["html_url"], int(data["number"])
+
+    def close_pr(self, pr_number: int) -> tuple[bool, str]:
+        """GitHub PR 닫기 (코멘트 후 state=closed)"""
+        try:
+            self._request(
+                "POST", f"/repos/{self.repo}/issues/{pr_number}/comments", json={"body": _CLOSE_COMMENT}
+            )
+            status, data = self._request(
+                "PATCH", f"/repos/{self.repo}/pulls/{pr_number}", json={"state": "closed"}
+            )
+        except Exception as e:
+            return False, f"GitHub API 요청 실패: {e}"
+        if status != 200:
+            return False, self._error_message(status, data)
+        return True, data.get("html_url", "")
+
+    def merge_pr(self, pr_number: int) -> tuple[bool, str]:
+        """GitHub PR squash merge. 아직 머지 불가(체크 대기)면 auto-merge 예약 (gh --auto와 동일)"""
+        try:
+            status, data = self._request(
+                "PUT", f"/repos/{self.repo}/pulls/{pr_number}/merge", json={"merge_method": "squash"}
+            )
+            if status == 200:
+                return True, data.get("message", "merged")
+            if status not in (405, 409):
+                return False, self._error_message(status, data)
+
+            ok, pr = self.get_pr(pr_number)
+            if not ok:
+                return False, self._error_message(status, data)
+            status, result = self._request("POST", "/graphql", json={
+                "query": (
+                    "mutation($id: ID!) { enablePullRequestAutoMerge("
+                    "input: {pullRequestId: $id, mergeMethod: SQUASH}) { clientMutationId } }"
+                ),
+                "variables": {"id": pr["node_id"]},
+            })
+        except Exception as e:
+            return False, f"GitHub API 요청 실패: {e}"
+        if status != 200 or result.get("errors"):
+            errors = "; ".join(e.get("message", "") for e in result.get("errors", []))
+            return False, f"auto-merge 예약 실패: {errors or status}"
+        return True, "auto-merge 예약됨"
+
+
+# (저장소 경로, 토큰, slug, API 주소) → REST 클라이언트. ETag 캐시/rate limit 상태를 요청 간에 유지하고
+# origin remote 조회(git subprocess)도 저장소당 한 번만 한다.
+_rest_clients: dict[tuple[str, str, str, str], GitHubRestClient] = {}
+_rest_clients_lock = threading.Lock()
+
+
+def get_github_client(repo_path: str = None) -> GitHubClient:
+    """토큰 + 저장소 slug가 있으면 REST 클라이언트(저장소별 공유), 아니면 gh CLI 클라이언트"""
+    token = os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
+    if token:
+        key = (
+            str(Path(repo_path).resolve()) if repo_path else "",
+            token,
+            os.getenv("GITHUB_REPOSITORY", ""),
+            os.getenv("GITHUB_API_URL", ""),
+        )
+        try:
+            with _rest_clients_lock:
+                client = _rest_clients.get(key)
+                if client is None:
+                    client = _rest_clients[key] = GitHubRestClient(repo_path)
+            if client.repo:
+                return client
+        except ImportError:
+            logger.warning("httpx 미설치 — gh CLI 클라이언트 사용")
+    return GitHubClient(repo_path)
+
 def generate_branch_name(issue_type: str, resource: str) -> str:
     """브랜치명 생성"""
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -142,18 +491,12 @@ def generate_branch_name(issue_type: str, resource: str) -> str:
 
 
 def _generate_diff(original: str, modified: str) -> str:
-    """원본과 수정본의 diff 생성 (변경된 라인만)"""
-    import difflib
-    original_lines = original.splitlines(keepends=True)
-    modified_lines = modified.splitlines(keepends=True)
-    diff = difflib.unified_diff(original_lines, modified_lines, lineterm="")
-    # 헤더(---/+++) 제외, @@ 이후 내용만
-    lines = []
-    for line in diff:
-        if line.startswith("@@") or line.startswith("-") or line.startswith("+"):
-            if not line.startswith("---") and not line.startswith("+++"):
-                lines.append(line.rstrip())
-    return "\n".join(lines) if lines else "(변경 없음)"
+    """원본과 수정본의 구조적 diff 생성 (변경된 경로만)"""
+    try:
+        changes = yaml_diff.diff_yaml(original, modified)
+    except yaml.YAMLError as e:
+        return f"(YAML 파싱 실패로 diff 생략: {e})"
+    return yaml_diff.render_diff(changes)
 
 
 def generate_pr_body(state: dict) -> str:
@@ -187,3 +530,39 @@ def generate_pr_body(state: dict) -> str:
 ---
 > 이 PR은 DR-Kube 에이전트에 의해 자동 생성되었습니다.
 """
+
+
+def generate_batch_pr_body(target_file: str, states: list[dict], original: str, merged: str) -> str:
+    """여러 인시던트 수정안을 합친 일괄 PR 본문"""
+    rows = "\n".join(
+        f"| {i} | `{st.get('issue_data', {}).get('type', 'unknown')}` "
+        f"| `{st.get('issue_data', {}).get('resource', 'unknown')}` "
+        f"| `{st.get('issue_data', {}).get('namespace', 'default')}` "
+        f"| **{st.get('severity', 'medium')}** | {st.get('fix_description', '')} |"
+        for i, st in enumerate(states, 1)
+    )
+    causes = "\n".join(
+        f"{i}. {st.get('root_cause', 'N/A')}" for i, st in enumerate(states, 1)
+    )
+    diff = _generate_diff(original, merged)
+
+    return f"""## DR-Kube 자동 수정 (일괄 {len(states)}건)
+
+### 인시던트 목록
+| # | 타입 | 리소스 | 네임스페이스 | 심각도 | 수정 |
+|---|------|--------|--------------|--------|------|
+{rows}
+
+### 근본 원인
+{causes}
+
+### 변경 내용
+`{target_file}`
+
+```diff
+{diff}
+```
+
+---
+> 이 PR은 같은 파일에 대한 수정안을 모아 DR-Kube 에이전트가 자동 생성했습니다.
+"""
@@ -2,7 +2,7 @@
 
 워크플로우:
   with_pr=True:
-    load_issue → analyze_and_fix(LLM 1회) → validate → create_pr → END
+    load_issue → analyze_and_fix(규칙 테이블, 없으면 LLM 1회) → validate → create_pr → END
                                                ↓ 실패 (< 3회)
                                              analyze_and_fix (재시도)
                                                ↓ 실패 (>= 3회)
@@ -13,13 +13,18 @@
 import json
 import logging
 import re
+import time
 import yaml
 from pathlib import Path
 from langgraph.graph import StateGraph, END
 from dr_kube.state import IssueState
 from dr_kube.llm import get_llm
 from dr_kube.prompts import ANALYZE_AND_FIX_PROMPT, ANALYZE_ONLY_PROMPT
-from dr_kube.github import GitHubClient, generate_branch_name, generate_pr_body
+from dr_kube.github import generate_branch_name, generate_pr_body, get_github_client
+from dr_kube import yaml_diff
+from dr_kube.policy_engine import PolicyResult, compile_policies
+from dr_kube.pr_batcher import batch_window, get_pr_batcher
+from dr_kube.rules import get_rule_engine
 
 logger = logging.getLogger("dr-kube-graph")
 
@@ -28,33 +33,32 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 MAX_RETRIES = 3
 POLICY_RESTRICTED_TYPES = {"pod_crash", "service_error", "upstream_error", "service_down"}
-POLICY_DENY_TOKENS = {"resources", "limits", "requests", "memory", "cpu"}
-POLICY_ALLOW_TOKENS = {
-    "replica",
-    "replicas",
-    "poddisruptionbudget",
-    "pdb",
-    "timeout",
-    "retry",
-    "retries",
-    "backoff",
-    "circuitbreaker",
-    "connectionpool",
-    "maxretries",
-    "maxconnections",
-}
-RESOURCE_KEY_MAP = {
-    "redis-cart": "redis",
-}
-RELATED_SERVICES = {
-    "checkoutservice": ["paymentservice", "redis"],
-    "paymentservice": ["checkoutservice"],
-    "redis": ["checkoutservice"],
-    "redis-cart": ["checkoutservice"],
-    "frontend": ["checkoutservice", "productcatalogservice"],
-}
-
-
+# 리소스 튜닝 계열 경로 (memory/cpu/limits/requests/resources)
+POLICY_DENY_PATTERNS = ["**.resources", "**.limits", "**.requests", "**.memory", "**.cpu"]
+# 가용성 계열 경로 (replicas/PDB/timeout/retry/backoff/circuit-breaker/connection-pool)
+POLICY_ALLOW_PATTERNS = [
+    "**.replica",
+    "**.replicas",
+    "**.poddisruptionbudget",
+    "**.pdb",
+    "**.*timeout*",
+    "**.*retry*",
+    "**.*retries*",
+    "**.*backoff*",
+    "**.circuitbreaker*",
+    "**.connectionpool*",
+    "**.maxconnections",
+]
+
+# 시작 시 1회 컴파일되는 장애 타입별 수정 정책
+REMEDIATION_POLICIES = compile_policies({
+    **{
+        issue_type: {"allow": POLICY_ALLOW_PATTERNS, "deny": POLICY_DENY_PATTERNS, "allow_mode": "any"}
+        for issue_type in POLICY_RESTRICTED_TYPES
+    },
+    # 복합 장애는 최소 2개 이상의 독립 변경 + 리소스 튜닝 단독 금지
+    "composite_incident": {"exclusive": POLICY_DENY_PATTERNS, "min_changes": 2},
+})
 # =============================================================================
 # 헬퍼 함수
 # =============================================================================
@@ -97,162 +101,18 @@ def _parse_yaml_block(text: str) -> str:
     return match.group(1).strip() if match else ""
 
 
-def _normalize_resource_key(resource: str) -> str:
-    return RESOURCE_KEY_MAP.get(resource, resource)
-
-
-def _apply_replica_bumps_text(original_yaml: str, targets: list[str]) -> tuple[str, list[str]]:
-    """원본 YAML 텍스트에서 target 서비스의 replicas만 최소 변경."""
-    lines = original_yaml.splitlines()
-    changed: list[str] = []
-    current_top_key = ""
-    target_set = set(targets)
-
-    for idx, line in enumerate(lines):
-        # top-level key 추적 (들여쓰기 없는 "key:")
-        if re.match(r"^[a-zA-Z0-9_-]+:\s*$", line):
-            current_top_key = line.rstrip(":").strip()
-            continue
-
-        if current_top_key not in target_set:
-            continue
-
-        m = re.match(r"^(\s{2}replicas:\s*)(\d+)(\s*(#.*)?)$", line)
-        if not m:
-            continue
-
-        cur = int(m.group(2))
-        new_val = min(max(cur + 1, 2), 4)
-        if new_val == cur:
-            continue
-        lines[idx] = f"{m.group(1)}{new_val}{m.group(3)}"
-        if current_top_key not in changed:
-            changed.append(current_top_key)
-
-    return "\n".join(lines), changed
-
-
-def _rule_based_fix(issue: dict, original_yaml: str) -> tuple[str, str, str] | None:
-    """정책 기반 수정안 생성.
-
-    Returns:
-      (fix_content, fix_description, root_cause) or None
-    """
-    issue_type = issue.get("type", "unknown")
-    if issue_type not in POLICY_RESTRICTED_TYPES | {"composite_incident"}:
-        return None
-    if issue_type == "composite_incident":
-        # 복합 장애는 규칙 기반 replicas-only를 피하고 LLM이 다중 완화책을 생성하게 한다.
-        return None
-
-    try:
-        values_data = yaml.safe_load(original_yaml)
-    except yaml.YAMLError:
-        values_data = {}
-    if not isinstance(values_data, dict):
-        values_data = {}
-
-    changed_targets: list[str] = []
-
-    resource = _normalize_resource_key(issue.get("resource", ""))
-    targets = [resource] if resource in (values_data or {}) else []
-    for rel in RELATED_SERVICES.get(resource, []):
-        if rel in (values_data or {}) and rel not in targets:
-            targets.append(rel)
-        if len(targets) >= 2:
-            break
-
-    fix_content, changed_targets = _apply_replica_bumps_text(original_yaml, targets)
-
-    # 실제 변경이 없다면 규칙 기반 실패로 간주
-    if not changed_targets:
-        return None
-    fix_description = f"scale replicas for {', '.join(changed_targets[:2])}"
-    root_cause = (
-        f"서비스 가용성 저하({issue_type})가 감지되어 "
-        f"핵심 경로 서비스({', '.join(changed_targets)}) 레플리카를 증설했습니다."
-    )
-    return fix_content, fix_description[:60], root_cause
-
-
-def _collect_changed_paths(original, modified, prefix: str = "") -> list[str]:
-    """두 YAML 객체 간 변경 경로를 수집."""
-    paths: list[str] = []
-
-    if isinstance(original, dict) and isinstance(modified, dict):
-        keys = set(original.keys()) | set(modified.keys())
-        for key in keys:
-            next_prefix = f"{prefix}.{key}" if prefix else str(key)
-            if key not in original or key not in modified:
-                paths.append(next_prefix)
-                continue
-            paths.extend(_collect_changed_paths(original[key], modified[key], next_prefix))
-        return paths
-
-    if isinstance(original, list) and isinstance(modified, list):
-        if original != modified:
-            paths.append(f"{prefix}[]")
-        return paths
-
-    if original != modified:
-        paths.append(prefix or "<root>")
-    return paths
-
-
-def _path_tokens(path: str) -> set[str]:
-    return {t for t in re.split(r"[^a-z0-9]+", path.lower()) if t}
-
-
-def _validate_remediation_policy(issue_type: str, changed_paths: list[str]) -> str:
+def _validate_remediation_policy(issue_type: str, changed_paths: list[str],
+                                 added: dict | None = None) -> PolicyResult | None:
     """장애 타입별 허용/금지 변경 정책 검사.
 
     반환값:
-      - 정책 위반 메시지(str): 위반
-      - 빈 문자열: 통과
+      - PolicyResult: 정책 대상 타입 (ok=False면 위반, violations에 사유)
+      - None: 정책 대상이 아닌 타입
     """
-    if issue_type == "composite_incident":
-        # 복합 인시던트는 최소 2개 이상의 독립 변경 필요
-        unique_roots = {p.split(".", 1)[0] for p in changed_paths if p}
-        if len(unique_roots) < 2 and len(changed_paths) < 2:
-            return "정책 위반: composite_incident 는 최소 2개 이상의 독립 변경이 필요합니다."
-
-        has_only_resource_tuning = True
-        for path in changed_paths:
-            tokens = _path_tokens(path)
-            if not (tokens & POLICY_DENY_TOKENS):
-                has_only_resource_tuning = False
-                break
-        if has_only_resource_tuning:
-            return "정책 위반: composite_incident 에서 리소스 튜닝 단독 변경은 금지됩니다."
-        return ""
-
-    if issue_type not in POLICY_RESTRICTED_TYPES:
-        return ""
-
-    # 금지: 리소스 상향(memory/cpu/limits/requests/resources)
-    for path in changed_paths:
-        tokens = _path_tokens(path)
-        if tokens & POLICY_DENY_TOKENS:
-            return (
-                f"정책 위반: issue_type={issue_type} 에서 리소스 튜닝 변경({path})은 금지됩니다. "
-                "replicas/PDB/timeout/retry/circuit-breaker 계열만 허용됩니다."
-            )
-
-    # 허용 계열 변경이 최소 1개는 있어야 함
-    has_allowed = False
-    for path in changed_paths:
-        tokens = _path_tokens(path)
-        if tokens & POLICY_ALLOW_TOKENS:
-            has_allowed = True
-            break
-
-    if not has_allowed:
-        return (
-            f"정책 위반: issue_type={issue_type} 는 replicas/PDB/timeout/retry/circuit-breaker "
-            "계열 변경을 포함해야 합니다."
-        )
-
-    return ""
+    policy = REMEDIATION_POLICIES.get(issue_type)
+    if policy is None:
+        return None
+    return policy.evaluate(changed_paths, added)
 
 
 # =============================================================================
@@ -320,23 +180,26 @@ def analyze_and_fix(state: IssueState) -> IssueState:
         logger.info("[analyze_and_fix] no target_file, switching to analyze_only")
         return _analyze_only(state)
 
-    # PR 품질 안정화를 위해 crash/error 계열은 규칙 기반 우선 처리
-    rule_result = _rule_based_fix(issue, original_yaml)
-    if rule_result is not None:
-        fix_content, fix_description, root_cause = rule_result
-        logger.info("[analyze_and_fix] rule_based_fix applied: %s", fix_description)
-        return {
-            "analysis": f"rule_based_fix applied for {issue.get('type', 'unknown')}",
-            "root_cause": root_cause,
-            "severity": "high",
-            "suggestions": [
-                "서비스 레플리카를 증설해 단일 장애점(SPOF)을 줄였습니다.",
-                "후속으로 timeout/retry 정책을 서비스 코드/차트에 반영하세요.",
-            ],
-            "fix_content": fix_content,
-            "fix_description": fix_description,
-            "status": "analyzed",
-        }
+    # 규칙 테이블(remediation_rules.yaml)로 처리 가능한 이슈는 LLM 없이 결정적으로 수정
+    # (재시도/사람의 수정 요청은 규칙 결과가 이미 거부된 것이므로 LLM으로 진행)
+    if not state.get("retry_count") and not issue.get("_review_comment"):
+        started = time.perf_counter()
+        rule_fix = get_rule_engine().apply(issue, original_yaml)
+        if rule_fix is not None:
+            logger.info("[analyze_and_fix] rule_based_fix applied: rule=%s %s (%.1fms)",
+                        rule_fix.rule_id, rule_fix.fix_description,
+                        (time.perf_counter() - started) * 1000)
+            return {
+                "analysis": f"rule_based_fix applied for {issue.get('type', 'unknown')} (rule={rule_fix.rule_id})",
+                "root_cause": rule_fix.root_cause,
+                "severity": rule_fix.severity,
+                "suggestions": rule_fix.suggestions,
+                "fix_content": rule_fix.fix_content,
+                "fix_description": rule_fix.fix_description,
+                "fix_method": "rule_based",
+                "rule_id": rule_fix.rule_id,
+                "status": "analyzed",
+            }
 
     logger.info("[analyze_and_fix] LLM call: type=%s resource=%s target=%s",
                 issue.get("type"), issue.get("resource"), target_file)
@@ -354,6 +217,15 @@ def analyze_and_fix(state: IssueState) -> IssueState:
     else:
         review_section = ""
 
+    # 검증 실패 후 재시도: 구조화된 정책 위반 사유를 프롬프트에 포함
+    violations = state.get("policy_violations") or []
+    if state.get("status") == "validation_failed" and (violations or state.get("error")):
+        review_section += "\n## 이전 수정안 검증 실패 사유 (반드시 해결하세요)\n"
+        if violations:
+            review_section += "\n".join(f"- [{v['code']}] {v['message']}" for v in violations) + "\n"
+        else:
+            review_section += f"- {state.get('error')}\n"
+
     prompt = ANALYZE_AND_FIX_PROMPT.format(
         type=issue.get("type", "unknown"),
         namespace=issue.get("namespace", "default"),
@@ -400,6 +272,7 @@ def analyze_and_fix(state: IssueState) -> IssueState:
             "suggestions": suggestions or ["로그를 더 확인하세요"],
             "fix_content": fix_content,
             "fix_description": fix_description,
+            "fix_method": "llm",
             "status": "analyzed",
         }
     except Exception as e:
@@ -439,6 +312,7 @@ def _analyze_only(state: IssueState) -> IssueState:
             "root_cause": root_cause,
             "severity": severity,
             "suggestions": suggestions,
+            "fix_method": "none",
             "status": "done",
         }
     except Exception as e:
@@ -480,7 +354,7 @@ def validate(state: IssueState) -> IssueState:
         return {"retry_count": retry_count + 1, "error": "YAML이 dict 형식이 아닙니다", "status": "validation_failed"}
 
     # 4. 장애 타입별 수정 정책 검증
-    if issue_type in POLICY_RESTRICTED_TYPES:
+    if issue_type in REMEDIATION_POLICIES:
         if not isinstance(original_parsed, dict):
             return {
                 "retry_count": retry_count + 1,
@@ -488,17 +362,21 @@ def validate(state: IssueState) -> IssueState:
                 "status": "validation_failed",
             }
 
-        changed_paths = _collect_changed_paths(original_parsed, parsed)
-        policy_error = _validate_remediation_policy(issue_type, changed_paths)
-        if policy_error:
+        changes = yaml_diff.diff(original_parsed, parsed)
+        policy_result = _validate_remediation_policy(
+            issue_type, yaml_diff.changed_paths(changes), yaml_diff.added_values(changes),
+        )
+        if policy_result is not None and not policy_result.ok:
+            logger.warning("[validate] FAIL: %s", policy_result.summary())
             return {
                 "retry_count": retry_count + 1,
-                "error": policy_error,
+                "error": policy_result.summary(),
+                "policy_violations": [v.to_dict() for v in policy_result.violations],
                 "status": "validation_failed",
             }
 
     logger.info("[validate] PASS")
-    return {"status": "validated"}
+    return {"status": "validated", "error": "", "policy_violations": []}
 
 
 def error_end(state: IssueState) -> IssueState:
@@ -518,7 +396,6 @@ def create_pr(state: IssueState) -> IssueState:
         logger.warning("[create_pr] SKIP (previous error: %s)", state.get("error"))
         return state
 
-    issue = state.get("issue_data", {})
     target_file = state.get("target_file", "")
     fix_content = state.get("fix_content", "")
 
@@ -526,40 +403,41 @@ def create_pr(state: IssueState) -> IssueState:
         logger.warning("[create_pr] SKIP (no target_file or fix_content)")
         return {"error": "수정할 파일 또는 내용이 없습니다", "status": "error"}
 
+    # 같은 파일 수정안은 윈도우 동안 모아 일괄 PR (PR_BATCH_WINDOW_SECONDS > 0)
+    if batch_window() > 0:
+        result = get_pr_batcher(_open_pr, str(PROJECT_ROOT), _validate_remediation_policy).submit(state)
+        logger.info("[create_pr] DONE (batch) pr_url=%s", result.get("pr_url"))
+        return result
+    return _open_pr(state)
+
+
+def _open_pr(state: IssueState) -> IssueState:
+    """단건 PR 생성 (커밋 + 푸시 + PR)"""
+    issue = state.get("issue_data", {})
+    target_file = state.get("target_file", "")
+    fix_content = state.get("fix_content", "")
+
     # 브랜치명 생성
     branch_name = generate_branch_name(
         issue.get("type", "fix"), issue.get("resource", "unknown")
     )
 
     # GitHub 클라이언트
-    gh = GitHubClient(str(PROJECT_ROOT))
+    gh = get_github_client(str(PROJECT_ROOT))
 
     try:
-        # 1. 브랜치 생성
-        success, msg = gh.create_branch(branch_name)
-        if not success:
-            return {"error": f"브랜치 생성 실패: {msg}", "status": "error"}
-
-        # 2. 파일 수정
-        target_path = PROJECT_ROOT / target_file
-        with open(target_path, "w", encoding="utf-8") as f:
-            f.write(fix_content)
-
-        # 3. 커밋 및 푸시
+        # 1. 커밋 + 푸시 (working tree 변경 없이 원격 브랜치 생성)
         commit_message = f"fix({issue.get('resource', 'unknown')}): {state.get('fix_description', '자동 수정')}"
-        success, msg = gh.commit_and_push(target_file, commit_message, branch_name)
+        success, msg = gh.commit_files(
+            branch_name, {target_file: fix_content}, commit_message,
+            originals={target_file: state.get("original_yaml", "")},
+        )
         if not success:
-            gh.cleanup()
             return {"error": f"커밋/푸시 실패: {msg}", "status": "error"}
 
-        # 4. PR 생성
-        pr_title = f"fix({issue.get('resource', 'unknown')}): {state.get('fix_description', '자동 수정')}"
+        # 2. PR 생성
         pr_body = generate_pr_body(state)
-        success, pr_url, pr_number = gh.create_pr(branch_name, pr_title, pr_body)
-
-        # main으로 복귀
-        gh.cleanup()
-
+        success, pr_url, pr_number = gh.create_pr(branch_name, commit_message, pr_body)
         if not success:
             logger.error("[create_pr] PR creation failed: %s", pr_url)
             return {"error": f"PR 생성 실패: {pr_url}", "status": "error"}
@@ -572,7 +450,6 @@ def create_pr(state: IssueState) -> IssueState:
             "status": "pr_created",
         }
     except Exception as e:
-        gh.cleanup()
         logger.exception("[create_pr] EXCEPTION")
         return {"error": f"PR 생성 중 오류: {str(e)}", "status": "error"}
 
@@ -0,0 +1,384 @@
+"""공유 인포머 캐시 (namespace, kind 단위 list + watch)
+
+워처/검증기/delivery 도구가 같은 리소스를 매번 list 하지 않도록
+(namespace, kind)마다 하나의 Informer가 최초 1회 list 후 watch로 캐시를 갱신한다.
+
+- 마지막 resourceVersion에서 watch 재개 (timeout마다 ADDED 재수신 없음)
+- BOOKMARK 이벤트로 resourceVersion만 갱신
+- 410 Gone 시 1회 relist → 이전 캐시와 비교해 ADDED/MODIFIED/DELETED 보정 이벤트 발생
+- 캐시 객체는 API 원본 형태(camelCase dict, managedFields 제거)
+- cache_objects=False면 resourceVersion만 추적 (자체 저장소를 가진 워처용)
+
+모든 인포머는 스레드 하나에서 도는 asyncio 루프의 태스크로 실행되고,
+kubernetes Configuration(호스트/토큰/인증서)으로 만든 httpx.AsyncClient 하나를 공유한다.
+h2 패키지가 설치돼 있으면 HTTP/2로 모든 watch가 연결 하나에 다중화된다.
+namespace=None 인포머는 클러스터 전체 watch (label/field selector로 범위 제한).
+
+환경변수:
+  INFORMER_WATCH_TIMEOUT_SECONDS : watch 요청 1회 유지 시간 (기본: 300)
+  INFORMER_LIST_PAGE_SIZE        : list 페이지 크기 (기본: 500)
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Callable
+
+import httpx
+
+logger = logging.getLogger("dr-kube-informer")
+
+WATCH_TIMEOUT = int(os.getenv("INFORMER_WATCH_TIMEOUT_SECONDS", "300"))
+LIST_PAGE_SIZE = int(os.getenv("INFORMER_LIST_PAGE_SIZE", "500"))
+RETRY_DELAY = 5  # 초
+SYNC_TIMEOUT = 10  # 최초 list 대기 (초)
+
+# kind → (apiVersion, plural). 워처 감시 종류는 watch_registry가 discovery 후 등록한다.
+_RESOURCES = {
+    "Deployment": ("apps/v1", "deployments"),
+    "StatefulSet": ("apps/v1", "statefulsets"),
+    "Service": ("v1", "services"),
+    "ConfigMap": ("v1", "configmaps"),
+    "Pod": ("v1", "pods"),
+}
+
+
+def register_resource(kind: str, api_version: str, plural: str) -> None:
+    """인포머가 다룰 수 있는 종류 추가 (CRD 등)"""
+    _RESOURCES[kind] = (api_version, plural)
+
+# handler(event_type, key, obj, old) — event_type: ADDED / MODIFIED / DELETED, key: "namespace/name"
+# obj는 API 원본 dict (relist로 뒤늦게 발견한 DELETED는 None), old는 캐시의 이전 객체.
+# 이벤트 루프 스레드에서 호출되므로 오래 걸리는 작업은 핸들러 안에서 넘겨야 한다.
+EventHandler = Callable[[str, str, dict | None, dict | None], None]
+
+
+class _Gone(Exception):
+    """resourceVersion 만료 (410 Gone)"""
+
+
+def object_key(obj: dict) -> str:
+    meta = obj.get("metadata") or {}
+    return f"{meta.get('namespace', '')}/{meta.get('name', '')}"
+
+
+def _resource_version(obj: dict) -> str:
+    return (obj.get("metadata") or {}).get("resourceVersion", "")
+
+
+def match_labels(labels: dict | None, selector: str | None) -> bool:
+    """등호 기반 label selector 매칭 (k=v, k==v, k!=v, k, !k)"""
+    if not selector:
+        return True
+    labels = labels or {}
+    for term in (t.strip() for t in selector.split(",")):
+        if not term:
+            continue
+        if "!=" in term:
+            k, v = (s.strip() for s in term.split("!=", 1))
+            if labels.get(k) == v:
+                return False
+        elif "=" in term:
+            k, v = (s.strip() for s in term.replace("==", "=").split("=", 1))
+            if labels.get(k) != v:
+                return False
+        elif term.startswith("!"):
+            if term[1:] in labels:
+                return False
+        elif term not in labels:
+            return False
+    return True
+
+
+# ── 이벤트 루프 / HTTP 클라이언트 ────────────────────
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_client: httpx.AsyncClient | None = None
+_k8s_config = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """모든 인포머가 공유하는 이벤트 루프 (데몬 스레드에서 실행)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True, name="informer-loop").start()
+            _loop = loop
+        return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    """kubernetes Configuration 기반 AsyncClient (루프 스레드에서만 호출)"""
+    global _client, _k8s_config
+    if _client is None:
+        from kubernetes import client as k8s_client
+        from dr_kube.k8s_client import load_config
+
+        load_config()
+        cfg = k8s_client.Configuration.get_default_copy()
+        verify = (cfg.ssl_ca_cert or True) if cfg.verify_ssl else False
+        cert = (cfg.cert_file, cfg.key_file) if cfg.cert_file else None
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        _client = httpx.AsyncClient(
+            base_url=cfg.host,
+            verify=verify,
+            cert=cert,
+            http2=http2,
+            timeout=httpx.Timeout(10.0, read=WATCH_TIMEOUT + 30),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        _k8s_config = cfg
+        logger.info("[인포머] API 클라이언트 생성: %s (http2=%s)", cfg.host, http2)
+    return _client
+
+
+def _auth_headers() -> dict[str, str]:
+    # get_api_key_with_prefix는 in-cluster 토큰 갱신 훅을 함께 호출한다
+    token = _k8s_config.get_api_key_with_prefix("authorization") if _k8s_config else None
+    return {"Authorization": token} if token else {}
+
+
+class Informer:
+    """단일 (namespace, kind) list + watch 캐시
+
+    Args:
+        kind: 리소스 종류 (_RESOURCES 키)
+        namespace: 네임스페이스 (None이면 클러스터 전체)
+        label_selector: 서버 측 label selector (클러스터 전체 watch 범위 제한용)
+        field_selector: 서버 측 field selector (예: metadata.namespace!=kube-system)
+        cache_objects: False면 객체를 보관하지 않고 resourceVersion만 추적
+    """
+
+    def __init__(self, kind: str, namespace: str | None = None,
+                 label_selector: str = "", field_selector: str = "", cache_objects: bool = True):
+        if kind not in _RESOURCES:
+            raise ValueError(f"지원하지 않는 리소스 종류: {kind}")
+        self.kind = kind
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.field_selector = field_selector
+        self.cache_objects = cache_objects
+        self._store: dict[str, dict] = {}
+        self._versions: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._handlers: list[EventHandler] = []
+        self._synced = threading.Event()
+        self._resource_version: str | None = None
+        self._task = None
+
+    # ── 조회 ──────────────────────────────────────────
+
+    def get(self, namespace: str, name: str) -> dict | None:
+        with self._lock:
+            return self._store.get(f"{namespace}/{name}")
+
+    def items(self, label_selector: str | None = None, namespace: str | None = None) -> list[dict]:
+        with self._lock:
+            objs = list(self._store.values())
+        return [
+            o for o in objs
+            if (namespace is None or (o.get("metadata") or {}).get("namespace") == namespace)
+            and match_labels((o.get("metadata") or {}).get("labels"), label_selector)
+        ]
+
+    def keys(self) -> list[str]:
+        """현재 존재하는 객체 키 ("namespace/name") 목록"""
+        with self._lock:
+            return list(self._versions)
+
+    def wait_synced(self, timeout: float = SYNC_TIMEOUT) -> bool:
+        return self._synced.wait(timeout)
+
+    @property
+    def resource_version(self) -> str | None:
+        return self._resource_version
+
+    # ── 수명 주기 ─────────────────────────────────────
+
+    def add_handler(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), _get_loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    # ── list / watch ──────────────────────────────────
+
+    def _path(self) -> str:
+        api_version, plural = _RESOURCES[self.kind]
+        prefix = "/api/v1" if api_version == "v1" else f"/apis/{api_version}"
+        if self.namespace:
+            return f"{prefix}/namespaces/{self.namespace}/{plural}"
+        return f"{prefix}/{plural}"
+
+    def _params(self, **extra) -> dict:
+        params = {k: v for k, v in extra.items() if v is not None}
+        if self.label_selector:
+            params["labelSelector"] = self.label_selector
+        if self.field_selector:
+            params["fieldSelector"] = self.field_selector
+        return params
+
+    async def _list(self) -> tuple[list[dict], str]:
+        client = _get_client()
+        api_version = _RESOURCES[self.kind][0]
+        items: list[dict] = []
+        cont = None
+        while True:
+            resp = await client.get(
+                self._path(), params=self._params(limit=LIST_PAGE_SIZE, **{"continue": cont}),
+                headers=_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            for item in data.get("items", []):
+                item.setdefault("apiVersion", api_version)
+                item.setdefault("kind", self.kind)
+                items.append(self._strip(item))
+            meta = data.get("metadata") or {}
+            cont = meta.get("continue")
+            if not cont:
+                return items, meta.get("resourceVersion", "")
+
+    def list_direct(self, timeout: float = SYNC_TIMEOUT) -> tuple[list[dict], str]:
+        """캐시를 거치지 않는 list (원본 dict 목록, resourceVersion). 루프 밖 스레드에서 호출."""
+        return asyncio.run_coroutine_threadsafe(self._list(), _get_loop()).result(timeout)
+
+    @staticmethod
+    def _strip(obj: dict) -> dict:
+        (obj.get("metadata") or {}).pop("managedFields", None)
+        return obj
+
+    def _dispatch(self, event_type: str, key: str, obj: dict | None, old: dict | None) -> None:
+        for handler in self._handlers:
+            try:
+                handler(event_type, key, obj, old)
+            except Exception:
+                logger.exception("인포머 핸들러 오류 (%s ns=%s)", self.kind, self.namespace)
+
+    async def _relist(self) -> None:
+        items, rv = await self._list()
+        fresh = {object_key(o): o for o in items}
+        versions = {k: _resource_version(o) for k, o in fresh.items()}
+        with self._lock:
+            previous, self._store = self._store, (fresh if self.cache_objects else {})
+            previous_versions, self._versions = self._versions, versions
+        self._resource_version = rv
+        first = not self._synced.is_set()
+        self._synced.set()
+        logger.info("[인포머] list: %s ns=%s %d개 rv=%s", self.kind, self.namespace or "*", len(fresh), rv)
+
+        # 재동기화: 끊긴 동안의 변경을 보정 이벤트로 전달
+        for key, obj in fresh.items():
+            old_version = previous_versions.get(key)
+            if old_version is None:
+                self._dispatch("ADDED", key, obj, None)
+            elif not first and old_version != versions[key]:
+                self._dispatch("MODIFIED", key, obj, previous.get(key))
+        for key in previous_versions:
+            if key not in fresh:
+                old = previous.get(key)
+                self._dispatch("DELETED", key, old, old)
+
+    def _apply(self, event_type: str, obj: dict) -> None:
+        obj = self._strip(obj)
+        key = object_key(obj)
+        with self._lock:
+            old = self._store.get(key)
+            if event_type == "DELETED":
+                self._store.pop(key, None)
+                self._versions.pop(key, None)
+            else:
+                if self.cache_objects:
+                    self._store[key] = obj
+                self._versions[key] = _resource_version(obj)
+        self._resource_version = _resource_version(obj) or self._resource_version
+        self._dispatch(event_type, key, obj, old)
+
+    async def _watch(self) -> None:
+        import json
+
+        client = _get_client()
+        params = self._params(
+            watch="true",
+            resourceVersion=self._resource_version,
+            allowWatchBookmarks="true",
+            timeoutSeconds=WATCH_TIMEOUT,
+        )
+        async with client.stream("GET", self._path(), params=params, headers=_auth_headers()) as resp:
+            if resp.status_code == 410:
+                raise _Gone()
+            if resp.status_code >= 400:
+                await resp.aread()
+                resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                event_type = event.get("type")
+                obj = event.get("object") or {}
+                if event_type == "ERROR":
+                    if obj.get("code") == 410:
+                        raise _Gone()
+                    raise RuntimeError(f"{obj.get('reason')}: {obj.get('message')}")
+                if event_type == "BOOKMARK":
+                    self._resource_version = _resource_version(obj) or self._resource_version
+                elif event_type in ("ADDED", "MODIFIED", "DELETED"):
+                    self._apply(event_type, obj)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._resource_version is None:
+                    await self._relist()
+                await self._watch()
+            except _Gone:
+                logger.info("[인포머] resourceVersion 만료 (%s ns=%s) → relist", self.kind, self.namespace)
+                self._resource_version = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("[인포머] watch 오류 (%s ns=%s): %s — %d초 후 재시도",
+                             self.kind, self.namespace, e, RETRY_DELAY)
+                await asyncio.sleep(RETRY_DELAY)
+
+
+_informers: dict[tuple, Informer] = {}
+_informers_lock = threading.Lock()
+
+
+def get_informer(kind: str, namespace: str | None = None, start: bool = True,
+                 label_selector: str = "", field_selector: str = "", cache_objects: bool = True) -> Informer:
+    """(kind, namespace, selector)별 단일 인포머 (최초 호출 시 생성/시작)"""
+    key = (kind, namespace, label_selector, field_selector)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None:
+            informer = _informers[key] = Informer(
+                kind, namespace, label_selector, field_selector, cache_objects,
+            )
+    if start:
+        informer.start()
+    return informer
+
+
+def list_objects(kind: str, namespace: str, label_selector: str | None = None,
+                 timeout: float = SYNC_TIMEOUT) -> list[dict]:
+    """캐시에서 namespace의 kind 목록 조회. 동기화 전이면 직접 list로 대체."""
+    informer = get_informer(kind, namespace)
+    if informer.wait_synced(timeout):
+        return informer.items(label_selector)
+    logger.warning("[인포머] 캐시 미동기화 (%s ns=%s) → 직접 list", kind, namespace)
+    items, _ = informer.list_direct(timeout)
+    return [o for o in items if match_labels((o.get("metadata") or {}).get("labels"), label_selector)]
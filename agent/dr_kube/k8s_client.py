@@ -0,0 +1,69 @@
+"""공유 Kubernetes API 클라이언트
+
+도구/검증기/워처가 호출마다 kubeconfig(또는 서비스어카운트 파일)를 다시 읽고
+CoreV1Api를 새로 만들지 않도록, 설정 로드와 ApiClient를 프로세스에서 한 번만 만든다.
+
+- 최초 사용 시 in-cluster → kubeconfig 순으로 설정 로드 (스레드 안전)
+- urllib3 커넥션 풀 크기를 병렬 수집 워커 수에 맞춤 (기본 풀 4개 → 초과 요청은 연결 재생성)
+- 로드한 Configuration을 기본값으로 등록 → 인포머 httpx 클라이언트/dynamic client도 같은 설정 사용
+
+환경변수:
+  K8S_POOL_MAXSIZE : 호스트당 urllib3 커넥션 풀 크기 (기본: 16)
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger("dr-kube-k8s-client")
+
+_lock = threading.Lock()
+_api_client = None
+_apis: dict[str, object] = {}
+
+
+def load_config() -> None:
+    """kubernetes 설정 로드 (최초 1회). 실패 시 예외."""
+    get_api_client()
+
+
+def get_api_client():
+    """공유 ApiClient (최초 호출 시 설정 로드)"""
+    global _api_client
+    if _api_client is not None:
+        return _api_client
+    with _lock:
+        if _api_client is None:
+            from kubernetes import client as k8s_client, config as k8s_config
+
+            cfg = k8s_client.Configuration()
+            try:
+                k8s_config.load_incluster_config(client_configuration=cfg)
+                source = "in-cluster"
+            except k8s_config.ConfigException:
+                k8s_config.load_kube_config(client_configuration=cfg)
+                source = "kubeconfig"
+            cfg.connection_pool_maxsize = int(os.getenv("K8S_POOL_MAXSIZE", "16"))
+            k8s_client.Configuration.set_default(cfg)
+            _api_client = k8s_client.ApiClient(cfg)
+            logger.info("K8s API 클라이언트 생성: %s (%s, pool=%d)", cfg.host, source, cfg.connection_pool_maxsize)
+        return _api_client
+
+
+def _typed(name: str):
+    api = _apis.get(name)
+    if api is None:
+        from kubernetes import client as k8s_client
+        api_client = get_api_client()
+        with _lock:
+            api = _apis.setdefault(name, getattr(k8s_client, name)(api_client))
+    return api
+
+
+def core_v1():
+    """공유 CoreV1Api"""
+    return _typed("CoreV1Api")
+
+
+def apps_v1():
+    """공유 AppsV1Api"""
+    return _typed("AppsV1Api")
@@ -0,0 +1,180 @@
+"""에이전트 PR 머지 큐
+
+같은 values 파일을 고치는 PR이 여러 개면 첫 머지 이후 나머지가 대부분 충돌한다.
+MergeQueue는 머지 요청을 단일 워커가 순서대로(심각도 → 요청 순) 처리하며,
+충돌한 PR은 수정안의 구조적 patch를 새 main 위에 다시 적용하고
+validate를 다시 돌린 뒤 브랜치를 force-push 하고 머지를 재시도한다.
+
+머지 대기 항목(_pending_merges)에 필요한 키:
+  target_file, original_yaml, fix_content, branch_name, issue_data
+"""
+import itertools
+import logging
+import queue
+import threading
+from typing import Callable
+
+import yaml
+
+from dr_kube import yaml_diff, yaml_edit
+from dr_kube.git_mirror import get_mirror
+from dr_kube.github import GitHubClient, get_github_client
+
+logger = logging.getLogger("dr-kube-merge-queue")
+
+_SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+_REBASE_KEYS = ("target_file", "original_yaml", "fix_content", "branch_name")
+
+MergeCallback = Callable[[int, bool, str], None]
+_MISSING = object()
+
+
+def _value_at(data, segments: tuple):
+    for seg in segments:
+        try:
+            data = data[seg]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return data
+
+
+def rebase_fix(gh: GitHubClient, current: str, original: str, fix: str) -> str | None:
+    """original → fix 변경을 current(새 main) 위에 재적용. 실패 시 None
+
+    스칼라 값 교체만 있는 수정안은 구조적 patch(yaml_edit)로 경로 단위 재적용하고,
+    키 추가/삭제가 있거나 경로가 사라졌거나 main에서 같은 값이 바뀌었으면
+    3-way 텍스트 병합으로 대체한다 (같은 줄을 양쪽이 고쳤으면 충돌 → None).
+    """
+    try:
+        changes = yaml_diff.diff_yaml(original, fix)
+        current_data = yaml.safe_load(current)
+    except yaml.YAMLError:
+        changes = None
+
+    if changes and all(
+        c.op == "replace" and not isinstance(c.old, (dict, list)) and not isinstance(c.new, (dict, list))
+        and _value_at(current_data, c.segments) == c.old
+        for c in changes
+    ):
+        try:
+            return yaml_edit.set_values(current, {c.segments: c.new for c in changes})
+        except yaml_edit.YamlEditError as e:
+            logger.info("구조적 재적용 불가 (%s) → 3-way merge", e)
+
+    ok, merged = gh.merge_text(current, original, fix)
+    return merged if ok else None
+
+
+class MergeQueue:
+    """단일 워커 머지 큐
+
+    Args:
+        revalidate: 재적용한 수정안 검증 함수 (IssueState → {"status": "validated" | ..., "error": ...})
+        repo_path: Git 저장소 경로
+    """
+
+    def __init__(self, revalidate: Callable[[dict], dict], repo_path: str | None = None):
+        self.revalidate = revalidate
+        self.repo_path = repo_path
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, pr_number: int, entry: dict, on_done: MergeCallback) -> None:
+        """머지 요청 추가 (즉시 반환, 결과는 on_done으로 전달)"""
+        rank = _SEVERITY_RANK.get(entry.get("severity", "medium"), 2)
+        self._queue.put((rank, next(self._seq), pr_number, entry, on_done))
+        logger.info("머지 큐 추가: #%s (대기 %d건)", pr_number, self._queue.qsize())
+        self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="merge-queue")
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            _, _, pr_number, entry, on_done = self._queue.get()
+            try:
+                success, msg = self._process(pr_number, entry)
+            except Exception as e:
+                logger.exception("머지 큐 처리 예외: #%s", pr_number)
+                success, msg = False, str(e)
+            try:
+                on_done(pr_number, success, msg)
+            except Exception:
+                logger.exception("머지 결과 콜백 실패: #%s", pr_number)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, pr_number: int, entry: dict) -> tuple[bool, str]:
+        gh = get_github_client(self.repo_path)
+        can_rebase = all(entry.get(k) for k in _REBASE_KEYS)
+
+        # 이미 충돌 상태면 머지 시도 전에 새 main 위로 재적용
+        if can_rebase and gh.is_conflicted(pr_number):
+            ok, msg = self._rebase(gh, pr_number, entry)
+            if not ok:
+                return False, msg
+
+        success, msg = gh.merge_pr(pr_number)
+        if success or not can_rebase:
+            return success, msg
+
+        logger.warning("머지 실패 (#%s: %s) → main 위로 재적용 후 재시도", pr_number, msg)
+        ok, rebase_msg = self._rebase(gh, pr_number, entry)
+        if not ok:
+            return False, f"{msg} / {rebase_msg}"
+        return gh.merge_pr(pr_number)
+
+    def _rebase(self, gh: GitHubClient, pr_number: int, entry: dict) -> tuple[bool, str]:
+        """수정안을 최신 main에 재적용 → validate → 브랜치 force-push"""
+        target_file = entry["target_file"]
+        ok, main_sha = get_mirror(gh.repo_path).refresh()
+        if not ok:
+            return False, f"main fetch 실패: {main_sha}"
+        current = gh.read_file(main_sha, target_file)
+        if current is None:
+            return False, f"main에 {target_file} 없음"
+
+        rebased = rebase_fix(gh, current, entry["original_yaml"], entry["fix_content"])
+        if rebased is None:
+            return False, "수정안을 새 main에 재적용할 수 없습니다 (충돌)"
+        if rebased == current:
+            return False, "수정 내용이 이미 main에 반영되어 있습니다"
+
+        result = self.revalidate({
+            "issue_data": entry.get("issue_data", {}),
+            "original_yaml": current,
+            "fix_content": rebased,
+        })
+        if result.get("status") != "validated":
+            return False, f"재적용 수정안 검증 실패: {result.get('error', '')}"
+
+        message = f"fix: {entry.get('fix_description') or target_file} (rebased on {main_sha[:7]})"
+        ok, sha = gh.commit_files(
+            entry["branch_name"], {target_file: rebased}, message,
+            originals={target_file: current}, force=True,
+        )
+        if not ok:
+            return False, f"브랜치 갱신 실패: {sha}"
+
+        entry["original_yaml"] = current
+        entry["fix_content"] = rebased
+        logger.info("재적용 완료: #%s %s → %s", pr_number, entry["branch_name"], sha[:12])
+        return True, sha
+
+
+_queue: MergeQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_merge_queue(revalidate: Callable[[dict], dict], repo_path: str | None = None) -> MergeQueue:
+    """프로세스 단일 머지 큐 (최초 호출 시 생성)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = MergeQueue(revalidate, repo_path)
+        return _queue
@@ -0,0 +1,243 @@
+"""OOM 예측 분석기 (백그라운드)
+
+ContainerOOMKilled가 뜬 뒤에야 대응하지 않도록, 감시 네임스페이스의 모든 컨테이너에 대해
+container_memory_working_set_bytes 추세를 메모리 limit과 비교해 limit 도달 시각(ETA)을 예측한다.
+ETA가 예측 범위 안이면 PredictedOOM 합성 alert(type=oom)를 만들어 process_issue로 넘긴다
+(delivery-app은 delivery_agent, 그 외는 dr_kube 파이프라인 → 메모리 limit 증설 제안).
+
+- 주기마다 범위 쿼리 1개 + limit 쿼리 1개로 전체 컨테이너 조회
+- (컨테이너, 시각) 배열에서 최소제곱 기울기/절편/R²를 한 번에 계산
+- 추세가 뚜렷하고(R²) 사용률이 절반 이상인 컨테이너만 대상, 워크로드별 가장 이른 ETA 1건
+- 워크로드별 쿨다운 + 웹훅과 같은 일일 LLM 예산 적용
+
+환경변수:
+  OOM_FORECAST_ENABLED          : 활성화 여부 (기본: true)
+  OOM_FORECAST_NAMESPACES       : 대상 네임스페이스 (콤마 구분, 기본: WATCH_NAMESPACES)
+  OOM_FORECAST_INTERVAL_SECONDS : 분석 주기 (기본: 120)
+  OOM_FORECAST_WINDOW_MINUTES   : 추세 구간 (기본: 30)
+  OOM_FORECAST_HORIZON_MINUTES  : 이 시간 안에 limit 도달 예상이면 이슈 생성 (기본: 30)
+  OOM_FORECAST_MIN_R2           : 추세 적합도 하한 (기본: 0.6)
+  OOM_FORECAST_COOLDOWN_MINUTES : 같은 워크로드 재알림 간격 (기본: 60)
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import numpy as np
+
+from dr_kube.converter import convert_alert_to_issue, extract_resource_name
+from dr_kube.prometheus import get_prometheus
+
+logger = logging.getLogger("dr-kube-oom-forecast")
+
+STEP_SECONDS = 30
+MIN_USAGE_RATIO = 0.5  # 사용률이 이보다 낮으면 추세가 가팔라도 무시
+_EPS = 1e-9
+
+
+class Forecast(NamedTuple):
+    namespace: str
+    pod: str
+    container: str
+    usage_bytes: float
+    limit_bytes: float
+    slope_bytes_per_min: float
+    r2: float
+    eta_minutes: float
+
+
+def fit_trends(minutes: np.ndarray, usage: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """[N, T] 사용량 → 컨테이너별 (기울기, 현재 적합값, R², 유효 샘플 수). NaN은 제외하고 적합."""
+    valid = ~np.isnan(usage)
+    w = valid.astype(float)
+    n = w.sum(axis=-1)
+    y = np.where(valid, usage, 0.0)
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x_mean = (w * minutes).sum(axis=-1) / np.maximum(n, _EPS)
+        y_mean = y.sum(axis=-1) / np.maximum(n, _EPS)
+        dx = np.where(valid, minutes - x_mean[:, None], 0.0)
+        dy = np.where(valid, usage - y_mean[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=-1)
+        slope = (dx * dy).sum(axis=-1) / np.maximum(sxx, _EPS)
+        residual = np.where(valid, dy - slope[:, None] * dx, 0.0)
+        ss_tot = (dy * dy).sum(axis=-1)
+        r2 = np.where(ss_tot > 0, 1.0 - (residual * residual).sum(axis=-1) / np.maximum(ss_tot, _EPS), 0.0)
+        current = y_mean + slope * (minutes[-1] - x_mean)
+    return slope, current, r2, n
+
+
+def forecast(minutes: np.ndarray, usage: np.ndarray, limits: np.ndarray,
+             horizon: float, min_r2: float) -> np.ndarray:
+    """limit 도달 예상 분 [N] (해당 없으면 inf)"""
+    slope, current, r2, n = fit_trends(minutes, usage)
+    with np.errstate(all="ignore"):
+        eta = (limits - current) / slope
+    ok = (
+        (slope > 0) & (limits > 0) & (r2 >= min_r2)
+        & (n >= usage.shape[-1] // 2) & (current >= limits * MIN_USAGE_RATIO)
+    )
+    eta = np.where(ok, np.maximum(eta, 0.0), np.inf)
+    return np.where(eta <= horizon, eta, np.inf)
+
+
+class OOMForecaster:
+    """주기적 OOM 예측 → 합성 oom 이슈 생성
+
+    Args:
+        namespaces: 대상 네임스페이스
+        window_minutes: 추세 구간 (분)
+        horizon_minutes: 이슈 생성 기준 ETA (분)
+        min_r2: 추세 적합도 하한
+        cooldown_minutes: 같은 워크로드 재알림 간격 (분)
+    """
+
+    def __init__(self, namespaces: list[str], window_minutes: int = 30, horizon_minutes: float = 30.0,
+                 min_r2: float = 0.6, cooldown_minutes: int = 60):
+        self.namespaces = namespaces
+        self.window_minutes = window_minutes
+        self.horizon_minutes = horizon_minutes
+        self.min_r2 = min_r2
+        self.cooldown_minutes = cooldown_minutes
+
+    def _selector(self) -> str:
+        return f'namespace=~"{"|".join(self.namespaces)}",container!="",container!="POD"'
+
+    def scan(self, end: float | None = None) -> list[Forecast]:
+        """1회 분석. 예측 범위 안의 컨테이너를 워크로드별 가장 이른 ETA 1건씩 반환."""
+        end = end or time.time()
+        end -= end % STEP_SECONDS
+        start = end - self.window_minutes * 60
+        times = np.arange(start, end + STEP_SECONDS / 2, STEP_SECONDS)
+        sel = self._selector()
+
+        prom = get_prometheus()
+        series = prom.query_range(
+            f"max by (namespace, pod, container) (container_memory_working_set_bytes{{{sel}}})",
+            start, end, STEP_SECONDS,
+        )
+        limits_result = prom.query(
+            f'max by (namespace, pod, container) (kube_pod_container_resource_limits{{{sel},resource="memory"}})'
+        )
+        limit_of = {
+            (r["metric"].get("namespace"), r["metric"].get("pod"), r["metric"].get("container")): float(r["value"][1])
+            for r in limits_result
+        }
+
+        keys, rows, limits = [], [], []
+        for s in series:
+            key = (s.labels.get("namespace"), s.labels.get("pod"), s.labels.get("container"))
+            limit = limit_of.get(key)
+            if not limit or not s.samples:
+                continue  # limit 없는 컨테이너는 OOMKill 대상 아님
+            row = np.full(len(times), np.nan)
+            ts, vs = np.array(s.samples).T
+            slots = np.rint((ts - start) / STEP_SECONDS).astype(int)
+            ok = (slots >= 0) & (slots < len(times))
+            row[slots[ok]] = vs[ok]
+            keys.append(key)
+            rows.append(row)
+            limits.append(limit)
+        if not rows:
+            return []
+
+        usage = np.vstack(rows)
+        limit_arr = np.array(limits)
+        minutes = (times - times[0]) / 60.0
+        eta = forecast(minutes, usage, limit_arr, self.horizon_minutes, self.min_r2)
+        hits = np.flatnonzero(np.isfinite(eta))
+        if not len(hits):
+            return []
+
+        slope, current, r2, _ = fit_trends(minutes, usage[hits])
+        earliest: dict[tuple[str, str, str], Forecast] = {}
+        for j, i in enumerate(hits):
+            namespace, pod, container = keys[i]
+            f = Forecast(namespace, pod, container, float(current[j]), float(limit_arr[i]),
+                         float(slope[j]), float(r2[j]), float(eta[i]))
+            workload_key = (namespace, extract_resource_name(pod), container)
+            if workload_key not in earliest or f.eta_minutes < earliest[workload_key].eta_minutes:
+                earliest[workload_key] = f
+        logger.info("[OOM 예측] 컨테이너 %d개 분석, 예측 범위 안 %d건", len(rows), len(earliest))
+        return sorted(earliest.values(), key=lambda f: f.eta_minutes)
+
+    def raise_issue(self, f: Forecast) -> bool:
+        """합성 PredictedOOM alert → process_issue (쿨다운/일일 예산 적용). 전달했으면 True."""
+        from dr_kube.webhook import (
+            _consume_daily_budget, _is_duplicate_within_cooldown, _is_over_daily_limit,
+            _resolve_runtime_limits, process_issue,
+        )
+
+        workload = extract_resource_name(f.pod)
+        fingerprint = hashlib.md5(f"PredictedOOM-{f.namespace}-{workload}-{f.container}".encode()).hexdigest()[:16]
+        if _is_duplicate_within_cooldown(fingerprint, self.cooldown_minutes):
+            return False
+        limits = _resolve_runtime_limits()
+        if _is_over_daily_limit(limits["max_calls_per_day"]):
+            logger.warning("[OOM 예측] 일일 예산 초과 — 스킵: %s/%s", f.namespace, workload)
+            return False
+
+        mib = 1024 * 1024
+        description = (
+            f"{f.container} 메모리 {f.usage_bytes / mib:.0f}Mi / limit {f.limit_bytes / mib:.0f}Mi "
+            f"({100 * f.usage_bytes / f.limit_bytes:.0f}%), 증가 {f.slope_bytes_per_min / mib:.1f}Mi/분 "
+            f"(R²={f.r2:.2f}) → 약 {f.eta_minutes:.0f}분 후 limit 도달 예상 (OOMKilled 전 선제 대응)"
+        )
+        alert = {
+            "status": "firing",
+            "labels": {
+                "alertname": "PredictedOOM",
+                "namespace": f.namespace,
+                "pod": f.pod,
+                "container": f.container,
+                "deployment": workload,
+                "severity": "warning",
+            },
+            "annotations": {
+                "summary": f"{workload} OOM 예상 (ETA {f.eta_minutes:.0f}분)",
+                "description": description,
+            },
+            "startsAt": datetime.now(timezone.utc).isoformat(),
+            "fingerprint": fingerprint,
+        }
+        issue = convert_alert_to_issue(alert)
+        _consume_daily_budget()
+        logger.warning("[OOM 예측] %s/%s: %s", f.namespace, workload, description)
+        threading.Thread(target=process_issue, args=(issue,), daemon=True, name="oom-forecast-issue").start()
+        return True
+
+    def run(self, interval: float) -> None:
+        while True:
+            try:
+                for f in self.scan():
+                    self.raise_issue(f)
+            except Exception as e:
+                logger.warning("[OOM 예측] 분석 실패: %s", e)
+            time.sleep(interval)
+
+
+def start() -> None:
+    """OOM 예측 분석기 시작 (데몬 스레드)"""
+    if os.getenv("OOM_FORECAST_ENABLED", "true").lower() != "true":
+        logger.info("OOM 예측 비활성화 (OOM_FORECAST_ENABLED=false)")
+        return
+    env_ns = os.getenv("OOM_FORECAST_NAMESPACES") or os.getenv("WATCH_NAMESPACES", "delivery-app")
+    namespaces = [ns.strip() for ns in env_ns.split(",") if ns.strip() and ns.strip() != "*"]
+    if not namespaces:
+        namespaces = [".+"]
+    forecaster = OOMForecaster(
+        namespaces,
+        window_minutes=int(os.getenv("OOM_FORECAST_WINDOW_MINUTES", "30")),
+        horizon_minutes=float(os.getenv("OOM_FORECAST_HORIZON_MINUTES", "30")),
+        min_r2=float(os.getenv("OOM_FORECAST_MIN_R2", "0.6")),
+        cooldown_minutes=int(os.getenv("OOM_FORECAST_COOLDOWN_MINUTES", "60")),
+    )
+    interval = float(os.getenv("OOM_FORECAST_INTERVAL_SECONDS", "120"))
+    threading.Thread(target=forecaster.run, args=(interval,), daemon=True, name="oom-forecast").start()
+    logger.info("OOM 예측 시작: namespaces=%s interval=%ss horizon=%sm",
+                namespaces, interval, forecaster.horizon_minutes)
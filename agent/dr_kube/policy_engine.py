@@ -0,0 +1,268 @@
+"""컴파일된 수정 정책 엔진 (dr_kube / delivery_agent 공용)
+
+허용/금지 경로 glob을 시작 시 한 번 세그먼트 trie(NFA)로 컴파일하고,
+변경 경로 목록을 한 번 훑으면서 모든 규칙을 동시에 평가한다.
+
+glob 문법 (점 표기 경로 기준, 대소문자 무시):
+  - `*`        : 세그먼트 하나 (fnmatch 패턴 가능: `*timeout*`)
+  - `**`       : 0개 이상의 세그먼트
+  - `[*]`      : 리스트 인덱스 하나 (`[0]`도 허용, 인덱스 고정)
+  - 패턴은 경로 자체 또는 경로의 prefix에 매칭된다
+    (`spec.replicas`는 `spec.replicas`, `containers[*].env`는 `containers[0].env[1].value`에 매칭)
+
+새 mapping/list를 통째로 추가한 변경(예: 원본에 없던 `resources.limits`)은 경로가 허용 패턴보다
+짧아 매칭되지 않으므로, 추가된 값을 함께 넘기면 그 말단 경로들로 펼쳐 평가한다.
+
+평가 결과는 구조화된 Violation 목록으로 반환되어 재시도 프롬프트에 그대로 넣을 수 있다.
+"""
+import fnmatch
+import re
+from typing import Any, NamedTuple
+
+_SEGMENT_RE = re.compile(r"\[(\*|\d+)\]|[^.\[\]]+")
+_GLOB_CHARS = set("*?[")
+
+ALLOW_MODES = ("any", "all", "none")
+
+
+def split_path(path: str) -> list[str]:
+    """점 표기 경로/패턴 → 세그먼트 목록 (리스트 인덱스는 `[n]` 형태 유지)"""
+    segments: list[str] = []
+    for m in _SEGMENT_RE.finditer(path):
+        if m.group(1) is not None:
+            segments.append(f"[{m.group(1)}]")
+        else:
+            segments.append(m.group(0).lower())
+    return segments
+
+
+def leaf_paths(path: str, value: Any) -> list[str]:
+    """추가된 값 → 말단(스칼라/빈 컨테이너) 점 표기 경로 목록"""
+    if isinstance(value, dict) and value:
+        return [leaf for key, child in value.items() for leaf in leaf_paths(f"{path}.{key}", child)]
+    if isinstance(value, list) and value:
+        return [leaf for idx, child in enumerate(value) for leaf in leaf_paths(f"{path}[{idx}]", child)]
+    return [path]
+
+
+class Violation(NamedTuple):
+    """정책 위반 1건"""
+    code: str      # denied | not_allowed | missing_allowed | min_changes | exclusive
+    path: str      # 위반 경로 (전체 변경 대상이면 "")
+    rule: str      # 매칭된 패턴 또는 정책 조건
+    message: str
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class PolicyResult(NamedTuple):
+    policy: str
+    violations: list[Violation]
+    allowed_paths: list[str]
+    denied_paths: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def feedback(self) -> str:
+        """재시도 프롬프트용 위반 사유 (한 줄에 하나)"""
+        return "\n".join(f"- [{v.code}] {v.message}" for v in self.violations)
+
+    def summary(self) -> str:
+        """검증 에러 메시지용 한 줄 요약"""
+        if self.ok:
+            return ""
+        return f"정책 위반({self.policy}): " + " / ".join(v.message for v in self.violations)
+
+
+class _Node:
+    __slots__ = ("literal", "globs", "star_star", "terminals", "is_star")
+
+    def __init__(self, is_star: bool = False):
+        self.literal: dict[str, "_Node"] = {}
+        self.globs: list[tuple[str, "_Node"]] = []
+        self.star_star: "_Node | None" = None
+        self.terminals: list[int] = []
+        self.is_star = is_star  # `**` 노드: 임의 세그먼트를 소비하고 자기 자신에 머문다
+
+
+def _is_glob(segment: str) -> bool:
+    if segment.startswith("["):
+        return segment == "[*]"
+    return bool(_GLOB_CHARS & set(segment))
+
+
+class _Matcher:
+    """glob 패턴 집합을 세그먼트 trie로 컴파일한 매처"""
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        self.root = _Node()
+        for idx, pattern in enumerate(self.patterns):
+            self._insert(split_path(pattern), idx)
+
+    def _insert(self, segments: list[str], idx: int) -> None:
+        node = self.root
+        for seg in segments:
+            if seg == "**":
+                if node.star_star is None:
+                    node.star_star = _Node(is_star=True)
+                node = node.star_star
+            elif _is_glob(seg):
+                # `[*]`는 fnmatch에서 문자 클래스로 해석되므로 리터럴 대괄호로 변환
+                glob = "[[]*]" if seg == "[*]" else seg
+                child = next((c for g, c in node.globs if g == glob), None)
+                if child is None:
+                    child = _Node()
+                    node.globs.append((glob, child))
+                node = child
+            else:
+                node = node.literal.setdefault(seg, _Node())
+        node.terminals.append(idx)
+
+    @staticmethod
+    def _closure(states: set) -> set:
+        # `**`는 0개 세그먼트도 매칭하므로 자식 상태를 미리 포함
+        stack = list(states)
+        while stack:
+            node = stack.pop()
+            if node.star_star is not None and node.star_star not in states:
+                states.add(node.star_star)
+                stack.append(node.star_star)
+        return states
+
+    def match(self, segments: list[str]) -> set[int]:
+        """경로 세그먼트에 매칭되는 패턴 인덱스 집합 (prefix 매칭 포함)"""
+        states = self._closure({self.root})
+        matched: set[int] = set()
+        for seg in segments:
+            nxt: set = set()
+            for node in states:
+                matched.update(node.terminals)
+                child = node.literal.get(seg)
+                if child is not None:
+                    nxt.add(child)
+                for glob, child in node.globs:
+                    if fnmatch.fnmatchcase(seg, glob):
+                        nxt.add(child)
+                if node.is_star:
+                    nxt.add(node)
+            if not nxt:
+                return matched
+            states = self._closure(nxt)
+        for node in states:
+            matched.update(node.terminals)
+        return matched
+
+
+class CompiledPolicy:
+    """허용/금지 glob을 컴파일한 단일 정책.
+
+    Args:
+        name: 정책 이름 (issue_type)
+        allow: 허용 경로 glob
+        deny: 금지 경로 glob (허용보다 우선)
+        allow_mode: any=허용 경로 변경이 최소 1개 필요, all=모든 변경이 허용 경로여야 함, none=허용 검사 안 함
+        exclusive: 이 패턴들에만 해당하는 변경으로 구성된 수정안 금지 (예: 리소스 튜닝 단독)
+        min_changes: 최소 변경 경로 수
+    """
+
+    def __init__(
+        self,
+        name: str,
+        allow: list[str] | tuple = (),
+        deny: list[str] | tuple = (),
+        allow_mode: str = "any",
+        exclusive: list[str] | tuple = (),
+        min_changes: int = 0,
+    ):
+        if allow_mode not in ALLOW_MODES:
+            raise ValueError(f"allow_mode는 {ALLOW_MODES} 중 하나여야 합니다: {allow_mode}")
+        self.name = name
+        self.allow = tuple(allow)
+        self.deny = tuple(deny)
+        self.exclusive = tuple(exclusive)
+        self.allow_mode = allow_mode if self.allow else "none"
+        self.min_changes = min_changes
+
+        # 세 종류 패턴을 하나의 trie로 컴파일 → 경로당 1회 순회
+        self._kinds: list[str] = []
+        patterns: list[str] = []
+        for kind, group in (("allow", self.allow), ("deny", self.deny), ("exclusive", self.exclusive)):
+            for pattern in group:
+                self._kinds.append(kind)
+                patterns.append(pattern)
+        self._matcher = _Matcher(patterns)
+
+    def _expand(self, path: str, added: dict[str, Any]) -> list[tuple[str, set[int]]]:
+        """경로 → [(평가할 경로, 매칭 패턴)]. 어떤 패턴에도 안 걸리는 통째 추가는
+        말단이 모두 허용/금지 패턴에 걸릴 때만 말단 경로로 펼친다 (허용 패턴의 prefix인 추가)."""
+        hits = self._matcher.match(split_path(path))
+        value = added.get(path)
+        if hits or not isinstance(value, (dict, list)) or not value:
+            return [(path, hits)]
+        leaves = [(leaf, self._matcher.match(split_path(leaf))) for leaf in leaf_paths(path, value)]
+        if all({"allow", "deny"} & {self._kinds[i] for i in leaf_hits} for _, leaf_hits in leaves):
+            return leaves
+        return [(path, hits)]
+
+    def evaluate(self, paths: list[str], added: dict[str, Any] | None = None) -> PolicyResult:
+        """변경 경로 목록을 한 번 순회하며 정책 평가.
+
+        Args:
+            paths: 변경 경로 (점 표기)
+            added: 추가 변경의 경로 → 추가된 값 (yaml_diff.added_values). 있으면 통째 추가를 말단으로 평가
+        """
+        violations: list[Violation] = []
+        allowed: list[str] = []
+        denied: list[str] = []
+        exclusive_only = bool(self.exclusive) and bool(paths)
+
+        expanded = [item for path in paths for item in self._expand(path, added or {})]
+        for path, hits in expanded:
+            kinds = {self._kinds[i] for i in hits}
+
+            deny_hits = [self._matcher.patterns[i] for i in sorted(hits) if self._kinds[i] == "deny"]
+            if deny_hits:
+                denied.append(path)
+                violations.append(Violation(
+                    "denied", path, deny_hits[0],
+                    f"{path} 변경은 금지됩니다 (규칙: {deny_hits[0]})",
+                ))
+            elif "allow" in kinds:
+                allowed.append(path)
+            elif self.allow_mode == "all":
+                violations.append(Violation(
+                    "not_allowed", path, "",
+                    f"{path} 는 허용 목록 밖 변경입니다 (허용: {', '.join(self.allow)})",
+                ))
+
+            if "exclusive" not in kinds:
+                exclusive_only = False
+
+        if self.allow_mode == "any" and paths and not allowed:
+            violations.append(Violation(
+                "missing_allowed", "", "allow",
+                f"허용 계열 변경이 최소 1개 필요합니다 (허용: {', '.join(self.allow)})",
+            ))
+
+        if len(paths) < self.min_changes:
+            violations.append(Violation(
+                "min_changes", "", f"min_changes={self.min_changes}",
+                f"최소 {self.min_changes}개 이상의 독립 변경이 필요합니다 (현재 {len(paths)}개)",
+            ))
+
+        if exclusive_only:
+            violations.append(Violation(
+                "exclusive", "", "exclusive",
+                f"{', '.join(self.exclusive)} 계열 단독 변경은 금지됩니다",
+            ))
+
+        return PolicyResult(self.name, violations, allowed, denied)
+
+
+def compile_policies(specs: dict[str, dict]) -> dict[str, CompiledPolicy]:
+    """{name: CompiledPolicy kwargs} → {name: CompiledPolicy}. 시작 시 1회 호출."""
+    return {name: CompiledPolicy(name=name, **spec) for name, spec in specs.items()}
@@ -0,0 +1,203 @@
+"""같은 values 파일 수정안 PR 일괄 처리
+
+복합 장애 시 online-boutique.yaml 같은 파일에 몇 분 사이 여러 PR이 생기면
+각각 머지/ArgoCD sync/검증이 따로 돌고 서로 충돌한다.
+PRBatcher는 검증을 통과한 수정안을 target_file별로 짧은 윈도우 동안 모아
+3-way merge로 하나의 문서로 합치고, 모든 인시던트를 나열한 PR 하나를 연다.
+
+- 윈도우 안에 1건뿐이면 기존과 같은 단건 PR
+- 다른 수정안과 충돌하는 수정안은 단건 PR로 분리
+- 병합 결과 diff를 다시 정책 검사 (단건으로는 검사된 적 없는 조합) → 위반 시 전부 단건 PR
+- submit()은 배치가 처리될 때까지 블로킹 (호출자는 백그라운드 스레드)
+
+환경변수:
+  PR_BATCH_WINDOW_SECONDS : 수집 윈도우 (기본: 0 = 비활성, 항상 단건 PR)
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+from dr_kube import yaml_diff
+from dr_kube.github import generate_batch_pr_body, generate_branch_name, get_github_client
+
+logger = logging.getLogger("dr-kube-pr-batcher")
+
+# 윈도우 종료 후 PR 생성(커밋/푸시/API)에 허용하는 추가 대기 시간
+SUBMIT_TIMEOUT_MARGIN = 300.0
+
+
+class PRBatcher:
+    """target_file별 수정안 수집 → 일괄 PR 생성기
+
+    Args:
+        window: 첫 수정안 도착 후 배치를 닫기까지 대기 시간 (초)
+        open_single: 단건 PR 생성 함수 (IssueState → create_pr 결과 dict)
+        repo_path: Git 저장소 경로
+        check_policy: (issue_type, 변경 경로, 추가 값) → PolicyResult | None (정책 대상 아님)
+    """
+
+    def __init__(self, window: float, open_single: Callable[[dict], dict], repo_path: str | None = None,
+                 check_policy: Callable | None = None):
+        self.window = window
+        self.open_single = open_single
+        self.repo_path = repo_path
+        self.check_policy = check_policy
+        self._lock = threading.Lock()
+        self._batches: dict[str, list[tuple[dict, Future]]] = {}
+
+    def submit(self, state: dict) -> dict:
+        """수정안을 배치에 추가하고 PR 생성 결과를 기다린다."""
+        target_file = state.get("target_file", "")
+        future: Future = Future()
+        with self._lock:
+            batch = self._batches.get(target_file)
+            if batch is None:
+                batch = self._batches[target_file] = []
+                timer = threading.Timer(self.window, self._flush, args=(target_file,))
+                timer.daemon = True
+                timer.start()
+            batch.append((state, future))
+            logger.info("PR 배치 추가: %s (%d건)", target_file, len(batch))
+        timeout = self.window + SUBMIT_TIMEOUT_MARGIN
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.error("PR 배치 대기 시간 초과 (%.0fs): %s", timeout, target_file)
+            return {"error": f"PR 배치 처리 시간 초과 ({timeout:.0f}s)", "status": "error"}
+
+    def _flush(self, target_file: str) -> None:
+        with self._lock:
+            entries = self._batches.pop(target_file, [])
+        if not entries:
+            return
+        try:
+            self._open(target_file, entries)
+        except Exception as e:
+            logger.exception("PR 배치 처리 실패: %s", target_file)
+            for _, future in entries:
+                if not future.done():
+                    future.set_result({"error": f"PR 배치 처리 실패: {e}", "status": "error"})
+
+    def _resolve_single(self, state: dict, future: Future) -> None:
+        try:
+            future.set_result(self.open_single(state))
+        except Exception as e:
+            future.set_result({"error": f"PR 생성 중 오류: {e}", "status": "error"})
+
+    def _open(self, target_file: str, entries: list[tuple[dict, Future]]) -> None:
+        if len(entries) == 1:
+            self._resolve_single(*entries[0])
+            return
+
+        gh = get_github_client(self.repo_path)
+        first_state = entries[0][0]
+        merged = first_state.get("fix_content", "")
+        included = [entries[0]]
+        separate: list[tuple[dict, Future]] = []
+        for state, future in entries[1:]:
+            ok, result = gh.merge_text(merged, state.get("original_yaml", ""), state.get("fix_content", ""))
+            if ok:
+                merged = result
+                included.append((state, future))
+            else:
+                logger.info("배치 내 충돌 → 단건 PR로 분리: %s", state.get("issue_data", {}).get("id"))
+                separate.append((state, future))
+
+        try:
+            yaml.safe_load(merged)
+        except yaml.YAMLError as e:
+            logger.warning("병합 결과 YAML 오류 (%s) → 전부 단건 PR", e)
+            separate, included = entries, []
+        else:
+            violations = self._merged_violations([state for state, _ in included], merged)
+            if violations:
+                logger.warning("병합 결과 정책 위반 → 전부 단건 PR: %s", violations)
+                separate, included = entries, []
+
+        if len(included) == 1:
+            separate.insert(0, included.pop())
+
+        if included:
+            states = [state for state, _ in included]
+            result = self._open_batch(gh, target_file, states, merged)
+            for _, future in included:
+                future.set_result(result)
+
+        for state, future in separate:
+            self._resolve_single(state, future)
+
+    def _merged_violations(self, states: list[dict], merged: str) -> list[str]:
+        """병합 결과 diff 정책 검사. 각 변경은 그 경로를 바꾼 수정안의 issue_type 정책으로 평가하고,
+        어느 수정안에도 없던 변경(병합이 만든 변경)은 위반으로 본다."""
+        if len(states) < 2:
+            return []
+        original = states[0].get("original_yaml", "")
+        try:
+            merged_changes = yaml_diff.diff_yaml(original, merged)
+            own = [set(yaml_diff.changed_paths(yaml_diff.diff_yaml(original, state.get("fix_content", ""))))
+                   for state in states]
+        except yaml.YAMLError as e:
+            return [f"YAML 파싱 실패: {e}"]
+
+        merged_paths = yaml_diff.changed_paths(merged_changes)
+        added = yaml_diff.added_values(merged_changes)
+        violations = [f"{path}: 병합으로 생긴 변경" for path in merged_paths if not any(path in o for o in own)]
+        if self.check_policy is not None:
+            for state, paths in zip(states, own):
+                issue_type = state.get("issue_data", {}).get("type", "unknown")
+                result = self.check_policy(issue_type, [p for p in merged_paths if p in paths], added)
+                if result is not None and not result.ok:
+                    violations.append(result.summary())
+        return violations
+
+    def _open_batch(self, gh, target_file: str, states: list[dict], merged: str) -> dict:
+        stem = Path(target_file).stem
+        original = states[0].get("original_yaml", "")
+        branch_name = generate_branch_name("batch", stem)
+        commit_message = f"fix({stem}): batch {len(states)} remediations"
+        issue_ids = [state.get("issue_data", {}).get("id", "") for state in states]
+
+        success, msg = gh.commit_files(
+            branch_name, {target_file: merged}, commit_message, originals={target_file: original},
+        )
+        if not success:
+            return {"error": f"커밋/푸시 실패: {msg}", "status": "error"}
+
+        body = generate_batch_pr_body(target_file, states, original, merged)
+        success, pr_url, pr_number = gh.create_pr(branch_name, commit_message, body)
+        if not success:
+            return {"error": f"PR 생성 실패: {pr_url}", "status": "error"}
+
+        logger.info("일괄 PR 생성: %s (#%s) incidents=%s", pr_url, pr_number, issue_ids)
+        return {
+            "branch_name": branch_name,
+            "pr_url": pr_url,
+            "pr_number": pr_number,
+            "batched_issue_ids": issue_ids,
+            "batch_original_yaml": original,
+            "batch_fix_content": merged,
+            "status": "pr_created",
+        }
+
+
+_batcher: PRBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def batch_window() -> float:
+    return float(os.getenv("PR_BATCH_WINDOW_SECONDS", "0") or 0)
+
+
+def get_pr_batcher(open_single: Callable[[dict], dict], repo_path: str | None = None,
+                   check_policy: Callable | None = None) -> PRBatcher:
+    """프로세스 단일 배처 (최초 호출 시 생성)"""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = PRBatcher(batch_window(), open_single, repo_path, check_policy)
+        return _batcher
@@ -0,0 +1,209 @@
+"""공유 Prometheus 클라이언트
+
+컨텍스트 수집/분석이 쿼리마다 새 연결로 httpx.get을 순차 호출하지 않도록
+스레드 하나에서 도는 asyncio 루프 + httpx.AsyncClient 커넥션 풀 하나로 쿼리를 동시에 보낸다.
+
+- query_many: 여러 PromQL을 동시에 실행 (동시 실행 수 제한)
+- 짧은 TTL 캐시 (PromQL 키) + 같은 쿼리 동시 요청은 HTTP 1회로 합침
+- query_range: 범위 쿼리. 시작/끝을 step 경계로 맞추고, 캐시된 더 넓은 구간이 있으면 잘라서 재사용
+  (재시도/인접 인시던트가 같은 구간을 다시 조회하지 않음)
+
+환경변수:
+  PROMETHEUS_URL             : Prometheus 주소 (기본: http://prometheus-operated.monitoring.svc.cluster.local:9090)
+  PROMETHEUS_CACHE_TTL       : instant 쿼리 캐시 유지 시간 (초, 기본: 15)
+  PROMETHEUS_RANGE_CACHE_TTL : 범위 쿼리 캐시 유지 시간 (초, 기본: 60)
+  PROMETHEUS_MAX_CONCURRENCY : 동시 쿼리 수 (기본: 8)
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import httpx
+
+logger = logging.getLogger("dr-kube-prometheus")
+
+DEFAULT_PROMETHEUS_URL = "http://prometheus-operated.monitoring.svc.cluster.local:9090"
+REQUEST_TIMEOUT = 5.0  # 초
+_CACHE_MAX = 512
+
+
+class Series(NamedTuple):
+    labels: dict
+    samples: list[tuple[float, float]]  # (unix 시각, 값)
+
+
+class _RangeEntry(NamedTuple):
+    fetched: float
+    start: float
+    end: float
+    series: list[Series]
+
+
+class PrometheusClient:
+    """pooled async Prometheus 클라이언트 (동기 호출 래퍼 제공)
+
+    Args:
+        url: Prometheus 주소
+        ttl: instant 쿼리 캐시 유지 시간 (초)
+        range_ttl: 범위 쿼리 캐시 유지 시간 (초)
+        max_concurrency: 동시 쿼리 수
+    """
+
+    def __init__(self, url: str, ttl: float = 15.0, range_ttl: float = 60.0, max_concurrency: int = 8):
+        self.url = url.rstrip("/")
+        self.ttl = ttl
+        self.range_ttl = range_ttl
+        self.max_concurrency = max_concurrency
+        self._instant: dict[str, tuple[float, list]] = {}
+        self._ranges: dict[tuple[str, float], _RangeEntry] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._loop = asyncio.new_event_loop()
+        self._client: httpx.AsyncClient | None = None
+        self._sem: asyncio.Semaphore | None = None
+        threading.Thread(target=self._loop.run_forever, daemon=True, name="prometheus-loop").start()
+
+    # ── 동기 API ──────────────────────────────────────
+
+    def query(self, promql: str) -> list:
+        """instant 쿼리 → result 목록 ([{metric, value}])"""
+        return self._call(self._query(promql))
+
+    def query_value(self, promql: str) -> float | None:
+        """instant 쿼리의 첫 샘플 값"""
+        return _first_value(self.query(promql))
+
+    def query_many(self, queries: dict[str, str]) -> dict[str, float | None]:
+        """이름 → PromQL을 동시에 실행해 이름 → 첫 샘플 값 반환 (실패한 쿼리는 None)"""
+        async def run() -> dict[str, float | None]:
+            results = await asyncio.gather(*(self._query(q) for q in queries.values()), return_exceptions=True)
+            out = {}
+            for name, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    logger.warning("Prometheus 쿼리 실패 (%s): %s", name, result)
+                    out[name] = None
+                else:
+                    out[name] = _first_value(result)
+            return out
+        return self._call(run())
+
+    def query_range(self, promql: str, start: float, end: float, step: float) -> list[Series]:
+        """범위 쿼리 → Series 목록"""
+        return self._call(self._query_range(promql, start, end, step))
+
+    def query_range_many(self, queries: dict[str, str], start: float, end: float,
+                         step: float) -> dict[str, list[Series]]:
+        """이름 → PromQL 범위 쿼리를 동시에 실행 (실패한 쿼리는 빈 목록)"""
+        async def run() -> dict[str, list[Series]]:
+            results = await asyncio.gather(
+                *(self._query_range(q, start, end, step) for q in queries.values()), return_exceptions=True,
+            )
+            out = {}
+            for name, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    logger.warning("Prometheus 범위 쿼리 실패 (%s): %s", name, result)
+                    out[name] = []
+                else:
+                    out[name] = result
+            return out
+        return self._call(run())
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(REQUEST_TIMEOUT * 4)
+
+    # ── 루프 내부 ─────────────────────────────────────
+
+    async def _get(self, path: str, params: dict) -> list:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        async with self._sem:
+            resp = await self._client.get(path, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("status") != "success":
+            raise RuntimeError(data.get("error") or "Prometheus 오류 응답")
+        return data.get("data", {}).get("result", [])
+
+    async def _shared(self, key: tuple, factory):
+        """같은 키의 동시 요청은 HTTP 1회로 합침"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(factory())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _query(self, promql: str) -> list:
+        now = time.time()
+        hit = self._instant.get(promql)
+        if hit and now - hit[0] < self.ttl:
+            return hit[1]
+        result = await self._shared(("query", promql), lambda: self._get("/api/v1/query", {"query": promql}))
+        self._instant[promql] = (time.time(), result)
+        _trim(self._instant)
+        return result
+
+    async def _query_range(self, promql: str, start: float, end: float, step: float) -> list[Series]:
+        # step 경계로 맞춰 인접 요청이 같은 구간을 쓰도록
+        start = start - start % step
+        end = end - end % step
+        key = (promql, step)
+        entry = self._ranges.get(key)
+        if entry and time.time() - entry.fetched < self.range_ttl and entry.start <= start and entry.end >= end:
+            return _slice(entry.series, start, end)
+
+        params = {"query": promql, "start": start, "end": end, "step": step}
+        result = await self._shared(("range", promql, start, end, step),
+                                    lambda: self._get("/api/v1/query_range", params))
+        series = [
+            Series(item.get("metric") or {}, [(float(t), float(v)) for t, v in item.get("values") or []])
+            for item in result
+        ]
+        # 더 넓은 구간을 가진 신선한 캐시는 유지
+        current = self._ranges.get(key)
+        if not (current and time.time() - current.fetched < self.range_ttl
+                and current.end - current.start > end - start):
+            self._ranges[key] = _RangeEntry(time.time(), start, end, series)
+            _trim(self._ranges)
+        return series
+
+
+def _first_value(result: list) -> float | None:
+    if result:
+        return float(result[0]["value"][1])
+    return None
+
+
+def _slice(series: list[Series], start: float, end: float) -> list[Series]:
+    return [Series(s.labels, [(t, v) for t, v in s.samples if start <= t <= end]) for s in series]
+
+
+def _trim(cache: dict) -> None:
+    # 가장 오래 전에 넣은 항목부터 제거 (dict 삽입 순서)
+    while len(cache) > _CACHE_MAX:
+        cache.pop(next(iter(cache)))
+
+
+_prometheus: PrometheusClient | None = None
+_prometheus_lock = threading.Lock()
+
+
+def get_prometheus() -> PrometheusClient:
+    """프로세스 단일 클라이언트 (최초 호출 시 생성)"""
+    global _prometheus
+    with _prometheus_lock:
+        if _prometheus is None:
+            _prometheus = PrometheusClient(
+                os.getenv("PROMETHEUS_URL", DEFAULT_PROMETHEUS_URL),
+                ttl=float(os.getenv("PROMETHEUS_CACHE_TTL", "15")),
+                range_ttl=float(os.getenv("PROMETHEUS_RANGE_CACHE_TTL", "60")),
+                max_concurrency=int(os.getenv("PROMETHEUS_MAX_CONCURRENCY", "8")),
+            )
+        return _prometheus
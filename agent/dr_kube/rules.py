@@ -0,0 +1,244 @@
+"""선언형 규칙 기반 수정 엔진
+
+remediation_rules.yaml 의 규칙 테이블을 시작 시 1회 로드해
+issue type + 리소스 → values 트리의 결정적 편집으로 변환한다.
+편집은 yaml_edit 로 원본 텍스트에 최소 적용되므로 주석/들여쓰기가 유지된다.
+
+환경변수:
+  REMEDIATION_RULES_FILE : 규칙 파일 경로 (기본: dr_kube/remediation_rules.yaml)
+"""
+import logging
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import yaml
+
+from dr_kube import yaml_edit
+
+logger = logging.getLogger("dr-kube-rules")
+
+DEFAULT_RULES_FILE = Path(__file__).parent / "remediation_rules.yaml"
+
+_BINARY_SUFFIX = {"Ki": 2**10, "Mi": 2**20, "Gi": 2**30, "Ti": 2**40}
+_DECIMAL_SUFFIX = {"k": 10**3, "K": 10**3, "M": 10**6, "G": 10**9, "T": 10**12}
+_QUANTITY_RE = re.compile(r"^\s*([0-9.]+)\s*([A-Za-z]*)\s*$")
+
+
+# =============================================================================
+# Kubernetes quantity
+# =============================================================================
+
+def parse_quantity(value: Any) -> tuple[float, str]:
+    """quantity → (기본 단위 값, 종류). 종류: memory(bytes) / cpu(millicores) / number"""
+    if isinstance(value, bool):
+        raise ValueError(f"quantity가 아닙니다: {value!r}")
+    if isinstance(value, (int, float)):
+        return float(value), "number"
+    m = _QUANTITY_RE.match(str(value))
+    if not m:
+        raise ValueError(f"quantity 형식 오류: {value!r}")
+    num, suffix = float(m.group(1)), m.group(2)
+    if suffix == "m":
+        return num, "cpu"
+    if suffix in _BINARY_SUFFIX:
+        return num * _BINARY_SUFFIX[suffix], "memory"
+    if suffix in _DECIMAL_SUFFIX:
+        return num * _DECIMAL_SUFFIX[suffix], "memory"
+    if suffix == "":
+        return num, "number"
+    raise ValueError(f"알 수 없는 quantity 단위: {value!r}")
+
+
+def quantity_base(value: Any, kind: str = "") -> float:
+    """비교용 기본 단위 값 (cpu는 단위 없는 숫자도 millicore로 환산: "2" == "2000m")"""
+    base, detected = parse_quantity(value)
+    return base * 1000 if detected == "number" and kind == "cpu" else base
+
+
+def scale_quantity(value: Any, factor: float, min_value: Any = None, max_value: Any = None,
+                   kind: str = "") -> Any:
+    """quantity × factor (범위 제한). memory는 Mi 올림, cpu는 millicore 올림으로 표기."""
+    base, detected = parse_quantity(value)
+    # 단위 없는 숫자: 경로(…cpu/…memory)로 종류 결정 (cpu: "1" = 1000m)
+    if detected == "number" and kind == "cpu":
+        base, detected = base * 1000, "cpu"
+    elif detected == "number" and kind == "memory":
+        detected = "memory"
+
+    scaled = base * factor
+
+    def _bound(v: Any) -> float:
+        b, k = parse_quantity(v)
+        return b * 1000 if k == "number" and detected == "cpu" else b
+
+    if min_value is not None:
+        scaled = max(scaled, _bound(min_value))
+    if max_value is not None:
+        # 상한이 현재 값보다 낮아도 현재 값 아래로 내리지 않음 (OOM 중 limit 축소 방지)
+        scaled = min(scaled, max(_bound(max_value), base))
+
+    if detected == "memory":
+        return f"{math.ceil(scaled / _BINARY_SUFFIX['Mi'])}Mi"
+    if detected == "cpu":
+        return f"{math.ceil(scaled)}m"
+    return int(math.ceil(scaled)) if isinstance(value, int) else scaled
+
+
+# =============================================================================
+# 규칙 엔진
+# =============================================================================
+
+class RuleFix(NamedTuple):
+    """규칙 적용 결과"""
+    rule_id: str
+    fix_content: str
+    fix_description: str
+    root_cause: str
+    severity: str
+    suggestions: list[str]
+    targets: list[str]
+    changes: dict[str, tuple[Any, Any]]  # 점 표기 경로 → (이전 값, 새 값)
+
+
+def _get(tree: Any, segments: tuple) -> Any:
+    for seg in segments:
+        if not isinstance(tree, dict) or seg not in tree:
+            raise KeyError(seg)
+        tree = tree[seg]
+    return tree
+
+
+def _kind(path: str) -> str:
+    return path.rsplit(".", 1)[-1] if path.endswith(("memory", "cpu")) else ""
+
+
+def _is_change(edit: dict, current: Any, new: Any, path: str) -> bool:
+    """실질 변경 여부. 표기만 다른 같은 값(2Gi → 2048Mi)은 변경 아님,
+    scale/increment는 현재 값보다 커질 때만 변경으로 본다."""
+    try:
+        old_base, new_base = quantity_base(current, _kind(path)), quantity_base(new, _kind(path))
+    except (ValueError, TypeError):
+        return new != current
+    if edit.get("op", "set") in ("scale", "increment"):
+        return new_base > old_base
+    return new_base != old_base
+
+
+def _apply_op(edit: dict, current: Any, path: str) -> Any:
+    op = edit.get("op", "set")
+    if op == "set":
+        return edit["value"]
+    if op == "increment":
+        new = int(current) + int(edit.get("step", 1))
+        if "min" in edit:
+            new = max(new, int(edit["min"]))
+        if "max" in edit:
+            new = min(new, int(edit["max"]))
+        return new
+    if op == "scale":
+        return scale_quantity(current, float(edit["factor"]), edit.get("min"), edit.get("max"), _kind(path))
+    raise ValueError(f"지원하지 않는 op: {op}")
+
+
+class RuleEngine:
+    """규칙 테이블 (issue_type → 규칙 목록 인덱스)"""
+
+    def __init__(self, config: dict):
+        self.aliases: dict[str, str] = config.get("resource_aliases") or {}
+        self.related: dict[str, list[str]] = config.get("related_services") or {}
+        self.rules: list[dict] = config.get("rules") or []
+        self._by_type: dict[str, list[dict]] = {}
+        for rule in self.rules:
+            for issue_type in rule.get("issue_types", []):
+                self._by_type.setdefault(issue_type, []).append(rule)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RuleEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def handles(self, issue_type: str) -> bool:
+        return issue_type in self._by_type
+
+    def _targets(self, rule: dict, resource: str, values: dict) -> list[str]:
+        key = self.aliases.get(resource, resource)
+        targets = [key] if key in values else []
+        if rule.get("targets", "self") == "related":
+            max_targets = int(rule.get("max_targets", 2))
+            for rel in self.related.get(key, []):
+                if len(targets) >= max_targets:
+                    break
+                if rel in values and rel not in targets:
+                    targets.append(rel)
+        return targets
+
+    def apply(self, issue: dict, original_yaml: str) -> RuleFix | None:
+        """이슈에 맞는 첫 규칙을 적용. 변경이 생기지 않으면 None."""
+        issue_type = issue.get("type", "unknown")
+        rules = self._by_type.get(issue_type)
+        if not rules:
+            return None
+        try:
+            values = yaml.safe_load(original_yaml)
+        except yaml.YAMLError:
+            return None
+        if not isinstance(values, dict):
+            return None
+
+        for rule in rules:
+            updates: dict[tuple, Any] = {}
+            changes: dict[str, tuple[Any, Any]] = {}
+            changed_targets: list[str] = []
+            for target in self._targets(rule, issue.get("resource", ""), values):
+                for edit in rule.get("edits", []):
+                    path = edit["path"].format(target=target)
+                    segments = tuple(path.split("."))
+                    try:
+                        current = _get(values, segments)
+                        new = _apply_op(edit, current, path)
+                    except (KeyError, ValueError, TypeError) as e:
+                        logger.debug("규칙 %s: %s 적용 불가 (%s)", rule["id"], path, e)
+                        continue
+                    if not _is_change(edit, current, new, path):
+                        continue
+                    updates[segments] = new
+                    changes[path] = (current, new)
+                    if target not in changed_targets:
+                        changed_targets.append(target)
+
+            if not updates:
+                continue
+            try:
+                fix_content = yaml_edit.set_values(original_yaml, updates)
+            except yaml_edit.YamlEditError as e:
+                logger.warning("규칙 %s 텍스트 편집 실패: %s", rule["id"], e)
+                continue
+
+            fmt = {"targets": ", ".join(changed_targets), "issue_type": issue_type}
+            return RuleFix(
+                rule_id=rule["id"],
+                fix_content=fix_content,
+                fix_description=rule.get("fix_description", rule["id"]).format(**fmt)[:60],
+                root_cause=rule.get("root_cause", "").format(**fmt),
+                severity=rule.get("severity", "medium"),
+                suggestions=list(rule.get("suggestions", [])),
+                targets=changed_targets,
+                changes=changes,
+            )
+        return None
+
+
+_engine: RuleEngine | None = None
+
+
+def get_rule_engine() -> RuleEngine:
+    """규칙 엔진 싱글톤 (최초 호출 시 파일 로드)"""
+    global _engine
+    if _engine is None:
+        path = os.getenv("REMEDIATION_RULES_FILE") or DEFAULT_RULES_FILE
+        _engine = RuleEngine.from_file(path)
+        logger.info("규칙 테이블 로드: %s (%d rules)", path, len(_engine.rules))
+    return _engine
@@ -328,6 +328,64 @@ def send_recovery_complete(
         logger.error(f"복구 완료 메시지 전송 실패: {e}")
 
 
+def send_mass_deletion(namespace: str, resources: list[str], action_id: str) -> tuple[bool, str, str]:
+    """네임스페이스 대량 삭제 인시던트 1건 전송 (리소스별 알림 대신).
+
+    버튼:
+      ♻️ 전체 복구 - 삭제된 리소스를 스냅샷으로 일괄 server-side apply
+
+    Returns:
+        (success, channel, message_ts)
+    """
+    channel = os.getenv("SLACK_CHANNEL", "dr-kube").lstrip("#")
+    shown = "\n".join(f"• `{r}`" for r in resources[:20])
+    if len(resources) > 20:
+        shown += f"\n… 외 {len(resources) - 20}개"
+
+    blocks = [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": f"🗑️ DR-Kube 대량 삭제 감지 — {namespace}"},
+        },
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": f"*네임스페이스:* `{namespace}`\n*삭제된 리소스:* {len(resources)}개\n{shown}"},
+        },
+        {"type": "divider"},
+        {
+            "type": "actions",
+            "block_id": f"restore_bulk_{action_id}",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "♻️ 전체 복구"},
+                    "style": "primary",
+                    "action_id": "restore_bulk",
+                    "value": action_id,
+                    "confirm": {
+                        "title": {"type": "plain_text", "text": "일괄 복구 확인"},
+                        "text": {"type": "mrkdwn", "text": f"`{namespace}`의 리소스 {len(resources)}개를 복구하시겠습니까?"},
+                        "confirm": {"type": "plain_text", "text": "복구"},
+                        "deny": {"type": "plain_text", "text": "취소"},
+                    },
+                },
+            ],
+        },
+    ]
+
+    try:
+        resp = _client().chat_postMessage(
+            channel=channel,
+            blocks=blocks,
+            text=f"DR-Kube: {namespace} 리소스 {len(resources)}개 삭제",
+        )
+        logger.info(f"대량 삭제 알림 전송: ns={namespace} count={len(resources)}")
+        return True, resp["channel"], resp["ts"]
+    except Exception as e:
+        logger.error(f"대량 삭제 알림 전송 실패: {e}")
+        return False, "", ""
+
+
 class SlackClient:
     """delivery_agent에서 사용하는 Slack 클라이언트 래퍼"""
 
@@ -0,0 +1,337 @@
+"""워처 리소스 스냅샷 저장소
+
+변경 감지용 지문(Fingerprint)과 복구용 원본(압축 blob)을 분리해 보관한다.
+
+- Fingerprint: __slots__ 레코드 (replicas, 이미지 tuple, 포트 tuple, 종류별 추가 필드, spec 해시, blob digest)
+- blob: apply 가능한 형태로 정리한 객체를 정규화 JSON → zlib 압축,
+  sha256 digest로 content-addressed 저장 (참조 카운트, 같은 내용은 1개만 보관)
+- blob은 복구할 때만 풀어서 dict로 돌려준다
+- 삭제된 리소스는 tombstone으로 일정 개수까지 보관 (삭제 후 복구용)
+- attach(db_path) 이후 변경분을 SQLite에 백그라운드로 기록하고, 재시작 시 지문만 읽어온다
+  (blob은 복구할 때 DB에서 읽는다)
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger("dr-kube-snapshots")
+
+# apply 시 서버가 관리하는 메타데이터 필드
+_SERVER_FIELDS = ("resourceVersion", "uid", "creationTimestamp", "generation",
+                  "managedFields", "selfLink", "annotations")
+
+MAX_TOMBSTONES = 1000
+
+
+def snapshot_key(namespace: str, kind: str, name: str) -> str:
+    return f"{namespace}/{kind}/{name}"
+
+
+def clean_for_apply(resource: dict) -> dict:
+    """apply를 위해 서버 관리 필드와 status 제거 (얕은 복사, 원본 불변)."""
+    cleaned = {k: v for k, v in resource.items() if k != "status"}
+    meta = resource.get("metadata") or {}
+    cleaned["metadata"] = {k: v for k, v in meta.items() if k not in _SERVER_FIELDS}
+    return cleaned
+
+
+def _canonical(obj) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def _tuplify(value):
+    """JSON에서 읽은 list를 지문 비교용 tuple로 되돌림"""
+    if isinstance(value, list):
+        return tuple(_tuplify(v) for v in value)
+    return value
+
+
+class Fingerprint:
+    """변경 감지용 최소 레코드"""
+
+    __slots__ = ("replicas", "images", "ports", "extra", "spec_hash", "blob")
+
+    def __init__(self, replicas: int | None, images: tuple, ports: tuple, extra: tuple,
+                 spec_hash: str, blob: str):
+        self.replicas = replicas
+        self.images = images
+        self.ports = ports
+        self.extra = extra
+        self.spec_hash = spec_hash
+        self.blob = blob
+
+    @classmethod
+    def of(cls, resource: dict, blob: str, extract=None) -> "Fingerprint":
+        """extract: 종류별 추가 필드 추출기 (resource → tuple, watch_registry 참고)"""
+        spec = resource.get("spec") or {}
+        containers = ((spec.get("template") or {}).get("spec") or {}).get("containers") or []
+        replicas = spec.get("replicas", 1) if "template" in spec else None
+        # ConfigMap 등 spec이 없는 리소스는 data로 해시
+        hashed = spec or {k: resource.get(k) for k in ("data", "binaryData")}
+        return cls(
+            replicas=replicas,
+            images=tuple(c.get("image", "") for c in containers if c.get("image")),
+            ports=tuple((p.get("port"), p.get("protocol")) for p in spec.get("ports") or []),
+            extra=extract(resource) if extract else (),
+            spec_hash=hashlib.sha1(_canonical(hashed)).hexdigest()[:16],
+            blob=blob,
+        )
+
+
+    def same_as(self, other: "Fingerprint | None") -> bool:
+        return other is not None and all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+
+class _SnapshotDB:
+    """SQLite 영속화 (단일 writer 스레드가 쌓인 변경을 한 트랜잭션으로 기록)"""
+
+    BATCH = 500
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots (key TEXT PRIMARY KEY, tomb INTEGER, seq INTEGER,"
+                " replicas INTEGER, images TEXT, ports TEXT, spec_hash TEXT, blob TEXT, extra TEXT)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+            if "extra" not in columns:
+                conn.execute("ALTER TABLE snapshots ADD COLUMN extra TEXT")
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, data BLOB)")
+        self._queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._writer, daemon=True, name="snapshot-db").start()
+
+    def submit(self, *op) -> None:
+        self._queue.put(op)
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def _writer(self) -> None:
+        conn = sqlite3.connect(self.path)
+        while True:
+            ops = [self._queue.get()]
+            while len(ops) < self.BATCH:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    for op in ops:
+                        self._apply(conn, op)
+            except sqlite3.Error:
+                logger.exception("스냅샷 DB 기록 실패 (%d건)", len(ops))
+            finally:
+                for _ in ops:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, op: tuple) -> None:
+        kind = op[0]
+        if kind == "put_blob":
+            conn.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)", op[1:])
+        elif kind == "del_blob":
+            conn.execute("DELETE FROM blobs WHERE digest = ?", op[1:])
+        elif kind == "upsert":
+            _, key, tomb, seq, fp = op
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots"
+                " (key, tomb, seq, replicas, images, ports, spec_hash, blob, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, int(tomb), seq, fp.replicas, json.dumps(fp.images), json.dumps(fp.ports),
+                 fp.spec_hash, fp.blob, json.dumps(fp.extra, default=str)),
+            )
+        elif kind == "delete":
+            conn.execute("DELETE FROM snapshots WHERE key = ?", op[1:])
+
+    def load(self) -> list[tuple[str, bool, Fingerprint]]:
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT key, tomb, replicas, images, ports, extra, spec_hash, blob FROM snapshots ORDER BY seq"
+            ).fetchall()
+            # 참조 없는 blob 정리
+            conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT blob FROM snapshots)")
+        return [
+            (key, bool(tomb), Fingerprint(
+                replicas, _tuplify(json.loads(images)), _tuplify(json.loads(ports)),
+                _tuplify(json.loads(extra or "[]")), spec_hash, blob,
+            ))
+            for key, tomb, replicas, images, ports, extra, spec_hash, blob in rows
+        ]
+
+    def read_blob(self, digest: str) -> bytes | None:
+        with sqlite3.connect(self.path) as conn:
+            row = conn.execute("SELECT data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+
+class BlobStore:
+    """zlib 압축 + sha256 content-addressed blob (참조 카운트)
+
+    DB에서 불러온 blob은 압축 데이터 없이 참조 카운트만 들고 있다가 get() 시 DB에서 읽는다.
+    """
+
+    def __init__(self):
+        self._blobs: dict[str, list] = {}  # digest → [refcount, compressed | None]
+        self._lock = threading.Lock()
+        self._db: _SnapshotDB | None = None
+
+    def put(self, obj: dict) -> str:
+        raw = _canonical(obj)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            entry = self._blobs.get(digest)
+            if entry is None:
+                data = zlib.compress(raw)
+                self._blobs[digest] = [1, data]
+                if self._db:
+                    self._db.submit("put_blob", digest, data)
+            else:
+                entry[0] += 1
+        return digest
+
+    def retain(self, digest: str) -> None:
+        with self._lock:
+            if digest in self._blobs:
+                self._blobs[digest][0] += 1
+
+    def release(self, digest: str) -> None:
+        with self._lock:
+            entry = self._blobs.get(digest)
+            if entry is not None:
+                entry[0] -= 1
+                if entry[0] <= 0:
+                    del self._blobs[digest]
+                    if self._db:
+                        self._db.submit("del_blob", digest)
+
+    def get(self, digest: str) -> dict | None:
+        with self._lock:
+            entry = self._blobs.get(digest)
+        if entry is None:
+            return None
+        data = entry[1]
+        if data is None and self._db:
+            self._db.flush()
+            data = self._db.read_blob(digest)
+        return json.loads(zlib.decompress(data)) if data else None
+
+    def stats(self) -> tuple[int, int]:
+        """(blob 수, 메모리에 있는 압축 바이트 합)"""
+        with self._lock:
+            return len(self._blobs), sum(len(e[1] or b"") for e in self._blobs.values())
+
+
+class SnapshotStore:
+    """snapshot_key → Fingerprint (+ 삭제된 리소스 tombstone)"""
+
+    def __init__(self, max_tombstones: int = MAX_TOMBSTONES):
+        self.blobs = BlobStore()
+        self._live: dict[str, Fingerprint] = {}
+        self._tombstones: OrderedDict[str, Fingerprint] = OrderedDict()
+        self._max_tombstones = max_tombstones
+        self._lock = threading.Lock()
+        self._db: _SnapshotDB | None = None
+        self._seq = 0
+
+    def attach(self, db_path: str) -> int:
+        """SQLite 파일에서 지문을 불러오고 이후 변경분을 기록. 불러온 live 개수 반환."""
+        db = _SnapshotDB(db_path)
+        rows = db.load()
+        with self._lock, self.blobs._lock:
+            for key, tomb, fp in rows:
+                entry = self.blobs._blobs.setdefault(fp.blob, [0, None])
+                entry[0] += 1
+                if tomb:
+                    self._tombstones[key] = fp
+                else:
+                    self._live[key] = fp
+            self._seq = len(rows)
+            self._db = self.blobs._db = db
+        logger.info("스냅샷 DB 로드: %s (live %d, tombstone %d)",
+                    db_path, len(self._live), len(self._tombstones))
+        return len(self._live)
+
+    def _persist(self, key: str, fp: Fingerprint | None, tomb: bool = False) -> None:
+        if self._db is None:
+            return
+        if fp is None:
+            self._db.submit("delete", key)
+        else:
+            self._seq += 1
+            self._db.submit("upsert", key, tomb, self._seq, fp)
+
+    def get(self, key: str) -> Fingerprint | None:
+        with self._lock:
+            return self._live.get(key)
+
+    def live_keys(self) -> list[str]:
+        with self._lock:
+            return list(self._live)
+
+    def record(self, key: str, resource: dict, extract=None) -> tuple[Fingerprint, Fingerprint | None]:
+        """새 상태 저장. (새 지문, 이전 지문) 반환. 이전 지문의 blob은 계속 읽을 수 있도록
+        호출자가 release()로 해제할 때까지 유지된다."""
+        fp = Fingerprint.of(resource, self.blobs.put(clean_for_apply(resource)), extract)
+        with self._lock:
+            old = self._live.get(key)
+            self._live[key] = fp
+            tomb = self._tombstones.pop(key, None)
+            # status만 바뀐 이벤트는 지문이 같으므로 기록 생략
+            if not fp.same_as(old):
+                self._persist(key, fp)
+        if tomb is not None:
+            self.blobs.release(tomb.blob)
+        return fp, old
+
+    def release(self, fp: Fingerprint | None) -> None:
+        if fp is not None:
+            self.blobs.release(fp.blob)
+
+    def delete(self, key: str) -> Fingerprint | None:
+        """live → tombstone 이동. 삭제 직전 지문 반환."""
+        with self._lock:
+            fp = self._live.pop(key, None)
+            if fp is None:
+                return self._tombstones.get(key)
+            self._tombstones[key] = fp
+            self._persist(key, fp, tomb=True)
+            evicted = []
+            while len(self._tombstones) > self._max_tombstones:
+                old_key, old_fp = self._tombstones.popitem(last=False)
+                self._persist(old_key, None)
+                evicted.append(old_fp)
+        for old in evicted:
+            self.blobs.release(old.blob)
+        return fp
+
+    def tombstones(self, namespace: str | None = None) -> list[tuple[str, Fingerprint]]:
+        with self._lock:
+            items = list(self._tombstones.items())
+        if namespace is None:
+            return items
+        return [(k, fp) for k, fp in items if k.split("/", 1)[0] == namespace]
+
+    def forget_tombstone(self, key: str) -> None:
+        with self._lock:
+            fp = self._tombstones.pop(key, None)
+            if fp is not None:
+                self._persist(key, None)
+        self.release(fp)
+
+    def restore_body(self, fp: Fingerprint) -> dict | None:
+        """복구용 원본 (blob 해제 후 dict)"""
+        return self.blobs.get(fp.blob)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._live)
@@ -20,11 +20,17 @@ class IssueState(TypedDict, total=False):
     original_yaml: str  # 원본 YAML (validate에서 diff 비교용)
     fix_content: str  # 수정된 YAML 내용
     fix_description: str  # 변경 설명
+    fix_method: str  # rule_based, llm, none (분석만)
+    rule_id: str  # 적용된 규칙 ID (fix_method=rule_based일 때)
+    policy_violations: list[dict]  # 정책 위반 사유 (재시도 프롬프트용)
 
     # PR 생성
     branch_name: str  # PR 브랜치명
     pr_url: str  # 생성된 PR URL
     pr_number: int  # PR 번호
+    batched_issue_ids: list[str]  # 일괄 PR에 함께 포함된 이슈 ID (PR 배치 시)
+    batch_original_yaml: str  # 일괄 PR 기준 원본 (머지 큐 재적용용)
+    batch_fix_content: str  # 일괄 PR에 커밋된 병합 수정안
 
     # 워크플로우 제어
     retry_count: int  # 검증 실패 재시도 횟수 (최대 3)
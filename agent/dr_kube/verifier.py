@@ -2,56 +2,49 @@
 
 ArgoCD sync 완료 이후 실제로 이슈가 해결됐는지 확인:
   1. kubernetes Python client - 영향 받은 Pod Running 상태 + 재시작 안정
-  2. Alertmanager API - 원본 alert 해소 여부
+  2. Alertmanager - 원본 alert 해소 여부 (alert_index 공유 인덱스에서 조회)
+
+대기는 verify_scheduler가 한 루프에서 처리한다 (Pod/alert 변경 시 즉시 재평가).
 """
-import json
 import logging
-import urllib.request
-import urllib.error
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import Future
+
+from dr_kube.alert_index import get_alert_index
+from dr_kube.informer import list_objects
+from dr_kube.k8s_client import core_v1
 
 logger = logging.getLogger("dr-kube-verifier")
 
-ALERTMANAGER_URL = "http://prometheus-alertmanager.monitoring.svc.cluster.local:9093"
 K8S_TIMEOUT = 10  # 초
 
-_k8s_v1 = None
-
 
 def _get_k8s_client():
-    """kubernetes CoreV1Api 클라이언트 (in-cluster 또는 kubeconfig)."""
-    global _k8s_v1
-    if _k8s_v1 is not None:
-        return _k8s_v1
+    """공유 kubernetes CoreV1Api 클라이언트 (초기화 실패 시 None)."""
     try:
-        from kubernetes import client as k8s_client, config as k8s_config
-        try:
-            k8s_config.load_incluster_config()
-        except Exception:
-            k8s_config.load_kube_config()
-        _k8s_v1 = k8s_client.CoreV1Api()
+        return core_v1()
     except Exception as e:
         logger.warning("kubernetes client 초기화 실패: %s", e)
-    return _k8s_v1
+        return None
 
 
 def check_pods_healthy(namespace: str, resource: str, max_restarts: int = 5) -> tuple[bool, str]:
     """namespace/resource의 Pod들이 모두 Running이고 재시작이 안정적인지 확인.
 
+    Pod 목록은 공유 인포머 캐시에서 읽는다 (폴링마다 API list 없음).
+
     Returns:
         (healthy: bool, reason: str)
     """
-    v1 = _get_k8s_client()
-    if v1 is None:
+    if _get_k8s_client() is None:
         return False, f"kubernetes client 초기화 실패 (namespace={namespace}, resource={resource})"
 
     # app 레이블로 조회, 없으면 app.kubernetes.io/name 재시도
     pods = None
     for selector in [f"app={resource}", f"app.kubernetes.io/name={resource}"]:
         try:
-            result = v1.list_namespaced_pod(namespace, label_selector=selector, _request_timeout=K8S_TIMEOUT)
-            if result.items:
-                pods = result.items
+            items = list_objects("Pod", namespace, selector, timeout=K8S_TIMEOUT)
+            if items:
+                pods = items
                 break
         except Exception as e:
             logger.warning("Pod 조회 실패 (selector=%s): %s", selector, e)
@@ -60,16 +53,17 @@ def check_pods_healthy(namespace: str, resource: str, max_restarts: int = 5) ->
         return False, f"Pod 없음 (namespace={namespace}, resource={resource})"
 
     for pod in pods:
-        name = pod.metadata.name
-        phase = pod.status.phase or ""
-        conditions = pod.status.conditions or []
-        ready = any(c.type == "Ready" and c.status == "True" for c in conditions)
+        name = pod["metadata"]["name"]
+        status = pod.get("status") or {}
+        phase = status.get("phase") or ""
+        conditions = status.get("conditions") or []
+        ready = any(c.get("type") == "Ready" and c.get("status") == "True" for c in conditions)
 
         if phase != "Running" or not ready:
             return False, f"Pod {name}: phase={phase}, ready={ready}"
 
-        for cs in (pod.status.container_statuses or []):
-            restarts = cs.restart_count or 0
+        for cs in (status.get("containerStatuses") or []):
+            restarts = cs.get("restartCount") or 0
             if restarts > max_restarts:
                 return False, f"Pod {name} 컨테이너 재시작 횟수 과다: {restarts}회"
 
@@ -85,26 +79,24 @@ def check_alert_resolved(fingerprint: str) -> tuple[bool, str]:
     if not fingerprint:
         return True, "fingerprint 없음 (확인 생략)"
 
-    url = f"{ALERTMANAGER_URL}/api/v2/alerts?active=true"
-    try:
-        with urllib.request.urlopen(url, timeout=K8S_TIMEOUT) as resp:
-            alerts = json.loads(resp.read())
-    except Exception as e:
-        logger.warning("Alertmanager 조회 실패: %s", e)
-        return True, f"Alertmanager 접근 실패 (확인 생략): {e}"
-
-    still_firing = [
-        a for a in alerts
-        if a.get("fingerprint") == fingerprint and a.get("status", {}).get("state") == "active"
-    ]
-    if still_firing:
-        alert = still_firing[0]
-        alertname = alert.get("labels", {}).get("alertname", "?")
-        return False, f"Alert 여전히 firing: {alertname} (fingerprint={fingerprint})"
+    index = get_alert_index()
+    index.wait_ready(K8S_TIMEOUT)
+    if not index.available:
+        return True, "Alertmanager 접근 실패 (확인 생략)"
+
+    alert = index.get(fingerprint)
+    if alert is not None and alert.state == "active":
+        return False, f"Alert 여전히 firing: {alert.alertname} (fingerprint={fingerprint})"
 
     return True, "Alert 해소됨"
 
 
+def verify_fix_async(namespace: str, resource: str, fingerprint: str, timeout: int = 600) -> Future:
+    """복구 검증을 스케줄러에 등록하고 바로 반환. Future 결과는 (success, detail)."""
+    from dr_kube.verify_scheduler import get_scheduler
+    return get_scheduler().submit(namespace, resource, fingerprint, timeout)
+
+
 def verify_fix(
     namespace: str,
     resource: str,
@@ -112,46 +104,16 @@ def verify_fix(
     poll_interval: int = 30,
     timeout: int = 600,
 ) -> tuple[bool, str]:
-    """PR 머지 후 복구 여부를 폴링으로 확인.
+    """PR 머지 후 복구 여부 확인 (정상이 되는 즉시 반환, 최대 timeout초 대기).
 
     Args:
         namespace: 영향 받은 네임스페이스
         resource: Deployment/StatefulSet 이름
         fingerprint: 원본 Alertmanager alert fingerprint
-        poll_interval: 체크 간격 (초)
+        poll_interval: 호환용 (재평가 주기는 VERIFY_RECHECK_SECONDS)
         timeout: 최대 대기 시간 (초)
 
     Returns:
         (success: bool, detail: str)
     """
-    import time
-    deadline = datetime.now(timezone.utc) + timedelta(seconds=timeout)
-    attempt = 0
-
-    logger.info("복구 검증 시작: namespace=%s resource=%s fingerprint=%s timeout=%ds",
-                namespace, resource, fingerprint, timeout)
-
-    while datetime.now(timezone.utc) < deadline:
-        attempt += 1
-        pod_ok, pod_reason = check_pods_healthy(namespace, resource)
-        alert_ok, alert_reason = check_alert_resolved(fingerprint)
-
-        logger.info("[verify #%d] pod=%s alert=%s | %s | %s",
-                    attempt, pod_ok, alert_ok, pod_reason, alert_reason)
-
-        if pod_ok and alert_ok:
-            detail = f"Pod 정상: {pod_reason} / Alert: {alert_reason}"
-            logger.info("복구 검증 성공: %s", detail)
-            return True, detail
-
-        remaining = (deadline - datetime.now(timezone.utc)).seconds
-        if remaining <= poll_interval:
-            break
-        time.sleep(poll_interval)
-
-    # 타임아웃
-    pod_ok, pod_reason = check_pods_healthy(namespace, resource)
-    alert_ok, alert_reason = check_alert_resolved(fingerprint)
-    detail = f"Pod: {pod_reason} / Alert: {alert_reason}"
-    logger.warning("복구 검증 타임아웃 (%ds): %s", timeout, detail)
-    return False, detail
+    return verify_fix_async(namespace, resource, fingerprint, timeout).result()
@@ -0,0 +1,184 @@
+"""복구 검증 스케줄러 (이벤트 기반)
+
+검증마다 스레드를 붙잡고 sleep 폴링하지 않도록, 대기 중인 검증을 스레드 하나가 모아서 처리한다.
+
+- Pod 상태: 네임스페이스별 Pod 인포머 이벤트가 오면 해당 리소스 검증만 즉시 재평가
+- Alert 상태: alert_index 공유 인덱스가 바뀌면 fingerprint가 있는 검증을 재평가 (조회는 O(1))
+- 둘 다 정상이 되는 순간 완료 (다음 폴링 주기를 기다리지 않음), 마감 시 최종 평가 후 실패
+- 결과는 concurrent.futures.Future로 돌려준다 (블로킹 대기 또는 완료 콜백)
+
+환경변수:
+  VERIFY_RECHECK_SECONDS : 이벤트가 없어도 Pod 상태를 다시 보는 주기 (기본: 30)
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from dr_kube.alert_index import get_alert_index
+from dr_kube.informer import get_informer
+
+logger = logging.getLogger("dr-kube-verify-scheduler")
+
+
+class _Verification:
+    __slots__ = ("id", "namespace", "resource", "fingerprint", "deadline", "future",
+                 "pod_ok", "pod_reason", "alert_ok", "alert_reason", "next_check")
+
+    def __init__(self, vid: int, namespace: str, resource: str, fingerprint: str, deadline: float):
+        self.id = vid
+        self.namespace = namespace
+        self.resource = resource
+        self.fingerprint = fingerprint
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.pod_ok, self.pod_reason = False, "확인 전"
+        self.alert_ok, self.alert_reason = not fingerprint, "fingerprint 없음 (확인 생략)"
+        self.next_check = 0.0
+
+    def matches(self, labels: dict | None) -> bool:
+        labels = labels or {}
+        return self.resource in (labels.get("app"), labels.get("app.kubernetes.io/name"))
+
+
+class VerificationScheduler:
+    """대기 중인 복구 검증을 한 루프에서 동시에 처리
+
+    Args:
+        recheck: 이벤트 없이 Pod 상태를 재평가하는 주기 (초)
+    """
+
+    def __init__(self, recheck: float = 30.0):
+        self.recheck = recheck
+        self._pending: dict[int, _Verification] = {}
+        self._dirty: set[int] = set()
+        self._deadlines: list[tuple[float, int]] = []
+        self._ids = itertools.count(1)
+        self._subscribed: set[str] = set()
+        self._cond = threading.Condition()
+        get_alert_index().add_listener(self._on_alerts_changed)
+        threading.Thread(target=self._run, daemon=True, name="verify-scheduler").start()
+
+    def submit(self, namespace: str, resource: str, fingerprint: str, timeout: float) -> Future:
+        """검증 등록. Future 결과는 (success, detail)."""
+        self._subscribe(namespace)
+        with self._cond:
+            v = _Verification(next(self._ids), namespace, resource, fingerprint, time.monotonic() + timeout)
+            self._pending[v.id] = v
+            self._dirty.add(v.id)
+            heapq.heappush(self._deadlines, (v.deadline, v.id))
+            self._cond.notify()
+        v.future.add_done_callback(lambda f, vid=v.id: self._on_cancelled(vid) if f.cancelled() else None)
+        logger.info("복구 검증 등록: namespace=%s resource=%s fingerprint=%s timeout=%ds (대기 %d건)",
+                    namespace, resource, fingerprint, timeout, len(self._pending))
+        return v.future
+
+    def _on_cancelled(self, vid: int) -> None:
+        """취소된 검증은 즉시 제거 (재평가/깨우기 대상에서 빠짐)"""
+        with self._cond:
+            self._pending.pop(vid, None)
+            self._dirty.discard(vid)
+            self._cond.notify()
+
+    def _subscribe(self, namespace: str) -> None:
+        with self._cond:
+            if namespace in self._subscribed:
+                return
+            self._subscribed.add(namespace)
+        try:
+            informer = get_informer("Pod", namespace)
+            informer.add_handler(lambda _type, _key, obj, old: self._on_pod_event(namespace, obj, old))
+        except Exception as e:
+            logger.warning("Pod 인포머 구독 실패 (namespace=%s): %s — 주기 재평가만 사용", namespace, e)
+
+    def _on_pod_event(self, namespace: str, obj: dict | None, old: dict | None) -> None:
+        """인포머 루프 스레드에서 호출 — 표시만 하고 평가는 스케줄러 스레드에서."""
+        labels = [((o or {}).get("metadata") or {}).get("labels") for o in (obj, old)]
+        with self._cond:
+            hit = [v.id for v in self._pending.values()
+                   if v.namespace == namespace and (obj is None or any(v.matches(lb) for lb in labels))]
+            if hit:
+                self._dirty.update(hit)
+                self._cond.notify()
+
+    def _on_alerts_changed(self) -> None:
+        """alert 인덱스 폴러 스레드에서 호출"""
+        with self._cond:
+            hit = [v.id for v in self._pending.values() if v.fingerprint]
+            if hit:
+                self._dirty.update(hit)
+                self._cond.notify()
+
+    # ── 스케줄러 루프 ─────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    # 취소된 검증의 마감은 버림 (지난 시각으로 깨우기를 반복하지 않도록)
+                    while self._deadlines and self._deadlines[0][1] not in self._pending:
+                        heapq.heappop(self._deadlines)
+                    live = [v for v in self._pending.values() if not v.future.cancelled()]
+                    self._dirty.update(v.id for v in live if v.next_check <= now)
+                    expired = bool(self._deadlines) and self._deadlines[0][0] <= now
+                    if self._dirty or expired:
+                        break
+                    wakeups = [v.next_check for v in live]
+                    if self._deadlines:
+                        wakeups.append(self._deadlines[0][0])
+                    self._cond.wait(max(0.0, min(wakeups) - now) if wakeups else None)
+                dirty, self._dirty = self._dirty, set()
+                expired_ids = set()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    expired_ids.add(heapq.heappop(self._deadlines)[1])
+                batch = [self._pending[i] for i in dirty | expired_ids if i in self._pending]
+            try:
+                self._evaluate(batch, expired_ids)
+            except Exception:
+                logger.exception("복구 검증 평가 실패")
+
+    def _evaluate(self, batch: list[_Verification], expired: set[int]) -> None:
+        from dr_kube.verifier import check_alert_resolved, check_pods_healthy
+
+        now = time.monotonic()
+        for v in batch:
+            if v.future.cancelled():
+                self._finish(v, None)
+                continue
+            v.pod_ok, v.pod_reason = check_pods_healthy(v.namespace, v.resource)
+            v.next_check = now + self.recheck
+            if v.fingerprint:
+                v.alert_ok, v.alert_reason = check_alert_resolved(v.fingerprint)
+
+            if v.pod_ok and v.alert_ok:
+                detail = f"Pod 정상: {v.pod_reason} / Alert: {v.alert_reason}"
+                logger.info("복구 검증 성공: %s/%s %s", v.namespace, v.resource, detail)
+                self._finish(v, (True, detail))
+            elif v.id in expired:
+                detail = f"Pod: {v.pod_reason} / Alert: {v.alert_reason}"
+                logger.warning("복구 검증 타임아웃: %s/%s %s", v.namespace, v.resource, detail)
+                self._finish(v, (False, detail))
+
+    def _finish(self, v: _Verification, result: tuple[bool, str] | None) -> None:
+        with self._cond:
+            self._pending.pop(v.id, None)
+            self._dirty.discard(v.id)
+        if result is not None and not v.future.done():
+            v.future.set_result(result)
+
+
+_scheduler: VerificationScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> VerificationScheduler:
+    """프로세스 단일 검증 스케줄러 (최초 호출 시 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = VerificationScheduler(recheck=float(os.getenv("VERIFY_RECHECK_SECONDS", "30")))
+        return _scheduler
@@ -0,0 +1,216 @@
+"""워처 리소스 종류 레지스트리
+
+감시할 종류를 표 하나로 선언한다. 종류마다 지문 추가 필드 추출기(extract)와
+수상한 변경 규칙(rules)만 정의하면 list/watch/스냅샷/복구는 같은 경로를 탄다.
+
+- plural/namespaced는 kubernetes dynamic client의 discovery 캐시로 해석 (실패 시 표의 기본값)
+- 표에 없는 종류(CRD 등)는 WATCH_KINDS에 "group/version/Kind"로 지정하면
+  삭제 감지 + 스냅샷 복구만 하는 일반 종류로 등록된다
+- 복구는 dynamic client server-side apply 1회
+
+환경변수:
+  WATCH_KINDS : 감시할 종류 (콤마 구분, 기본: Deployment,StatefulSet,Service,ConfigMap)
+                예) Deployment,Service,HorizontalPodAutoscaler,argoproj.io/v1alpha1/Rollout
+"""
+import logging
+import os
+import threading
+from typing import Callable, NamedTuple
+
+from dr_kube.snapshot_store import Fingerprint
+
+logger = logging.getLogger("dr-kube-watch-registry")
+
+FIELD_MANAGER = "dr-kube-agent"
+
+Rule = Callable[[Fingerprint, Fingerprint], str | None]
+
+
+class KindSpec(NamedTuple):
+    kind: str
+    api_version: str
+    plural: str  # discovery 실패 시 기본값
+    extract: Callable[[dict], tuple] | None = None  # Fingerprint.extra 추출기
+    rules: tuple[Rule, ...] = ()
+    skip: Callable[[str], bool] | None = None  # 이름 기준 감시 제외
+    restore_phase: int = 1  # 일괄 복구 순서 (0이 먼저: 설정/네트워크 → 1: 워크로드)
+    restore_strip: tuple[str, ...] = ()  # 복구 시 제외할 spec 필드 (서버 할당 값)
+
+
+# ── 수상한 변경 규칙 ──────────────────────────────────
+
+def replicas_to_zero(old: Fingerprint, new: Fingerprint) -> str | None:
+    if (old.replicas or 0) > 0 and new.replicas == 0:
+        return f"replicas {old.replicas} → 0 (강제 다운)"
+    return None
+
+
+def image_changed(old: Fingerprint, new: Fingerprint) -> str | None:
+    if old.images and new.images and old.images != new.images:
+        return f"이미지 변경: {list(old.images)} → {list(new.images)}"
+    return None
+
+
+def ports_changed(old: Fingerprint, new: Fingerprint) -> str | None:
+    if old.ports and new.ports and old.ports != new.ports:
+        fmt = lambda ports: [f"{port}/{proto}" for port, proto in ports]  # noqa: E731
+        return f"포트 변경: {fmt(old.ports)} → {fmt(new.ports)}"
+    return None
+
+
+def extra_changed(label: str) -> Rule:
+    """Fingerprint.extra 값이 바뀌면 수상한 변경으로 보는 규칙"""
+    def rule(old: Fingerprint, new: Fingerprint) -> str | None:
+        if old.extra and old.extra != new.extra:
+            return f"{label} 변경: {old.extra} → {new.extra}"
+        return None
+    return rule
+
+
+# ── 지문 추가 필드 추출기 ─────────────────────────────
+
+def _hpa_extra(resource: dict) -> tuple:
+    spec = resource.get("spec") or {}
+    return (spec.get("minReplicas", 1), spec.get("maxReplicas"))
+
+
+def _pdb_extra(resource: dict) -> tuple:
+    spec = resource.get("spec") or {}
+    return (spec.get("minAvailable"), spec.get("maxUnavailable"))
+
+
+def _ingress_extra(resource: dict) -> tuple:
+    backends = []
+    for rule in (resource.get("spec") or {}).get("rules") or []:
+        for path in ((rule.get("http") or {}).get("paths")) or []:
+            service = (path.get("backend") or {}).get("service") or {}
+            port = service.get("port") or {}
+            backends.append((rule.get("host", ""), path.get("path", "/"),
+                             service.get("name", ""), port.get("number") or port.get("name")))
+    return tuple(sorted(backends, key=str))
+
+
+_SKIP_CONFIGMAP_PREFIXES = ("kube-", "argocd-", "sh.helm.", "leader-election")
+
+_BUILTIN: dict[str, KindSpec] = {spec.kind: spec for spec in (
+    KindSpec("Deployment", "apps/v1", "deployments", rules=(replicas_to_zero, image_changed)),
+    KindSpec("StatefulSet", "apps/v1", "statefulsets", rules=(image_changed,)),
+    KindSpec("Service", "v1", "services", rules=(ports_changed,),
+             skip=lambda name: name == "kubernetes",
+             restore_phase=0, restore_strip=("clusterIP", "clusterIPs")),
+    KindSpec("ConfigMap", "v1", "configmaps",
+             skip=lambda name: name.startswith(_SKIP_CONFIGMAP_PREFIXES), restore_phase=0),
+    KindSpec("HorizontalPodAutoscaler", "autoscaling/v2", "horizontalpodautoscalers",
+             extract=_hpa_extra, rules=(extra_changed("HPA min/max"),)),
+    KindSpec("PodDisruptionBudget", "policy/v1", "poddisruptionbudgets",
+             extract=_pdb_extra, rules=(extra_changed("PDB minAvailable/maxUnavailable"),)),
+    KindSpec("Ingress", "networking.k8s.io/v1", "ingresses",
+             extract=_ingress_extra, rules=(extra_changed("Ingress 백엔드"),), restore_phase=0),
+)}
+
+DEFAULT_KINDS = "Deployment,StatefulSet,Service,ConfigMap"
+
+# 해석 완료된 종류 (kind → KindSpec)
+_specs: dict[str, KindSpec] = dict(_BUILTIN)
+_dynamic = None
+_dynamic_lock = threading.Lock()
+
+
+def get_dynamic_client():
+    """discovery 캐시를 공유하는 dynamic client (최초 호출 시 생성)"""
+    global _dynamic
+    with _dynamic_lock:
+        if _dynamic is None:
+            from kubernetes import dynamic
+            from dr_kube.k8s_client import get_api_client
+            _dynamic = dynamic.DynamicClient(get_api_client())
+        return _dynamic
+
+
+def get_spec(kind: str) -> KindSpec | None:
+    return _specs.get(kind)
+
+
+def _parse(entry: str) -> KindSpec | None:
+    if "/" in entry:
+        api_version, _, kind = entry.rpartition("/")
+        return _BUILTIN.get(kind) or KindSpec(kind, api_version, "")
+    return _BUILTIN.get(entry)
+
+
+def resolve_kinds(entries: str | None = None) -> list[KindSpec]:
+    """WATCH_KINDS를 해석하고 discovery로 plural/namespaced 확인 후 인포머에 등록."""
+    from dr_kube.informer import register_resource
+
+    entries = entries or os.getenv("WATCH_KINDS", DEFAULT_KINDS)
+    try:
+        resources = get_dynamic_client().resources
+    except Exception as e:
+        logger.warning("discovery 사용 불가 (%s) — 기본 plural 사용", e)
+        resources = None
+
+    resolved = []
+    for entry in (e.strip() for e in entries.split(",")):
+        if not entry:
+            continue
+        spec = _parse(entry)
+        if spec is None:
+            logger.warning("알 수 없는 종류 (group/version/Kind로 지정 필요): %s", entry)
+            continue
+        if resources is not None:
+            try:
+                res = resources.get(api_version=spec.api_version, kind=spec.kind)
+                if not res.namespaced:
+                    logger.warning("클러스터 범위 종류는 감시하지 않음: %s", entry)
+                    continue
+                spec = spec._replace(plural=res.name)
+            except Exception as e:
+                if not spec.plural:
+                    logger.warning("종류 해석 실패 — 제외: %s (%s)", entry, e)
+                    continue
+                logger.info("discovery 실패, 기본 plural 사용: %s (%s)", entry, e)
+        elif not spec.plural:
+            continue
+        register_resource(spec.kind, spec.api_version, spec.plural)
+        _specs[spec.kind] = spec
+        resolved.append(spec)
+    logger.info("감시 종류: %s", [s.kind for s in resolved])
+    return resolved
+
+
+def should_skip(kind: str, name: str) -> bool:
+    spec = _specs.get(kind)
+    return bool(spec and spec.skip and spec.skip(name))
+
+
+def check(kind: str, old: Fingerprint, new: Fingerprint) -> str | None:
+    """종류별 규칙으로 수상한 변경 판단. 수상하면 설명 문자열, 아니면 None."""
+    if old.spec_hash == new.spec_hash:
+        return None
+    spec = _specs.get(kind)
+    for rule in (spec.rules if spec else ()):
+        reason = rule(old, new)
+        if reason:
+            return reason
+    return None
+
+
+def extractor(kind: str) -> Callable[[dict], tuple] | None:
+    spec = _specs.get(kind)
+    return spec.extract if spec else None
+
+
+def server_side_apply(kind: str, namespace: str, name: str, body: dict) -> None:
+    """dynamic client server-side apply (field manager 고정, 충돌 시 강제)."""
+    spec = _specs.get(kind)
+    if spec is None:
+        raise ValueError(f"지원하지 않는 리소스 종류: {kind}")
+    if spec.restore_strip:
+        kept = {k: v for k, v in (body.get("spec") or {}).items() if k not in spec.restore_strip}
+        body = {**body, "spec": kept}
+    client = get_dynamic_client()
+    resource = client.resources.get(api_version=spec.api_version, kind=spec.kind)
+    client.server_side_apply(
+        resource, body=body, name=name, namespace=namespace,
+        field_manager=FIELD_MANAGER, force_conflicts=True,
+    )
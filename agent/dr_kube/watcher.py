@@ -2,153 +2,151 @@
 
 ArgoCD가 관리하지 않는 리소스의 삭제/수상한 변경을 감지하여
 Slack에 알림 + [복구] [무시] 버튼을 제공한다.
+변경 전 상태는 SnapshotStore에 지문(변경 감지용) + 압축 blob(복구용)으로 보관하고
+SQLite에 계속 기록한다. 재시작 시 백그라운드에서 불러온 뒤 종류별 최초 list와 비교해
+꺼져 있던 동안의 삭제/수상한 변경도 알린다.
+알림은 event_debouncer로 객체별 병합 후 제한된 워커 풀에서 처리되며,
+한 네임스페이스의 대량 삭제는 인시던트 1건으로 묶인다.
+모든 watch는 인포머의 단일 asyncio 루프에서 다중화되므로 네임스페이스당 스레드가 없다.
+감시 종류와 종류별 감지 규칙/복구 방식은 watch_registry 표에서 가져온다 (CRD 포함).
 
 환경변수:
-  WATCH_NAMESPACES  : 감시할 네임스페이스 (콤마 구분, 기본: online-boutique)
-  WATCH_ENABLED     : 워처 활성화 여부 (기본: true)
+  WATCH_NAMESPACES      : 감시할 네임스페이스 (콤마 구분, 기본: delivery-app, *=전체)
+  WATCH_ENABLED         : 워처 활성화 여부 (기본: true)
+  WATCH_CLUSTER_WIDE    : 종류별 클러스터 전체 watch 1개로 감시 (기본: false, 네임스페이스가 많을 때)
+  WATCH_LABEL_SELECTOR  : 클러스터 전체 watch의 label selector (기본: 없음)
+  WATCH_FIELD_SELECTOR  : 클러스터 전체 watch의 field selector (예: metadata.namespace!=kube-system)
+  WATCHER_SNAPSHOT_DB   : 스냅샷 SQLite 경로 (기본: /checkpoints/watcher_snapshots.db, 빈 값=메모리만)
+  RESTORE_PARALLELISM   : 일괄 복구 동시 apply 수 (기본: 8)
+  WATCH_KINDS           : 감시할 종류 (watch_registry 참고)
 """
 import os
-import copy
+import functools
 import logging
 import threading
-import time
 import uuid
 from datetime import datetime, timezone
 
-import yaml
+from dr_kube import watch_registry
+from dr_kube.event_debouncer import WatchEvent, get_debouncer
+from dr_kube.informer import get_informer
+from dr_kube.k8s_client import load_config
+from dr_kube.snapshot_store import Fingerprint, SnapshotStore, snapshot_key
 
 logger = logging.getLogger("dr-kube-watcher")
 
-# 리소스 스냅샷: {ns/kind/name → resource_dict}
-_snapshots: dict[str, dict] = {}
-_snapshots_lock = threading.Lock()
+# 리소스 스냅샷: ns/kind/name → Fingerprint (복구 원본은 압축 blob)
+_store = SnapshotStore()
 
-# 복구 대기: action_id → {kind, name, namespace, resource_yaml, channel, ts}
+# 복구 대기: action_id → {kind, name, namespace, blob, channel, ts}
 _restore_pending: dict[str, dict] = {}
 
-# 감시할 리소스 종류: (group, version, plural, kind_label)
-_WATCH_TYPES = [
-    ("apps", "v1", "deployments", "Deployment"),
-    ("apps", "v1", "statefulsets", "StatefulSet"),
-    ("", "v1", "services", "Service"),
-    ("", "v1", "configmaps", "ConfigMap"),
-]
-
-# 복구 불필요한 ConfigMap (시스템/자동 생성)
-_SKIP_CONFIGMAP_PREFIXES = (
-    "kube-", "argocd-", "sh.helm.", "leader-election",
-)
-
-
-def _snapshot_key(namespace: str, kind: str, name: str) -> str:
-    return f"{namespace}/{kind}/{name}"
-
-
-def _clean_for_apply(resource: dict) -> dict:
-    """kubectl apply를 위해 서버 관리 필드 제거."""
-    r = copy.deepcopy(resource)
-    meta = r.get("metadata", {})
-    for field in ("resourceVersion", "uid", "creationTimestamp",
-                  "generation", "managedFields", "selfLink",
-                  "annotations"):
-        meta.pop(field, None)
-    # status 제거
-    r.pop("status", None)
-    return r
-
-
-def _is_suspicious_modification(old: dict, new: dict, kind: str) -> str | None:
-    """변경이 수상한지 판단. 수상하면 설명 문자열 반환, 정상이면 None."""
-    if kind == "Deployment":
-        old_replicas = old.get("spec", {}).get("replicas", 1)
-        new_replicas = new.get("spec", {}).get("replicas", 1)
-        if old_replicas > 0 and new_replicas == 0:
-            return f"replicas {old_replicas} → 0 (강제 다운)"
-
-    if kind in ("Deployment", "StatefulSet"):
-        old_img = _get_images(old)
-        new_img = _get_images(new)
-        if old_img and new_img and old_img != new_img:
-            return f"이미지 변경: {old_img} → {new_img}"
-
-    if kind == "Service":
-        old_ports = _get_ports(old)
-        new_ports = _get_ports(new)
-        if old_ports and new_ports and old_ports != new_ports:
-            return f"포트 변경: {old_ports} → {new_ports}"
-
-    return None
-
-
-def _get_images(resource: dict) -> list[str]:
-    containers = (
-        resource.get("spec", {})
-        .get("template", {})
-        .get("spec", {})
-        .get("containers", [])
-    )
-    return [c.get("image", "") for c in containers if c.get("image")]
-
-
-def _get_ports(resource: dict) -> list:
-    return [
-        {"port": p.get("port"), "protocol": p.get("protocol")}
-        for p in resource.get("spec", {}).get("ports", [])
-    ]
+# 일괄 복구 대기 (대량 삭제): action_id → {namespace, keys, channel, ts}
+_bulk_restore_pending: dict[str, dict] = {}
+
+# 재시작 후 최초 list 대기 (초)
+_RECONCILE_TIMEOUT = 120
+
+
+def discard_restore(action_id: str) -> dict | None:
+    """복구 대기 항목 제거 ([무시] 버튼). 스냅샷 blob 참조를 해제한다."""
+    entry = _restore_pending.pop(action_id, None)
+    if entry:
+        _store.blobs.release(entry["blob"])
+    return entry
+
+
+def apply_snapshot(kind: str, namespace: str, name: str, body: dict) -> tuple[bool, str]:
+    """server-side apply 1회로 복구 (없으면 생성, 있으면 스냅샷 상태로 덮어씀)."""
+    try:
+        watch_registry.server_side_apply(kind, namespace, name, body)
+    except Exception as e:
+        logger.error(f"apply_snapshot 실패 ({kind}/{name} ns={namespace}): {e}")
+        return False, str(e)
+
+    msg = f"{kind}/{name} (ns={namespace}) 복구 완료"
+    logger.info(msg)
+    return True, msg
 
 
 def restore_resource(action_id: str) -> tuple[bool, str]:
-    """저장된 스냅샷으로 Kubernetes Python client를 통해 복구."""
+    """저장된 스냅샷으로 server-side apply 복구."""
     entry = _restore_pending.pop(action_id, None)
     if not entry:
         return False, f"action_id={action_id} 없음 (만료되었을 수 있음)"
 
-    resource = entry["resource_yaml"]
-    kind = entry["kind"]
-    name = entry["name"]
-    namespace = entry["namespace"]
+    resource = _store.blobs.get(entry["blob"])
+    _store.blobs.release(entry["blob"])
+    if resource is None:
+        return False, f"action_id={action_id} 스냅샷 없음"
+    return apply_snapshot(entry["kind"], entry["namespace"], entry["name"], resource)
 
-    try:
-        from kubernetes import client as k8s_client
-
-        if kind == "Deployment":
-            api = k8s_client.AppsV1Api()
-            try:
-                api.create_namespaced_deployment(namespace=namespace, body=resource)
-            except Exception:
-                api.replace_namespaced_deployment(name=name, namespace=namespace, body=resource)
-
-        elif kind == "StatefulSet":
-            api = k8s_client.AppsV1Api()
-            try:
-                api.create_namespaced_stateful_set(namespace=namespace, body=resource)
-            except Exception:
-                api.replace_namespaced_stateful_set(name=name, namespace=namespace, body=resource)
-
-        elif kind == "Service":
-            api = k8s_client.CoreV1Api()
-            try:
-                api.create_namespaced_service(namespace=namespace, body=resource)
-            except Exception:
-                api.replace_namespaced_service(name=name, namespace=namespace, body=resource)
-
-        elif kind == "ConfigMap":
-            api = k8s_client.CoreV1Api()
-            try:
-                api.create_namespaced_config_map(namespace=namespace, body=resource)
-            except Exception:
-                api.replace_namespaced_config_map(name=name, namespace=namespace, body=resource)
 
-        else:
-            return False, f"지원하지 않는 리소스 종류: {kind}"
+def restore_namespace(namespace: str, keys: list[str] | None = None,
+                      parallelism: int | None = None) -> tuple[int, list[str]]:
+    """네임스페이스에서 삭제된 리소스 스냅샷을 병렬로 재적용.
 
-        msg = f"{kind}/{name} (ns={namespace}) 복구 완료"
-        logger.info(msg)
-        return True, msg
+    종류별 restore_phase 순서로 적용한다 (ConfigMap/Service 먼저 → 워크로드, Pod가 설정을 바로 찾도록).
 
-    except Exception as e:
-        logger.error(f"restore_resource 예외: {e}")
-        return False, str(e)
+    Args:
+        keys: 복구할 스냅샷 키 (None이면 해당 네임스페이스 tombstone 전부)
+        parallelism: 동시 apply 수 (기본: RESTORE_PARALLELISM)
+
+    Returns:
+        (복구 성공 수, 실패 메시지 목록)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    tombstones = _store.tombstones(namespace)
+    if keys is not None:
+        wanted = set(keys)
+        tombstones = [(k, fp) for k, fp in tombstones if k in wanted]
+    if not tombstones:
+        return 0, []
+
+    workers = parallelism or int(os.getenv("RESTORE_PARALLELISM", "8"))
+
+    def _restore(item: tuple[str, Fingerprint]) -> tuple[bool, str]:
+        skey, fp = item
+        ns, kind, name = skey.split("/", 2)
+        body = _store.restore_body(fp)
+        if body is None:
+            return False, f"{kind}/{name}: 스냅샷 없음"
+        ok, msg = apply_snapshot(kind, ns, name, body)
+        if ok:
+            _store.forget_tombstone(skey)
+        return ok, msg if ok else f"{kind}/{name}: {msg}"
+
+    def _phase(item: tuple[str, Fingerprint]) -> int:
+        spec = watch_registry.get_spec(item[0].split("/", 2)[1])
+        return spec.restore_phase if spec else 1
+
+    by_phase: dict[int, list] = {}
+    for item in tombstones:
+        by_phase.setdefault(_phase(item), []).append(item)
+    phases = [by_phase[p] for p in sorted(by_phase)]
+    restored, failures = 0, []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="restore") as executor:
+        for phase in phases:
+            for ok, msg in executor.map(_restore, phase):
+                if ok:
+                    restored += 1
+                else:
+                    failures.append(msg)
+    logger.info(f"[워처] 일괄 복구: ns={namespace} 성공 {restored} / 실패 {len(failures)}")
+    return restored, failures
+
+
+def restore_bulk(action_id: str) -> tuple[bool, str]:
+    """Slack [전체 복구] 버튼 — 대량 삭제 인시던트의 리소스 일괄 복구."""
+    entry = _bulk_restore_pending.pop(action_id, None)
+    if not entry:
+        return False, f"action_id={action_id} 없음 (만료되었을 수 있음)"
+    restored, failures = restore_namespace(entry["namespace"], entry["keys"])
+    msg = f"ns={entry['namespace']} {restored}/{len(entry['keys'])}개 복구"
+    if failures:
+        msg += "\n" + "\n".join(failures[:10])
+    return not failures, msg
 
 
 _DELIVERY_NAMESPACES = {"delivery-app"}
@@ -228,15 +226,20 @@ def _route_to_dr_kube_agent(kind: str, name: str, namespace: str,
 
 
 def _send_alert(kind: str, name: str, namespace: str,
-                event_type: str, detail: str, resource_yaml: dict) -> None:
-    """Slack에 변경 감지 알림 + 에이전트 라우팅."""
+                event_type: str, detail: str, snapshot: Fingerprint) -> None:
+    """Slack에 변경 감지 알림 + 에이전트 라우팅.
+
+    snapshot의 blob은 호출자가 retain해서 넘기며, 복구 대기로 넘기지 않으면 여기서 해제한다.
+    """
     # delivery-app은 delivery_agent로 라우팅
     if namespace in _DELIVERY_NAMESPACES:
         _route_to_delivery_agent(kind, name, namespace, event_type, detail)
+        _store.release(snapshot)
         return
 
     # 그 외 네임스페이스는 dr_kube 에이전트로 라우팅 → [PR 생성][수정 요청][무시]
     _route_to_dr_kube_agent(kind, name, namespace, event_type, detail)
+    _store.release(snapshot)
     return
 
     try:
@@ -250,7 +253,7 @@ def _send_alert(kind: str, name: str, namespace: str,
             "kind": kind,
             "name": name,
             "namespace": namespace,
-            "resource_yaml": resource_yaml,
+            "blob": snapshot.blob,
         }
 
         icon = "🗑️" if event_type == "DELETED" else "⚠️"
@@ -320,129 +323,89 @@ def _send_alert(kind: str, name: str, namespace: str,
         logger.error(f"워처 알림 전송 실패: {e}")
 
 
-def _should_skip(kind: str, name: str) -> bool:
-    """시스템 리소스 스킵 여부."""
-    if kind == "ConfigMap":
-        return any(name.startswith(p) for p in _SKIP_CONFIGMAP_PREFIXES)
-    if kind == "Service" and name == "kubernetes":
-        return True
-    return False
+def _send_event(event: WatchEvent) -> None:
+    _send_alert(*event)
 
 
-def _watch_loop(namespace: str, group: str, version: str,
-                plural: str, kind_label: str) -> None:
-    """단일 리소스 타입을 무한 Watch하는 루프."""
-    from kubernetes import client as k8s_client, watch
+def _discard_event(event: WatchEvent) -> None:
+    _store.release(event.snapshot)
 
-    if group:
-        api = k8s_client.CustomObjectsApi()
-    else:
-        api = k8s_client.CoreV1Api()
 
-    while True:
-        try:
-            w = watch.Watch()
-
-            if group == "apps":
-                apps_api = k8s_client.AppsV1Api()
-                if plural == "deployments":
-                    stream = w.stream(
-                        apps_api.list_namespaced_deployment,
-                        namespace=namespace,
-                        timeout_seconds=300,
-                    )
-                else:
-                    stream = w.stream(
-                        apps_api.list_namespaced_stateful_set,
-                        namespace=namespace,
-                        timeout_seconds=300,
-                    )
-            elif group == "":
-                if plural == "services":
-                    stream = w.stream(
-                        api.list_namespaced_service,
-                        namespace=namespace,
-                        timeout_seconds=300,
-                    )
-                else:
-                    stream = w.stream(
-                        api.list_namespaced_config_map,
-                        namespace=namespace,
-                        timeout_seconds=300,
-                    )
-            else:
-                time.sleep(30)
-                continue
-
-            for event in stream:
-                event_type = event["type"]  # ADDED, MODIFIED, DELETED
-                obj = event["object"]
-
-                # kubernetes 클라이언트 객체 → dict
-                if hasattr(obj, "to_dict"):
-                    resource = obj.to_dict()
-                elif isinstance(obj, dict):
-                    resource = obj
-                else:
-                    continue
-
-                name = (resource.get("metadata") or {}).get("name", "")
-                if not name or _should_skip(kind_label, name):
-                    continue
-
-                key = _snapshot_key(namespace, kind_label, name)
-
-                with _snapshots_lock:
-                    old_snapshot = _snapshots.get(key)
-
-                    if event_type == "ADDED":
-                        _snapshots[key] = resource
-                        continue
-
-                    elif event_type == "DELETED":
-                        stored = old_snapshot or resource
-                        _snapshots.pop(key, None)
-                        cleaned = _clean_for_apply(stored)
-                        detail = f"`{kind_label}/{name}` 이 삭제되었습니다."
-                        logger.warning(f"[워처] DELETED: {kind_label}/{name} ns={namespace}")
-                        threading.Thread(
-                            target=_send_alert,
-                            args=(kind_label, name, namespace, "DELETED", detail, cleaned),
-                            daemon=True,
-                        ).start()
-
-                    elif event_type == "MODIFIED":
-                        if old_snapshot:
-                            reason = _is_suspicious_modification(old_snapshot, resource, kind_label)
-                            if reason:
-                                cleaned = _clean_for_apply(old_snapshot)
-                                logger.warning(f"[워처] 수상한 변경: {kind_label}/{name} ns={namespace} — {reason}")
-                                threading.Thread(
-                                    target=_send_alert,
-                                    args=(kind_label, name, namespace, "MODIFIED", reason, cleaned),
-                                    daemon=True,
-                                ).start()
-                        _snapshots[key] = resource
+def _send_mass_deletion(namespace: str, events: list[WatchEvent]) -> None:
+    """네임스페이스 대량 삭제 → 리소스별 파이프라인 대신 인시던트 1건."""
+    resources = sorted(f"{e.kind}/{e.name}" for e in events)
+    logger.warning(f"[워처] 대량 삭제 인시던트: ns={namespace} {len(resources)}개")
+    try:
+        import dr_kube.slack as slack_client
+        if slack_client.is_configured():
+            # 스냅샷은 tombstone에 남아 있으므로 키만 보관
+            action_id = str(uuid.uuid4())[:8]
+            ok, channel, ts = slack_client.send_mass_deletion(namespace, resources, action_id)
+            if ok:
+                _bulk_restore_pending[action_id] = {
+                    "namespace": namespace,
+                    "keys": [snapshot_key(e.namespace, e.kind, e.name) for e in events],
+                    "channel": channel,
+                    "ts": ts,
+                }
+        else:
+            logger.warning("Slack 미설정 — 대량 삭제 알림 스킵")
+    finally:
+        for event in events:
+            _discard_event(event)
 
-        except Exception as e:
-            logger.error(f"[워처] Watch 오류 ({kind_label} ns={namespace}): {e} — 5초 후 재시도")
-            time.sleep(5)
+
+def _alert(kind_label: str, name: str, namespace: str, event_type: str,
+           detail: str, snapshot: Fingerprint) -> None:
+    _store.blobs.retain(snapshot.blob)
+    debouncer = get_debouncer(_send_event, _send_mass_deletion, _discard_event)
+    debouncer.submit(WatchEvent(kind_label, name, namespace, event_type, detail, snapshot))
+
+
+def _on_event(kind_label: str, namespaces: frozenset[str] | None,
+              event_type: str, key: str, resource: dict | None, old: dict | None) -> None:
+    """인포머 이벤트 핸들러. 스냅샷을 갱신하고 삭제/수상한 변경이면 알림.
+
+    namespaces: 클러스터 전체 watch일 때 알림 대상 네임스페이스 (None이면 전체)
+    """
+    namespace, _, name = key.partition("/")
+    if not name or watch_registry.should_skip(kind_label, name):
+        return
+    if namespaces is not None and namespace not in namespaces:
+        return
+
+    skey = snapshot_key(namespace, kind_label, name)
+
+    if event_type == "DELETED":
+        snapshot = _store.delete(skey)
+        if snapshot is None and resource is not None:
+            _store.record(skey, resource, watch_registry.extractor(kind_label))
+            snapshot = _store.delete(skey)
+        if snapshot is None:
+            return
+        detail = f"`{kind_label}/{name}` 이 삭제되었습니다."
+        logger.warning(f"[워처] DELETED: {kind_label}/{name} ns={namespace}")
+        _alert(kind_label, name, namespace, "DELETED", detail, snapshot)
+        return
+
+    snapshot, previous = _store.record(skey, resource, watch_registry.extractor(kind_label))
+    try:
+        reason = previous and watch_registry.check(kind_label, previous, snapshot)
+        if reason:
+            logger.warning(f"[워처] 수상한 변경: {kind_label}/{name} ns={namespace} — {reason}")
+            _alert(kind_label, name, namespace, "MODIFIED", reason, previous)
+    finally:
+        _store.release(previous)
 
 
 def start(namespaces: list[str] | None = None) -> None:
-    """워처 백그라운드 스레드 시작."""
+    """워처 인포머 시작 (이벤트 루프 스레드 1개에서 모든 watch 실행)."""
     if os.getenv("WATCH_ENABLED", "true").lower() != "true":
         logger.info("워처 비활성화 (WATCH_ENABLED=false)")
         return
 
     try:
-        from kubernetes import config as k8s_config
-        try:
-            k8s_config.load_incluster_config()
-            logger.info("[워처] in-cluster config 로드")
-        except Exception:
-            k8s_config.load_kube_config()
-            logger.info("[워처] kubeconfig 로드")
+        load_config()
     except Exception as e:
         logger.error(f"[워처] K8s 설정 로드 실패: {e} — 워처 비활성화")
         return
@@ -453,13 +416,72 @@ def start(namespaces: list[str] | None = None) -> None:
 
     logger.info(f"[워처] 시작: namespaces={namespaces}")
 
-    for ns in namespaces:
-        for (group, version, plural, kind_label) in _WATCH_TYPES:
-            t = threading.Thread(
-                target=_watch_loop,
-                args=(ns, group, version, plural, kind_label),
-                daemon=True,
-                name=f"watcher-{kind_label}-{ns}",
-            )
-            t.start()
-            logger.info(f"[워처] 스레드 시작: {kind_label} ns={ns}")
+    # 종류 discovery + 스냅샷 로드 + 최초 list 대조는 lifespan을 막지 않도록 백그라운드에서
+    threading.Thread(target=_bootstrap, args=(namespaces,), daemon=True, name="watcher-bootstrap").start()
+
+
+def _plan(namespaces: list[str], kinds: list[str]) -> list[tuple]:
+    """(인포머, 종류, 알림 대상 네임스페이스 필터) 목록 생성."""
+    plan: list[tuple] = []
+    cluster_wide = "*" in namespaces or os.getenv("WATCH_CLUSTER_WIDE", "false").lower() == "true"
+    if cluster_wide:
+        ns_filter = None if "*" in namespaces else frozenset(namespaces)
+        label_selector = os.getenv("WATCH_LABEL_SELECTOR", "")
+        field_selector = os.getenv("WATCH_FIELD_SELECTOR", "")
+        for kind_label in kinds:
+            informer = get_informer(kind_label, None, start=False, cache_objects=False,
+                                    label_selector=label_selector, field_selector=field_selector)
+            plan.append((informer, kind_label, ns_filter))
+        logger.info(f"[워처] 클러스터 전체 watch: kinds={kinds} label={label_selector!r} field={field_selector!r}")
+    else:
+        for ns in namespaces:
+            for kind_label in kinds:
+                informer = get_informer(kind_label, ns, start=False, cache_objects=False)
+                plan.append((informer, kind_label, None))
+        logger.info(f"[워처] 인포머 준비: {len(namespaces)}개 네임스페이스 × {len(kinds)}종")
+    return plan
+
+
+def _bootstrap(namespaces: list[str]) -> None:
+    """감시 종류 해석 → 저장된 스냅샷 로드 → 인포머 시작 → 최초 list와 대조 (꺼져 있던 동안 삭제된 리소스 알림)."""
+    kinds = [spec.kind for spec in watch_registry.resolve_kinds()]
+    if not kinds:
+        logger.error("[워처] 감시할 종류 없음 (WATCH_KINDS 확인) — 워처 비활성화")
+        return
+    plan = _plan(namespaces, kinds)
+
+    db_path = os.getenv("WATCHER_SNAPSHOT_DB", "/checkpoints/watcher_snapshots.db")
+    if db_path:
+        try:
+            _store.attach(db_path)
+        except Exception as e:
+            logger.warning(f"[워처] 스냅샷 DB 사용 불가 ({e}) — 메모리에만 보관")
+
+    for informer, kind_label, ns_filter in plan:
+        informer.add_handler(functools.partial(_on_event, kind_label, ns_filter))
+        informer.start()
+
+    for informer, kind_label, ns_filter in plan:
+        if not informer.wait_synced(_RECONCILE_TIMEOUT):
+            logger.warning(f"[워처] 최초 list 지연 — 대조 생략: {kind_label} ns={informer.namespace or '*'}")
+            continue
+        _reconcile(informer, kind_label, ns_filter)
+
+
+def _reconcile(informer, kind_label: str, ns_filter: frozenset[str] | None) -> None:
+    """스냅샷에는 있으나 최초 list에 없는 리소스 = 워처가 꺼져 있던 동안 삭제됨."""
+    stored = [k for k in _store.live_keys() if k.split("/", 2)[1] == kind_label]
+    present = set(informer.keys())
+    missing = 0
+    for skey in stored:
+        namespace, _, name = skey.split("/", 2)
+        if informer.namespace and namespace != informer.namespace:
+            continue
+        if ns_filter is not None and namespace not in ns_filter:
+            continue
+        if f"{namespace}/{name}" in present or _store.get(skey) is None:
+            continue
+        missing += 1
+        _on_event(kind_label, ns_filter, "DELETED", f"{namespace}/{name}", None, None)
+    if missing:
+        logger.warning(f"[워처] 재시작 중 삭제된 리소스 {missing}개: {kind_label} ns={informer.namespace or '*'}")
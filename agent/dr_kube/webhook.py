@@ -2,6 +2,8 @@
 import os
 import logging
 import hashlib
+import time
+import threading
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -36,6 +38,9 @@ _processed_alerts: set = set()
 from dr_kube._shared_state import pending_approvals as _pending_approvals
 from dr_kube._shared_state import pr_to_thread as _pr_to_thread
 from dr_kube._shared_state import pending_merges as _pending_merges_shared
+from dr_kube._shared_state import pending_merges_lock as _pending_merges_lock
+from dr_kube._shared_state import remediation_counts as _remediation_counts
+from dr_kube._shared_state import remediation_recent as _remediation_recent
 
 # delivery-agent Human-in-the-Loop: action_id → thread_id (파일 기반, pod 재시작 생존)
 _PENDING_FILE = os.getenv("PENDING_FILE", "/checkpoints/delivery_pending.json")
@@ -62,20 +67,41 @@ def _save_delivery_pending(d: dict[str, str]) -> None:
 
 _delivery_pending: dict[str, str] = _load_delivery_pending()
 
-# 머지 대기: pr_number → {channel, ts, issue_data, fix_description, pr_url, merged}
+# 머지 대기: pr_number → {channel, ts, issue_data, fix_description, pr_url, merged, batched_issues}
 _pending_merges = _pending_merges_shared
 
+
+def _pr_incidents(entry: dict) -> list[dict]:
+    """머지 대기 항목의 인시던트 목록 (일괄 PR이면 함께 묶인 인시던트 포함, 각각 issue_data/channel/ts/pr_ts)"""
+    return [entry, *entry.get("batched_issues", [])]
+
+
 from contextlib import asynccontextmanager
 
 
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
-    """서버 시작 시 K8s 리소스 워처 시작."""
+    """서버 시작 시 K8s 리소스 워처 + alert 인덱스 폴러 + git 미러 갱신기 + OOM 예측기 시작."""
     try:
         from dr_kube.watcher import start as start_watcher
         start_watcher()
     except Exception as e:
         logger.warning(f"워처 시작 실패 (계속 진행): {e}")
+    try:
+        from dr_kube.alert_index import get_alert_index
+        get_alert_index()
+    except Exception as e:
+        logger.warning(f"alert 인덱스 시작 실패 (계속 진행): {e}")
+    try:
+        from dr_kube.git_mirror import start as start_mirror
+        start_mirror(PROJECT_ROOT)
+    except Exception as e:
+        logger.warning(f"git 미러 시작 실패 (계속 진행): {e}")
+    try:
+        from dr_kube.oom_forecast import start as start_oom_forecast
+        start_oom_forecast()
+    except Exception as e:
+        logger.warning(f"OOM 예측 시작 실패 (계속 진행): {e}")
     yield
 
 
@@ -184,8 +210,10 @@ def process_issue(issue_data: dict, with_pr: bool = False, thread_ts: str = ""):
     run_with_pr = False if copilot else with_pr
 
     try:
+        started = time.perf_counter()
         graph = create_graph(with_pr=run_with_pr)
         result = graph.invoke({"issue_data": issue_data})
+        _record_remediation(issue_data, result, (time.perf_counter() - started) * 1000)
 
         if result.get("error"):
             logger.error(f"처리 실패: {issue_id} - {result['error']}")
@@ -236,6 +264,23 @@ def process_issue(issue_data: dict, with_pr: bool = False, thread_ts: str = ""):
         logger.error(f"처리 중 예외: {issue_id} - {e}")
 
 
+def _record_remediation(issue_data: dict, result: dict, elapsed_ms: float) -> None:
+    """수정 방식(규칙/LLM) 통계 기록 — LLM 없이 처리된 인시던트 확인용."""
+    fix_method = result.get("fix_method") or ("error" if result.get("error") else "none")
+    _remediation_counts[fix_method] = _remediation_counts.get(fix_method, 0) + 1
+    _remediation_recent.append({
+        "id": issue_data.get("id", ""),
+        "type": issue_data.get("type", ""),
+        "resource": issue_data.get("resource", ""),
+        "fix_method": fix_method,
+        "rule_id": result.get("rule_id", ""),
+        "elapsed_ms": round(elapsed_ms, 1),
+        "at": datetime.now(timezone.utc).isoformat(),
+    })
+    logger.info("수정 방식: id=%s fix_method=%s rule=%s elapsed=%.1fms",
+                issue_data.get("id"), fix_method, result.get("rule_id", "-"), elapsed_ms)
+
+
 def approve_issue(action_id: str) -> None:
     """Slack ✅ 버튼 클릭 시 호출 - 저장된 분석 결과로 PR 생성."""
     logger.info(f"approve_issue 호출: action_id={action_id}")
@@ -274,18 +319,30 @@ def approve_issue(action_id: str) -> None:
 
             pr_ts = slack_client.send_pr_ready(result, pr_url, pr_number, channel, ts)
 
-            if pr_number:
-                _pr_to_thread[pr_number] = issue_data["id"]
-                _pending_merges[pr_number] = {
-                    "channel": channel,
-                    "ts": ts,
-                    "pr_ts": pr_ts,
-                    "issue_data": issue_data,
-                    "fix_description": result.get("fix_description", ""),
-                    "fix_content": result.get("fix_content", ""),
-                    "pr_url": pr_url,
-                    "merged": False,
-                }
+            with _pending_merges_lock:
+                if pr_number and pr_number in _pending_merges:
+                    # 일괄 PR: 먼저 등록된 머지 대기 항목에 인시던트(Slack 스레드 포함)만 추가
+                    _pending_merges[pr_number].setdefault("batched_issues", []).append({
+                        "issue_data": issue_data, "channel": channel, "ts": ts, "pr_ts": pr_ts,
+                        "fix_description": result.get("fix_description", ""),
+                    })
+                elif pr_number:
+                    _pr_to_thread[pr_number] = issue_data["id"]
+                    _pending_merges[pr_number] = {
+                        "channel": channel,
+                        "ts": ts,
+                        "pr_ts": pr_ts,
+                        "issue_data": issue_data,
+                        "severity": result.get("severity", "medium"),
+                        "fix_description": result.get("fix_description", ""),
+                        # 머지 큐가 충돌 시 새 main 위로 재적용할 때 사용
+                        "target_file": result.get("target_file", ""),
+                        "original_yaml": pr_result.get("batch_original_yaml") or result.get("original_yaml", ""),
+                        "fix_content": pr_result.get("batch_fix_content") or result.get("fix_content", ""),
+                        "branch_name": pr_result.get("branch_name", ""),
+                        "pr_url": pr_url,
+                        "merged": False,
+                    }
         else:
             error = pr_result.get("error", "알 수 없는 오류")
             slack_client.update_proposal(channel, ts, "error", error)
@@ -298,35 +355,42 @@ def approve_issue(action_id: str) -> None:
 
 
 def merge_and_notify(pr_number: int) -> None:
-    """Slack ⚡ 머지 버튼 클릭 시 호출 - PR squash merge 후 Slack 업데이트."""
+    """Slack ⚡ 머지 버튼 클릭 시 호출 - 머지 큐에 추가 (충돌 시 자동 재적용 후 머지)."""
     entry = _pending_merges.get(pr_number)
     if not entry:
         logger.error(f"merge_and_notify: pr_number={pr_number} 없음")
         return
 
-    channel = entry["channel"]
-    ts = entry["ts"]
-    pr_ts = entry.get("pr_ts") or ts
+    logger.info(f"PR 머지 대기열 추가: pr_number={pr_number}")
+    from dr_kube.graph import validate
+    from dr_kube.merge_queue import get_merge_queue
+    get_merge_queue(validate, str(PROJECT_ROOT)).submit(pr_number, entry, _notify_merge_result)
 
-    logger.info(f"PR 머지 시작: pr_number={pr_number}")
-    try:
-        from dr_kube.github import GitHubClient
-        gh = GitHubClient(str(PROJECT_ROOT))
-        success, msg = gh.merge_pr(pr_number)
-
-        if success:
-            entry["merged"] = True
-            slack_client.update_proposal(channel, pr_ts, "merged", f"#{pr_number}")
-            logger.info(f"PR 머지 완료: pr_number={pr_number}")
-        else:
-            slack_client.update_proposal(channel, pr_ts, "error", f"머지 실패: {msg}")
-            logger.error(f"PR 머지 실패: pr_number={pr_number} - {msg}")
-            _pending_merges.pop(pr_number, None)
-    except Exception as e:
-        slack_client.update_proposal(channel, pr_ts, "error", str(e))
-        logger.error(f"merge_and_notify 예외: {e}")
+
+def _notify_merge_result(pr_number: int, success: bool, msg: str) -> None:
+    """머지 큐 처리 결과 → Slack 업데이트."""
+    entry = _pending_merges.get(pr_number)
+    if not entry:
+        return
+
+    if success:
+        entry["merged"] = True
+        logger.info(f"PR 머지 완료: pr_number={pr_number}")
+    else:
+        logger.error(f"PR 머지 실패: pr_number={pr_number} - {msg}")
         _pending_merges.pop(pr_number, None)
 
+    # 일괄 PR이면 묶인 인시던트 스레드 모두에 결과 전송
+    for incident in _pr_incidents(entry):
+        pr_ts = incident.get("pr_ts") or incident["ts"]
+        try:
+            if success:
+                slack_client.update_proposal(incident["channel"], pr_ts, "merged", f"#{pr_number}")
+            else:
+                slack_client.update_proposal(incident["channel"], pr_ts, "error", f"머지 실패: {msg}")
+        except Exception as e:
+            logger.error(f"머지 결과 알림 실패: {e}")
+
 
 def modify_pr_issue(pr_number: int, comment: str) -> None:
     """PR 생성 후 수정 요청 - 기존 PR 닫고 재분석 → 새 PR 생성."""
@@ -335,27 +399,30 @@ def modify_pr_issue(pr_number: int, comment: str) -> None:
         logger.error(f"modify_pr_issue: pr_number={pr_number} 없음")
         return
 
-    channel = entry["channel"]
-    ts = entry["ts"]
-    issue_data = dict(entry["issue_data"])
+    incidents = _pr_incidents(entry)
     previous_fix = entry.get("fix_content", "")
 
-    logger.info(f"PR 수정 요청: pr_number={pr_number} comment={comment[:50]}")
-    slack_client.update_proposal(channel, ts, "modified", f"PR #{pr_number} 닫고 재분석 중...")
+    logger.info(f"PR 수정 요청: pr_number={pr_number} 인시던트 {len(incidents)}건 comment={comment[:50]}")
+    for incident in incidents:
+        slack_client.update_proposal(
+            incident["channel"], incident["ts"], "modified", f"PR #{pr_number} 닫고 재분석 중...",
+        )
 
     # 기존 PR 닫기
     try:
-        from dr_kube.github import GitHubClient
-        gh = GitHubClient(str(PROJECT_ROOT))
+        from dr_kube.github import get_github_client
+        gh = get_github_client(str(PROJECT_ROOT))
         gh.close_pr(pr_number)
         logger.info(f"기존 PR 닫힘: pr_number={pr_number}")
     except Exception as e:
         logger.warning(f"PR 닫기 실패 (계속 진행): {e}")
 
-    # 피드백 주입 후 재분석
-    issue_data["_review_comment"] = comment
-    issue_data["_previous_fix"] = previous_fix
-    process_issue(issue_data, with_pr=False, thread_ts=ts)
+    # 피드백 주입 후 재분석 (일괄 PR이면 묶인 인시던트마다 각자 스레드로 새 제안)
+    for incident in incidents:
+        issue_data = dict(incident["issue_data"])
+        issue_data["_review_comment"] = comment
+        issue_data["_previous_fix"] = previous_fix
+        process_issue(issue_data, with_pr=False, thread_ts=incident["ts"])
 
 
 def modify_issue(action_id: str, comment: str) -> None:
@@ -461,11 +528,24 @@ def _is_duplicate_within_cooldown(fingerprint: str, cooldown_minutes: int) -> bo
     now = datetime.now(timezone.utc)
     last_seen = _processed_fingerprints.get(fingerprint)
     if last_seen and (now - last_seen) < timedelta(minutes=cooldown_minutes):
-        return True
+        if not _refired_since(fingerprint, last_seen):
+            return True
     _processed_fingerprints[fingerprint] = now
     return False
 
 
+def _refired_since(fingerprint: str, last_seen: datetime) -> bool:
+    """쿨다운 중이라도 alert가 해소 후 다시 발생했으면 (startsAt 갱신) 새 이슈로 본다."""
+    from dr_kube.alert_index import get_alert_index
+    alert = get_alert_index().get(fingerprint)
+    if alert is None or not alert.starts_at:
+        return False
+    try:
+        return datetime.fromisoformat(alert.starts_at.replace("Z", "+00:00")) > last_seen
+    except ValueError:
+        return False
+
+
 def _issue_group_key(issue: dict) -> str:
     target_file = issue.get("values_file", "")
     if target_file:
@@ -559,6 +639,17 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/stats/remediation")
+async def remediation_stats():
+    """수정 방식별 처리 건수 + 최근 이력 (rule_based = LLM 미사용)"""
+    total = sum(_remediation_counts.values())
+    return {
+        "counts": dict(_remediation_counts),
+        "without_llm_ratio": round(_remediation_counts.get("rule_based", 0) / total, 3) if total else 0.0,
+        "recent": list(_remediation_recent),
+    }
+
+
 @app.post("/webhook/slack/action")
 async def slack_action(request: Request, background_tasks: BackgroundTasks):
     """Slack Interactive Components 수신 (버튼 클릭 + 모달 제출).
@@ -655,9 +746,13 @@ async def slack_action(request: Request, background_tasks: BackgroundTasks):
             background_tasks.add_task(_do_restore, value, payload)
             return {"ok": True}
 
+        elif action_id_btn == "restore_bulk":
+            background_tasks.add_task(_do_bulk_restore, value)
+            return {"ok": True}
+
         elif action_id_btn == "ignore_resource":
-            from dr_kube.watcher import _restore_pending
-            entry = _restore_pending.pop(value, None)
+            from dr_kube.watcher import discard_restore
+            entry = discard_restore(value)
             if entry:
                 try:
                     from slack_sdk import WebClient
@@ -825,25 +920,59 @@ def _do_restore(action_id: str, payload: dict) -> None:
         logger.error(f"복구 알림 업데이트 실패: {e}")
 
 
+def _do_bulk_restore(action_id: str) -> None:
+    """Slack [전체 복구] 버튼 클릭 시 대량 삭제된 리소스 일괄 복구."""
+    from dr_kube.watcher import restore_bulk, _bulk_restore_pending
+    entry = _bulk_restore_pending.get(action_id) or {}
+    channel = entry.get("channel", "")
+    ts = entry.get("ts", "")
+
+    success, msg = restore_bulk(action_id)
+
+    try:
+        from slack_sdk import WebClient
+        client = WebClient(token=os.getenv("SLACK_BOT_TOKEN", ""))
+        if channel and ts:
+            text = f"✅ *일괄 복구 완료*\n{msg}" if success else f"⚠️ *일괄 복구 일부 실패*\n{msg}"
+            client.chat_update(
+                channel=channel,
+                ts=ts,
+                blocks=[{"type": "section", "text": {"type": "mrkdwn", "text": text}}],
+                text=text,
+            )
+    except Exception as e:
+        logger.error(f"일괄 복구 알림 업데이트 실패: {e}")
+
+
 def _verify_and_notify(pr_number: int, entry: dict) -> None:
-    """ArgoCD sync 후 복구 여부를 검증하고 Slack에 결과를 전송."""
-    from dr_kube.verifier import verify_fix
-    issue_data = entry.get("issue_data", {})
-    namespace = issue_data.get("namespace", "")
-    resource = issue_data.get("resource", "")
-    fingerprint = issue_data.get("fingerprint", "")
-    channel = entry["channel"]
-    ts = entry["ts"]
+    """ArgoCD sync 후 복구 검증을 스케줄러에 등록 (완료 시 Slack에 결과 전송).
 
-    logger.info(f"복구 검증 시작: pr={pr_number} namespace={namespace} resource={resource}")
+    일괄 PR이면 묶인 인시던트마다 따로 검증하고, 모두 끝나면 머지 대기 항목을 정리한다.
+    """
+    from dr_kube.verifier import verify_fix_async
+    incidents = _pr_incidents(entry)
+    entry["verify_remaining"] = len(incidents)
 
-    success, detail = verify_fix(
-        namespace=namespace,
-        resource=resource,
-        fingerprint=fingerprint,
-        poll_interval=30,
-        timeout=600,
-    )
+    for incident in incidents:
+        issue_data = incident.get("issue_data", {})
+        namespace = issue_data.get("namespace", "")
+        resource = issue_data.get("resource", "")
+        fingerprint = issue_data.get("fingerprint", "")
+
+        logger.info(f"복구 검증 시작: pr={pr_number} namespace={namespace} resource={resource}")
+
+        future = verify_fix_async(namespace=namespace, resource=resource, fingerprint=fingerprint, timeout=600)
+        # 스케줄러 스레드를 막지 않도록 Slack 전송은 별도 스레드에서
+        future.add_done_callback(lambda f, incident=incident: threading.Thread(
+            target=_notify_verification, args=(pr_number, entry, incident, *f.result()), daemon=True,
+        ).start())
+
+
+def _notify_verification(pr_number: int, entry: dict, incident: dict, success: bool, detail: str) -> None:
+    """인시던트 1건의 복구 검증 결과를 Slack에 전송."""
+    issue_data = incident.get("issue_data", {})
+    channel = incident["channel"]
+    ts = incident["ts"]
 
     if success:
         logger.info(f"복구 확인됨: pr={pr_number} {detail}")
@@ -851,7 +980,7 @@ def _verify_and_notify(pr_number: int, entry: dict) -> None:
             channel=channel,
             ts=ts,
             issue_data=issue_data,
-            fix_description=entry.get("fix_description", ""),
+            fix_description=incident.get("fix_description", ""),
             pr_url=entry.get("pr_url", ""),
             pr_number=pr_number,
         )
@@ -864,7 +993,10 @@ def _verify_and_notify(pr_number: int, entry: dict) -> None:
             detail=f"⚠️ 복구 미확인 (10분 경과)\n{detail}\nPR: {entry.get('pr_url', '')}",
         )
 
-    _pending_merges.pop(pr_number, None)
+    with _pending_merges_lock:
+        entry["verify_remaining"] -= 1
+        if entry["verify_remaining"] <= 0:
+            _pending_merges.pop(pr_number, None)
 
 
 @app.post("/webhook/argocd")
@@ -880,7 +1012,7 @@ async def argocd_webhook(request: Request, background_tasks: BackgroundTasks):
         merged_entry = None
         merged_pr_number = None
         for pr_num, entry in list(_pending_merges.items()):
-            if entry.get("merged"):
+            if entry.get("merged") and "verify_remaining" not in entry:  # 이미 검증 중인 PR 제외
                 merged_entry = entry
                 merged_pr_number = pr_num
                 break
@@ -0,0 +1,168 @@
+"""구조적 YAML diff 엔진
+
+두 YAML 트리를 비교해 변경 목록을 만든다. 리스트는 위치가 아니라
+머지 키(container `name`, env `name`, `containerPort` 등)로 원소를 짝지어
+비교하므로, 컨테이너 순서가 바뀌거나 중간에 원소가 추가돼도 정확한 경로가 나온다.
+
+- 경로 표기: JSON pointer (RFC 6901) / 정책 매칭용 점 표기 둘 다 제공
+  예) /spec/template/spec/containers/0/resources/limits/memory
+      spec.template.spec.containers[0].resources.limits.memory
+- 시간 복잡도: 문서 크기에 선형 (리스트 매칭은 키 인덱스 dict 사용)
+"""
+from typing import Any, NamedTuple
+
+import yaml
+
+# 리스트 원소 매칭에 쓰는 머지 키 후보 (우선순위 순, Kubernetes strategic merge 키 기준)
+MERGE_KEYS = ("name", "containerPort", "port", "mountPath", "devicePath", "key", "ip", "topologyKey")
+
+_ROOT_DOTTED = "<root>"
+
+
+class Change(NamedTuple):
+    """단일 변경. segments는 dict 키(str) / 리스트 인덱스(int) 튜플."""
+    op: str  # add | remove | replace
+    segments: tuple
+    old: Any = None
+    new: Any = None
+
+    @property
+    def pointer(self) -> str:
+        return to_pointer(self.segments)
+
+    @property
+    def dotted(self) -> str:
+        return to_dotted(self.segments)
+
+
+def _escape_pointer(segment: Any) -> str:
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+def to_pointer(segments: tuple) -> str:
+    """경로 세그먼트 → JSON pointer"""
+    return "".join(f"/{_escape_pointer(s)}" for s in segments)
+
+
+def to_dotted(segments: tuple) -> str:
+    """경로 세그먼트 → 점 표기 (리스트 인덱스는 [n])"""
+    parts: list[str] = []
+    for seg in segments:
+        if isinstance(seg, int):
+            parts.append(f"[{seg}]")
+        elif parts:
+            parts.append(f".{seg}")
+        else:
+            parts.append(str(seg))
+    return "".join(parts) or _ROOT_DOTTED
+
+
+def _merge_key(original: list, modified: list) -> str | None:
+    """두 리스트의 모든 원소가 dict이고 값이 유일한 머지 키를 찾는다."""
+    if not original and not modified:
+        return None
+    items = original + modified
+    if not all(isinstance(i, dict) for i in items):
+        return None
+    for key in MERGE_KEYS:
+        if not all(key in i for i in items):
+            continue
+        orig_vals = [i[key] for i in original]
+        mod_vals = [i[key] for i in modified]
+        try:
+            if len(set(orig_vals)) == len(orig_vals) and len(set(mod_vals)) == len(mod_vals):
+                return key
+        except TypeError:  # unhashable 값
+            continue
+    return None
+
+
+def _diff_list(original: list, modified: list, path: tuple, out: list[Change]) -> None:
+    key = _merge_key(original, modified)
+    if key is None:
+        # 키가 없으면 위치 기반 비교 + 꼬리 추가/삭제
+        common = min(len(original), len(modified))
+        for idx in range(common):
+            _diff(original[idx], modified[idx], path + (idx,), out)
+        for idx in range(common, len(original)):
+            out.append(Change("remove", path + (idx,), original[idx], None))
+        for idx in range(common, len(modified)):
+            out.append(Change("add", path + (idx,), None, modified[idx]))
+        return
+
+    orig_index = {item[key]: idx for idx, item in enumerate(original)}
+    seen: set = set()
+    for idx, item in enumerate(modified):
+        orig_idx = orig_index.get(item[key])
+        if orig_idx is None:
+            out.append(Change("add", path + (idx,), None, item))
+            continue
+        seen.add(item[key])
+        # 경로는 수정본 기준 인덱스
+        _diff(original[orig_idx], item, path + (idx,), out)
+    for idx, item in enumerate(original):
+        if item[key] not in seen:
+            out.append(Change("remove", path + (idx,), item, None))
+
+
+def _diff(original: Any, modified: Any, path: tuple, out: list[Change]) -> None:
+    if original is modified:
+        return
+    if isinstance(original, dict) and isinstance(modified, dict):
+        for key, orig_val in original.items():
+            if key not in modified:
+                out.append(Change("remove", path + (key,), orig_val, None))
+            else:
+                _diff(orig_val, modified[key], path + (key,), out)
+        for key, mod_val in modified.items():
+            if key not in original:
+                out.append(Change("add", path + (key,), None, mod_val))
+        return
+    if isinstance(original, list) and isinstance(modified, list):
+        _diff_list(original, modified, path, out)
+        return
+    if type(original) is not type(modified) or original != modified:
+        out.append(Change("replace", path, original, modified))
+
+
+def diff(original: Any, modified: Any) -> list[Change]:
+    """두 파싱된 YAML 트리의 변경 목록 반환."""
+    out: list[Change] = []
+    _diff(original, modified, (), out)
+    return out
+
+
+def diff_yaml(original_text: str, modified_text: str) -> list[Change]:
+    """YAML 텍스트 두 개를 파싱해 비교. 문법 오류는 yaml.YAMLError로 전파."""
+    return diff(yaml.safe_load(original_text), yaml.safe_load(modified_text))
+
+
+def changed_paths(changes: list[Change]) -> list[str]:
+    """변경 목록 → 점 표기 경로 목록 (정책 검사용)"""
+    return [c.dotted for c in changes]
+
+
+def added_values(changes: list[Change]) -> dict[str, Any]:
+    """추가 변경의 점 표기 경로 → 추가된 값 (통째 추가된 mapping을 정책이 말단 단위로 평가하도록)"""
+    return {c.dotted: c.new for c in changes if c.op == "add"}
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return yaml.safe_dump(value, default_flow_style=True, allow_unicode=True, width=1000).strip()
+    return str(value)
+
+
+def render_diff(changes: list[Change], limit: int = 50) -> str:
+    """PR 본문/Slack용 diff 렌더링 (``diff`` 코드블록 내용)"""
+    if not changes:
+        return "(변경 없음)"
+    lines: list[str] = []
+    for change in changes[:limit]:
+        if change.op != "add":
+            lines.append(f"- {change.dotted}: {_format_value(change.old)}")
+        if change.op != "remove":
+            lines.append(f"+ {change.dotted}: {_format_value(change.new)}")
+    if len(changes) > limit:
+        lines.append(f"# ... 외 {len(changes) - limit}개 변경")
+    return "\n".join(lines)
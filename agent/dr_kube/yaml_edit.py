@@ -0,0 +1,80 @@
+"""주석/들여쓰기를 보존하는 YAML 텍스트 편집
+
+PyYAML로 다시 dump하면 주석과 키 순서가 사라지므로, compose 단계의 노드 위치(mark)를
+이용해 원본 텍스트에서 대상 스칼라 값의 범위만 교체한다.
+경로는 yaml_diff.Change.segments 와 같은 형식(dict 키 str / 리스트 인덱스 int 튜플)이다.
+"""
+from typing import Any
+
+import yaml
+
+
+class YamlEditError(ValueError):
+    """경로를 찾을 수 없거나 스칼라가 아닌 노드를 교체하려는 경우"""
+
+
+def _find_node(node: yaml.Node, segments: tuple) -> yaml.Node:
+    for seg in segments:
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                if isinstance(key_node, yaml.ScalarNode) and key_node.value == str(seg):
+                    node = value_node
+                    break
+            else:
+                raise YamlEditError(f"키 없음: {seg!r}")
+        elif isinstance(node, yaml.SequenceNode):
+            if not isinstance(seg, int) or not 0 <= seg < len(node.value):
+                raise YamlEditError(f"리스트 인덱스 범위 밖: {seg!r}")
+            node = node.value[seg]
+        else:
+            raise YamlEditError(f"스칼라 하위 경로 접근 불가: {seg!r}")
+    return node
+
+
+def _render_scalar(value: Any, style: str | None) -> str:
+    text = "" if value is None else str(value)
+    if isinstance(value, str) and style == '"':
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    if isinstance(value, str) and style == "'":
+        return "'" + text.replace("'", "''") + "'"
+    # plain 스타일: 타입이 바뀌지 않도록 PyYAML 규칙으로 필요 시 따옴표 처리
+    dumped = yaml.safe_dump(value, default_flow_style=True, allow_unicode=True, width=1000)
+    return dumped.replace("\n...\n", "").strip()
+
+
+def document_index(text: str, kind: str) -> int:
+    """다중 문서 YAML에서 kind가 일치하는 첫 문서 인덱스 (없으면 -1)"""
+    for idx, doc in enumerate(yaml.safe_load_all(text)):
+        if isinstance(doc, dict) and doc.get("kind") == kind:
+            return idx
+    return -1
+
+
+def set_values(text: str, updates: dict[tuple, Any], document: int = 0) -> str:
+    """경로별 스칼라 값을 교체한 텍스트 반환 (다른 줄/주석은 그대로 유지).
+
+    Args:
+        text: 원본 YAML 텍스트 (다중 문서 가능)
+        updates: {경로 세그먼트 튜플: 새 값}
+        document: 편집할 문서 인덱스
+
+    Raises:
+        YamlEditError: 경로가 없거나 대상이 스칼라가 아닌 경우
+    """
+    if not updates:
+        return text
+    docs = list(yaml.compose_all(text))
+    if not 0 <= document < len(docs):
+        raise YamlEditError(f"문서 인덱스 범위 밖: {document}")
+
+    spans: list[tuple[int, int, str]] = []
+    for segments, value in updates.items():
+        node = _find_node(docs[document], tuple(segments))
+        if not isinstance(node, yaml.ScalarNode):
+            raise YamlEditError(f"스칼라가 아닌 값은 교체할 수 없습니다: {segments}")
+        spans.append((node.start_mark.index, node.end_mark.index, _render_scalar(value, node.style)))
+
+    # 뒤에서부터 교체해야 앞쪽 인덱스가 유지된다
+    for start, end, rendered in sorted(spans, reverse=True):
+        text = text[:start] + rendered + text[end:]
+    return text
@@ -0,0 +1,209 @@
+"""GitHubRestClient 테스트 (로컬 가짜 GitHub API 서버)"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dr_kube import github
+from dr_kube.github import GitHubRestClient, get_github_client
+
+REPO = "octo/demo"
+
+
+class FakeGitHub:
+    """요청을 기록하고, 경로별로 준비된 응답을 돌려주는 가짜 API 서버"""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str, dict, dict]] = []  # (method, path, headers, body)
+        self.routes: dict[tuple[str, str], list[tuple[int, dict, dict]]] = {}
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                fake.requests.append((self.command, self.path, dict(self.headers), body))
+                status, headers, payload = fake._respond(self.command, self.path, self.headers)
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_PUT = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def route(self, method: str, path: str, *responses: tuple[int, dict, dict | None]) -> None:
+        """경로 응답 등록. 여러 개면 순서대로 소비하고 마지막 응답을 반복"""
+        self.routes[(method, path)] = list(responses)
+
+    def _respond(self, method: str, path: str, headers) -> tuple[int, dict, dict | None]:
+        responses = self.routes.get((method, path))
+        if not responses:
+            return 404, {}, {"message": "Not Found"}
+        status, resp_headers, payload = responses.pop(0) if len(responses) > 1 else responses[0]
+        etag = resp_headers.get("ETag")
+        if method == "GET" and etag and headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, None
+        return status, resp_headers, payload
+
+    def calls(self, method: str, path: str) -> list[tuple[str, str, dict, dict]]:
+        return [r for r in self.requests if r[0] == method and r[1] == path]
+
+
+@pytest.fixture
+def fake():
+    server = FakeGitHub()
+    yield server
+    server.server.shutdown()
+
+
+@pytest.fixture
+def client(fake, tmp_path):
+    return GitHubRestClient(repo_path=str(tmp_path), token="test-token", repo=REPO, api_url=fake.url)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """time.sleep 대신 대기 시간만 기록"""
+    waits: list[float] = []
+    monkeypatch.setattr(github.time, "sleep", waits.append)
+    return waits
+
+
+def test_get_pr_revalidates_with_etag(fake, client):
+    pr = {"number": 7, "mergeable": True, "mergeable_state": "clean"}
+    fake.route("GET", f"/repos/{REPO}/pulls/7", (200, {"ETag": '"v1"'}, pr))
+
+    assert client.get_pr(7) == (True, pr)
+    assert client.get_pr(7) == (True, pr)
+
+    first, second = fake.calls("GET", f"/repos/{REPO}/pulls/7")
+    assert "If-None-Match" not in first[2]
+    assert second[2]["If-None-Match"] == '"v1"'
+
+
+def test_etag_cache_survives_get_github_client(fake, tmp_path, monkeypatch):
+    monkeypatch.setenv("GH_TOKEN", "test-token")
+    monkeypatch.setenv("GITHUB_REPOSITORY", REPO)
+    monkeypatch.setenv("GITHUB_API_URL", fake.url)
+    fake.route("GET", f"/repos/{REPO}/pulls/3", (200, {"ETag": '"v1"'}, {"number": 3}))
+
+    first = get_github_client(str(tmp_path))
+    first.get_pr(3)
+    second = get_github_client(str(tmp_path))
+    second.get_pr(3)
+
+    assert first is second
+    assert fake.calls("GET", f"/repos/{REPO}/pulls/3")[-1][2]["If-None-Match"] == '"v1"'
+
+
+def test_waits_for_rate_limit_reset(fake, client, sleeps):
+    reset = int(time.time()) + 30
+    fake.route(
+        "GET", f"/repos/{REPO}/pulls/1",
+        (200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}, {"number": 1}),
+        (200, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": str(reset)}, {"number": 1}),
+    )
+
+    client.get_pr(1)
+    assert client.rate_limit_remaining == 0
+    assert sleeps == []
+
+    client.get_pr(1)
+    assert len(sleeps) == 1 and 25 <= sleeps[0] <= 30
+    assert client.rate_limit_remaining == 4999
+
+
+def test_rate_limit_wait_beyond_cap_fails_fast(fake, client, sleeps):
+    reset = int(time.time()) + 3600
+    fake.route(
+        "POST", f"/repos/{REPO}/pulls",
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}, {"message": "rate limited"}),
+    )
+
+    ok, message, _ = client.create_pr("fix/a", "title", "body")
+    assert not ok and "403" in message
+    ok, message, _ = client.create_pr("fix/a", "title", "body")
+    assert not ok and "rate limit" in message
+    assert sleeps == []
+    assert len(fake.calls("POST", f"/repos/{REPO}/pulls")) == 1
+
+
+def test_retry_after_is_honoured(fake, client, sleeps):
+    fake.route(
+        "POST", f"/repos/{REPO}/pulls",
+        (429, {"Retry-After": "2"}, {"message": "secondary rate limit"}),
+        (201, {}, {"number": 12, "html_url": "https://github.com/octo/demo/pull/12"}),
+    )
+
+    assert client.create_pr("fix/a", "title", "body") == (True, "https://github.com/octo/demo/pull/12", 12)
+    assert sleeps == [2.0]
+
+
+def test_create_pr(fake, client):
+    fake.route("POST", f"/repos/{REPO}/pulls",
+               (201, {}, {"number": 5, "html_url": "https://github.com/octo/demo/pull/5"}))
+
+    assert client.create_pr("fix/oom-web", "fix: oom", "body") == (True, "https://github.com/octo/demo/pull/5", 5)
+    (_, _, headers, body), = fake.calls("POST", f"/repos/{REPO}/pulls")
+    assert headers["Authorization"] == "Bearer test-token"
+    assert body == {"title": "fix: oom", "head": "fix/oom-web", "base": "main", "body": "body"}
+
+
+def test_create_pr_error_message(fake, client):
+    fake.route("POST", f"/repos/{REPO}/pulls",
+               (422, {}, {"message": "Validation Failed", "errors": [{"message": "A pull request already exists"}]}))
+
+    ok, message, number = client.create_pr("fix/a", "title", "body")
+    assert not ok and number == 0
+    assert message == "GitHub API 422: Validation Failed (A pull request already exists)"
+
+
+def test_close_pr_comments_then_closes(fake, client):
+    fake.route("POST", f"/repos/{REPO}/issues/5/comments", (201, {}, {"id": 1}))
+    fake.route("PATCH", f"/repos/{REPO}/pulls/5",
+               (200, {}, {"state": "closed", "html_url": "https://github.com/octo/demo/pull/5"}))
+
+    assert client.close_pr(5) == (True, "https://github.com/octo/demo/pull/5")
+    assert [r[0] for r in fake.requests] == ["POST", "PATCH"]
+    assert fake.calls("POST", f"/repos/{REPO}/issues/5/comments")[0][3] == {"body": github._CLOSE_COMMENT}
+    assert fake.calls("PATCH", f"/repos/{REPO}/pulls/5")[0][3] == {"state": "closed"}
+
+
+def test_merge_pr_squash(fake, client):
+    fake.route("PUT", f"/repos/{REPO}/pulls/5/merge", (200, {}, {"merged": True, "message": "Pull Request merged"}))
+
+    assert client.merge_pr(5) == (True, "Pull Request merged")
+    assert fake.calls("PUT", f"/repos/{REPO}/pulls/5/merge")[0][3] == {"merge_method": "squash"}
+
+
+def test_merge_pr_falls_back_to_auto_merge(fake, client):
+    fake.route("PUT", f"/repos/{REPO}/pulls/5/merge", (405, {}, {"message": "Base branch was modified"}))
+    fake.route("GET", f"/repos/{REPO}/pulls/5", (200, {}, {"number": 5, "node_id": "PR_node5"}))
+    fake.route("POST", "/graphql", (200, {}, {"data": {"enablePullRequestAutoMerge": {"clientMutationId": None}}}))
+
+    assert client.merge_pr(5) == (True, "auto-merge 예약됨")
+    (_, _, _, body), = fake.calls("POST", "/graphql")
+    assert body["variables"] == {"id": "PR_node5"}
+
+
+def test_merge_pr_auto_merge_error(fake, client):
+    fake.route("PUT", f"/repos/{REPO}/pulls/5/merge", (409, {}, {"message": "conflict"}))
+    fake.route("GET", f"/repos/{REPO}/pulls/5", (200, {}, {"number": 5, "node_id": "PR_node5"}))
+    fake.route("POST", "/graphql", (200, {}, {"errors": [{"message": "auto-merge is not allowed"}]}))
+
+    assert client.merge_pr(5) == (False, "auto-merge 예약 실패: auto-merge is not allowed")
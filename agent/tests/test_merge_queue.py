@@ -0,0 +1,39 @@
+"""rebase_fix 테스트 (수정안을 새 main 위에 재적용)"""
+import pytest
+
+from dr_kube.github import GitHubClient
+from dr_kube.merge_queue import rebase_fix
+
+ORIGINAL = """\
+# web 서비스
+web:
+  replicas: 2
+  resources:
+    limits:
+      memory: 256Mi  # OOM 대응
+      cpu: 500m
+"""
+FIX = ORIGINAL.replace("memory: 256Mi", "memory: 512Mi")
+
+
+@pytest.fixture
+def gh(tmp_path):
+    return GitHubClient(repo_path=str(tmp_path))
+
+
+def test_reapplies_scalar_fix_on_unrelated_main_change(gh):
+    current = ORIGINAL.replace("replicas: 2", "replicas: 3")
+
+    rebased = rebase_fix(gh, current, ORIGINAL, FIX)
+
+    assert rebased == current.replace("memory: 256Mi", "memory: 512Mi")
+
+
+def test_same_scalar_changed_on_main_is_conflict(gh):
+    current = ORIGINAL.replace("memory: 256Mi", "memory: 384Mi")
+
+    assert rebase_fix(gh, current, ORIGINAL, FIX) is None
+
+
+def test_same_scalar_already_applied_on_main(gh):
+    assert rebase_fix(gh, FIX, ORIGINAL, FIX) == FIX
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""컨텍스트 수집 지연 벤치마크
+
+delivery_agent 컨텍스트 수집에서 K8s 클라이언트 준비 비용을 비교한다.
+  - per-call : 호출마다 설정 로드 + CoreV1Api 생성 (기존 방식)
+  - shared   : dr_kube.k8s_client 공유 클라이언트 (커넥션 풀 재사용)
+그리고 collect_context_parallel 전체 소요 시간(p50/p95)을 잰다.
+
+사전 준비:
+  kubeconfig 또는 in-cluster 접근 가능 + 대상 서비스 Pod 존재
+
+사용법:
+  python3 scripts/bench-context-gather.py --service order-service --namespace delivery-app
+  python3 scripts/bench-context-gather.py --runs 20 --skip-collect
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "agent"))
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={statistics.median(ordered) * 1000:7.1f}ms  p95={p95 * 1000:7.1f}ms  n={len(ordered)}"
+
+
+def per_call_events(service: str, namespace: str) -> None:
+    from kubernetes import client, config as k8s_config
+    try:
+        k8s_config.load_incluster_config()
+    except k8s_config.ConfigException:
+        k8s_config.load_kube_config()
+    client.CoreV1Api().list_namespaced_event(namespace, field_selector=f"involvedObject.name={service}")
+
+
+def shared_events(service: str, namespace: str) -> None:
+    from dr_kube.k8s_client import core_v1
+    core_v1().list_namespaced_event(namespace, field_selector=f"involvedObject.name={service}")
+
+
+def bench_fanout(fn, service: str, namespace: str, runs: int, fanout: int) -> list[float]:
+    """collect_context_parallel처럼 fanout개 호출을 동시에 실행한 1회 소요 시간"""
+    samples = []
+    with ThreadPoolExecutor(max_workers=fanout) as executor:
+        for _ in range(runs):
+            start = time.perf_counter()
+            list(executor.map(lambda _: fn(service, namespace), range(fanout)))
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="컨텍스트 수집 지연 벤치마크")
+    parser.add_argument("--service", default="order-service")
+    parser.add_argument("--namespace", default="delivery-app")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--fanout", type=int, default=8, help="동시 호출 수 (기본: 8, 수집 워커 수)")
+    parser.add_argument("--skip-collect", action="store_true", help="collect_context_parallel 측정 생략")
+    args = parser.parse_args()
+
+    print(f"대상: {args.namespace}/{args.service}  runs={args.runs} fanout={args.fanout}\n")
+
+    # 워밍업 (import, 최초 설정 로드)
+    shared_events(args.service, args.namespace)
+
+    print(f"per-call 클라이언트 : {percentiles(bench_fanout(per_call_events, args.service, args.namespace, args.runs, args.fanout))}")
+    print(f"shared 클라이언트   : {percentiles(bench_fanout(shared_events, args.service, args.namespace, args.runs, args.fanout))}")
+
+    if not args.skip_collect:
+        from delivery_agent.tools import collect_context_parallel
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            collect_context_parallel(args.service, args.namespace)
+            samples.append(time.perf_counter() - start)
+        print(f"collect_context     : {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()